@@ -38,8 +38,25 @@ def create_app(config_name=None):
     # Register error handlers
     register_error_handlers(app)
     
+    # Maintenance commands (flask <command>)
+    register_commands(app)
+    
+    # Request/Socket.IO timing and the /metrics endpoint
+    from .utils.metrics import init_metrics
+    init_metrics(app)
+    
+    # Optional background model preload/warm-up
+    start_model_warmup(app)
+    
+    # Write-behind activity logging
+    start_activity_buffer(app)
+    
     # Create necessary folders
     os.makedirs(app.config["UPLOAD_FOLDER"], exist_ok=True)
+    os.makedirs(app.config["TTS_CACHE_DIR"], exist_ok=True)
+    
+    from .services.tts_cache_service import get_tts_cache
+    get_tts_cache().configure(app)
     os.makedirs("logs", exist_ok=True)
     
     return app
@@ -58,6 +75,43 @@ def register_blueprints(app):
     app.register_blueprint(api_bp, url_prefix="/api")
     app.register_blueprint(activity_api_bp)
 
+def register_commands(app):
+    """Register maintenance CLI commands"""
+    import click
+    
+    @app.cli.command("backfill-rollups")
+    @click.option("--user-id", type=int, default=None, help="Only rebuild this user's buckets")
+    def backfill_rollups(user_id):
+        """Rebuild activity day/month rollups from the raw activity logs"""
+        from .models.rollups import ActivityRollup
+        for table, rows in ActivityRollup.backfill(user_id).items():
+            click.echo(f"{table}: {rows} rows written")
+
+def start_model_warmup(app):
+    """Start ISL model warm-up when ISL_PRELOAD_MODEL is enabled"""
+    if not app.config.get("ISL_PRELOAD_MODEL"):
+        return
+    # Skip the reloader's watcher process in debug mode
+    if app.debug and os.environ.get("WERKZEUG_RUN_MAIN") != "true":
+        return
+    # Prefork master (gunicorn.conf.py): workers start their own warm-up after fork
+    if os.environ.get("VEDISPEAK_PREFORK") == "1":
+        return
+    from .services.model_warmup_service import get_model_warmup_service
+    get_model_warmup_service().start(app)
+
+def start_activity_buffer(app):
+    """Start the activity write-behind buffer when ACTIVITY_WRITE_BEHIND is enabled"""
+    if not app.config.get("ACTIVITY_WRITE_BEHIND"):
+        return
+    if app.debug and os.environ.get("WERKZEUG_RUN_MAIN") != "true":
+        return
+    # Prefork master: each worker starts its own buffer after fork
+    if os.environ.get("VEDISPEAK_PREFORK") == "1":
+        return
+    from .services.activity_buffer_service import get_activity_buffer
+    get_activity_buffer().start(app)
+
 def register_error_handlers(app):
     """Register error handlers"""
     from flask import jsonify, render_template, request
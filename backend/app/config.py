@@ -16,6 +16,37 @@ class Config:
     MYSQL_PASSWORD = os.environ.get("MYSQL_PASSWORD", "")
     MYSQL_DB = os.environ.get("MYSQL_DB", "isl_app")
     MYSQL_CURSORCLASS = "DictCursor"
+
+    # Connection pool (per process): max connections, seconds to wait for one,
+    # recycle age in seconds, and idle seconds after which a connection is pinged
+    MYSQL_POOL_SIZE = int(os.environ.get("MYSQL_POOL_SIZE", 10))
+    MYSQL_POOL_TIMEOUT = float(os.environ.get("MYSQL_POOL_TIMEOUT", 5.0))
+    MYSQL_POOL_RECYCLE = int(os.environ.get("MYSQL_POOL_RECYCLE", 3600))
+    MYSQL_POOL_PING_AFTER = float(os.environ.get("MYSQL_POOL_PING_AFTER", 5.0))
+    # X-DB-Query-Count / X-DB-Time-Ms response headers (always sent in debug mode)
+    DB_QUERY_COUNT_HEADER = os.environ.get("DB_QUERY_COUNT_HEADER", "0") == "1"
+    # Query profiler (/api/admin/queries); statements slower than SLOW_QUERY_MS are logged
+    DB_PROFILER_ENABLED = os.environ.get("DB_PROFILER_ENABLED", "1") == "1"
+    SLOW_QUERY_MS = float(os.environ.get("SLOW_QUERY_MS", 200))
+    # Users allowed to call /api/admin/* (comma-separated user ids)
+    ADMIN_USER_IDS = {int(uid) for uid in os.environ.get("ADMIN_USER_IDS", "").split(",") if uid.strip()}
+
+    # Seconds between checks whether the course/module/quiz catalog changed
+    CATALOG_CACHE_TTL = float(os.environ.get("CATALOG_CACHE_TTL", 300))
+
+    # Seconds a worker may serve cached dashboard stats without re-reading the snapshot
+    DASHBOARD_CACHE_TTL = float(os.environ.get("DASHBOARD_CACHE_TTL", 30))
+
+    # Write-behind activity logging: flush every N ms or once M events are pending
+    ACTIVITY_WRITE_BEHIND = os.environ.get("ACTIVITY_WRITE_BEHIND", "0") == "1"
+    ACTIVITY_FLUSH_INTERVAL_MS = int(os.environ.get("ACTIVITY_FLUSH_INTERVAL_MS", 500))
+    ACTIVITY_FLUSH_MAX_EVENTS = int(os.environ.get("ACTIVITY_FLUSH_MAX_EVENTS", 200))
+    
+    # Content-addressed cache of synthesized TTS audio (LRU-evicted above TTS_CACHE_MAX_MB)
+    TTS_CACHE_DIR = os.environ.get("TTS_CACHE_DIR", "storage/tts_cache")
+    TTS_CACHE_MAX_MB = float(os.environ.get("TTS_CACHE_MAX_MB", 256))
+    # Concurrent gTTS chunk requests per worker
+    GTTS_MAX_WORKERS = int(os.environ.get("GTTS_MAX_WORKERS", 4))
     
     # Upload
     UPLOAD_FOLDER = os.environ.get("UPLOAD_FOLDER", "storage/uploads")
@@ -40,7 +71,33 @@ class Config:
     # ML Model
     MODEL_PATH = os.environ.get("MODEL_PATH", "checkpoints/best.pth")
     MODEL_ARCH = os.environ.get("MODEL_ARCH", "efficientnet_b0")
-    
+
+    # ISL inference workers (0 = run inference inside the web process)
+    ISL_INFERENCE_WORKERS = int(os.environ.get("ISL_INFERENCE_WORKERS", 0))
+    ISL_INFERENCE_THREADS = int(os.environ.get("ISL_INFERENCE_THREADS", 1))
+    ISL_INFERENCE_TIMEOUT = float(os.environ.get("ISL_INFERENCE_TIMEOUT", 2.0))
+    ISL_FRAME_SLOTS = int(os.environ.get("ISL_FRAME_SLOTS", 0))  # 0 = two per worker
+
+    # Load and warm up the ISL model in the background at startup (opt-in)
+    ISL_PRELOAD_MODEL = os.environ.get("ISL_PRELOAD_MODEL", "0") == "1"
+    ISL_WARMUP_BATCH_SIZES = tuple(
+        int(b) for b in os.environ.get("ISL_WARMUP_BATCH_SIZES", "1").split(",") if b.strip()
+    )
+    ISL_WARMUP_ITERATIONS = int(os.environ.get("ISL_WARMUP_ITERATIONS", 3))
+
+    # Hot reload: poll the checkpoint directory every N seconds (0 = disabled)
+    ISL_MODEL_WATCH_INTERVAL = float(os.environ.get("ISL_MODEL_WATCH_INTERVAL", 0))
+    ISL_MODEL_WATCH_PATTERN = os.environ.get("ISL_MODEL_WATCH_PATTERN", "")  # e.g. "best*.pth"
+
+    # Per-stage latency histograms for /api/isl/performance (off by default)
+    ISL_STAGE_TIMING = os.environ.get("ISL_STAGE_TIMING", "0") == "1"
+
+    # Prometheus-style /metrics endpoint (HTTP, Socket.IO, DB, translation cache, ISL stages)
+    METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "1") == "1"
+
+    # Seconds between background refreshes of readiness/startup/diagnostics snapshots
+    HEALTH_MONITOR_INTERVAL = float(os.environ.get("HEALTH_MONITOR_INTERVAL", 2.0))
+
     # Rate Limiting
     RATELIMIT_STORAGE_URL = os.environ.get("REDIS_URL", "memory://")
     RATELIMIT_DEFAULT = "200 per day, 50 per hour"
@@ -0,0 +1,356 @@
+"""
+Pooled MySQL connections
+Drop-in replacement for flask_mysqldb.MySQL: `mysql.connection` still returns
+one connection per app context (request, Socket.IO event or background
+app_context), but it is checked out of a bounded per-app pool and returned on
+teardown instead of being opened and closed every time
+- Bounded pool: callers wait up to MYSQL_POOL_TIMEOUT for a free connection
+- Pre-ping connections that sat idle, recycle old ones, roll back on return
+- Connections inherited across a fork are dropped, never shared
+- Wait time, timeouts and pool size are exported to /metrics
+- Queries are counted and timed per app context (X-DB-Query-Count and
+  X-DB-Time-Ms headers in debug) and profiled by fingerprint (query_profiler.py)
+"""
+import os
+import queue
+import threading
+import time
+
+from flask import current_app, g, has_app_context, request
+
+from .query_profiler import query_profiler
+
+
+class PoolTimeout(RuntimeError):
+    """No connection became available within the pool timeout"""
+
+
+def query_count():
+    """Queries executed in the current app context"""
+    return g.get("_db_query_count", 0) if has_app_context() else 0
+
+
+def query_time():
+    """Seconds spent executing queries in the current app context"""
+    return g.get("_db_query_time", 0.0) if has_app_context() else 0.0
+
+
+def _record_query(query, seconds, rows):
+    if has_app_context():
+        g._db_query_count = g.get("_db_query_count", 0) + 1
+        g._db_query_time = g.get("_db_query_time", 0.0) + seconds
+    query_profiler.record(query, seconds, rows)
+
+
+_profiled_cursors = {}
+
+
+def _profiled_cursor(base):
+    """Subclass of a MySQLdb cursor class that counts and times executed statements"""
+    cursor_class = _profiled_cursors.get(base)
+    if cursor_class is None:
+        class ProfiledCursor(base):
+            _in_executemany = False
+
+            def execute(self, query, args=None):
+                if self._in_executemany:
+                    return super().execute(query, args)
+                start = time.perf_counter()
+                try:
+                    return super().execute(query, args)
+                finally:
+                    _record_query(query, time.perf_counter() - start, self.rowcount)
+
+            def executemany(self, query, args):
+                self._in_executemany = True
+                start = time.perf_counter()
+                try:
+                    return super().executemany(query, args)
+                finally:
+                    self._in_executemany = False
+                    _record_query(query, time.perf_counter() - start, self.rowcount)
+
+        ProfiledCursor.__name__ = f"Profiled{base.__name__}"
+        cursor_class = _profiled_cursors[base] = ProfiledCursor
+    return cursor_class
+
+
+class ConnectionPool:
+    """Thread-safe bounded pool of DB-API connections"""
+
+    def __init__(self, connect, max_size=10, timeout=5.0, recycle=3600, ping_after=5.0):
+        """
+        Args:
+            connect: callable() -> new connection
+            max_size: maximum open connections
+            timeout: seconds to wait for a free connection
+            recycle: close connections older than this many seconds (0 = never)
+            ping_after: ping connections idle for longer than this before reuse (< 0 = never)
+        """
+        self._connect = connect
+        self.max_size = max_size
+        self.timeout = timeout
+        self.recycle = recycle
+        self.ping_after = ping_after
+
+        self._idle = queue.LifoQueue()  # Most recently used first keeps connections warm
+        self._size = 0
+        self._lock = threading.Lock()
+        self._created_at = {}
+        self._pid = os.getpid()
+
+        self.on_wait = None  # callback(seconds) for metrics
+        self.checkouts = 0
+        self.timeouts = 0
+        self.reconnects = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _open(self):
+        try:
+            conn = self._connect()
+        except Exception:
+            with self._lock:
+                self._size -= 1
+            raise
+        self._created_at[id(conn)] = time.monotonic()
+        return conn
+
+    def _discard(self, conn):
+        self._created_at.pop(id(conn), None)
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._lock:
+            self._size -= 1
+
+    def _healthy(self, conn, idle_since):
+        """Recycle old connections and ping ones that sat idle"""
+        now = time.monotonic()
+        if self.recycle and now - self._created_at.get(id(conn), now) > self.recycle:
+            return False
+        if 0 <= self.ping_after <= now - idle_since:
+            try:
+                conn.ping()
+            except Exception:
+                return False
+        return True
+
+    def _check_fork(self):
+        """After a fork (gunicorn preload) drop inherited connections without closing the parent's sockets"""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                self._idle = queue.LifoQueue()
+                self._size = 0
+                self._created_at = {}
+                self._pid = os.getpid()
+
+    def acquire(self):
+        """Check out a connection, opening one if the pool is not full"""
+        self._check_fork()
+        start = time.perf_counter()
+        deadline = start + self.timeout
+        while True:
+            try:
+                conn, idle_since = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    can_open = self._size < self.max_size
+                    if can_open:
+                        self._size += 1
+                if can_open:
+                    conn = self._open()
+                    break
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    self.timeouts += 1
+                    self._record_wait(time.perf_counter() - start)
+                    raise PoolTimeout(f"No database connection available within {self.timeout}s "
+                                      f"(pool size {self.max_size})")
+                try:
+                    conn, idle_since = self._idle.get(timeout=remaining)
+                except queue.Empty:
+                    continue
+
+            if self._healthy(conn, idle_since):
+                break
+            self._discard(conn)
+            self.reconnects += 1
+
+        self.checkouts += 1
+        self._record_wait(time.perf_counter() - start)
+        return conn
+
+    def release(self, conn):
+        """Return a connection, rolling back anything left uncommitted"""
+        try:
+            conn.rollback()
+        except Exception:
+            self._discard(conn)
+            return
+        self._idle.put((conn, time.monotonic()))
+
+    def _record_wait(self, seconds):
+        self.total_wait += seconds
+        self.max_wait = max(self.max_wait, seconds)
+        if self.on_wait is not None:
+            self.on_wait(seconds)
+
+    def close(self):
+        """Close all idle connections"""
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+    def get_stats(self):
+        """Pool usage for diagnostics and metrics"""
+        idle = self._idle.qsize()
+        return {
+            'max_size': self.max_size,
+            'open': self._size,
+            'idle': idle,
+            'in_use': self._size - idle,
+            'checkouts': self.checkouts,
+            'timeouts': self.timeouts,
+            'reconnects': self.reconnects,
+            'avg_wait_ms': round(self.total_wait / max(self.checkouts, 1) * 1000, 3),
+            'max_wait_ms': round(self.max_wait * 1000, 3)
+        }
+
+
+class PooledMySQL:
+    """flask_mysqldb.MySQL compatible extension backed by ConnectionPool"""
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        # Same settings and defaults as flask_mysqldb
+        app.config.setdefault("MYSQL_HOST", "localhost")
+        app.config.setdefault("MYSQL_USER", None)
+        app.config.setdefault("MYSQL_PASSWORD", None)
+        app.config.setdefault("MYSQL_DB", None)
+        app.config.setdefault("MYSQL_PORT", 3306)
+        app.config.setdefault("MYSQL_UNIX_SOCKET", None)
+        app.config.setdefault("MYSQL_CONNECT_TIMEOUT", 10)
+        app.config.setdefault("MYSQL_READ_DEFAULT_FILE", None)
+        app.config.setdefault("MYSQL_USE_UNICODE", True)
+        app.config.setdefault("MYSQL_CHARSET", "utf8")
+        app.config.setdefault("MYSQL_SQL_MODE", None)
+        app.config.setdefault("MYSQL_CURSORCLASS", None)
+        app.config.setdefault("MYSQL_AUTOCOMMIT", False)
+        app.config.setdefault("MYSQL_CUSTOM_OPTIONS", None)
+
+        app.config.setdefault("MYSQL_POOL_SIZE", 10)
+        app.config.setdefault("MYSQL_POOL_TIMEOUT", 5.0)
+        app.config.setdefault("MYSQL_POOL_RECYCLE", 3600)
+        app.config.setdefault("MYSQL_POOL_PING_AFTER", 5.0)
+
+        config = app.config
+        pool = ConnectionPool(
+            lambda: self._connect(config),
+            max_size=config["MYSQL_POOL_SIZE"],
+            timeout=config["MYSQL_POOL_TIMEOUT"],
+            recycle=config["MYSQL_POOL_RECYCLE"],
+            ping_after=config["MYSQL_POOL_PING_AFTER"]
+        )
+        app.extensions["mysql_pool"] = pool
+        app.teardown_appcontext(self.teardown)
+        self._register_metrics(pool)
+        query_profiler.configure(app)
+
+        @app.after_request
+        def _query_cost(response):
+            if request.endpoint != "static":
+                query_profiler.record_request(request.endpoint or "unmatched", query_count(), query_time())
+            if current_app.debug or current_app.config.get("DB_QUERY_COUNT_HEADER"):
+                response.headers["X-DB-Query-Count"] = str(query_count())
+                response.headers["X-DB-Time-Ms"] = f"{query_time() * 1000:.2f}"
+            return response
+
+    @staticmethod
+    def _connect(config):
+        """Open a MySQLdb connection from flask_mysqldb-style settings"""
+        import MySQLdb
+        from MySQLdb import cursors
+
+        kwargs = {}
+        if config["MYSQL_HOST"]:
+            kwargs["host"] = config["MYSQL_HOST"]
+        if config["MYSQL_USER"]:
+            kwargs["user"] = config["MYSQL_USER"]
+        if config["MYSQL_PASSWORD"]:
+            kwargs["passwd"] = config["MYSQL_PASSWORD"]
+        if config["MYSQL_DB"]:
+            kwargs["db"] = config["MYSQL_DB"]
+        if config["MYSQL_PORT"]:
+            kwargs["port"] = config["MYSQL_PORT"]
+        if config["MYSQL_UNIX_SOCKET"]:
+            kwargs["unix_socket"] = config["MYSQL_UNIX_SOCKET"]
+        if config["MYSQL_CONNECT_TIMEOUT"]:
+            kwargs["connect_timeout"] = config["MYSQL_CONNECT_TIMEOUT"]
+        if config["MYSQL_READ_DEFAULT_FILE"]:
+            kwargs["read_default_file"] = config["MYSQL_READ_DEFAULT_FILE"]
+        if config["MYSQL_USE_UNICODE"]:
+            kwargs["use_unicode"] = config["MYSQL_USE_UNICODE"]
+        if config["MYSQL_CHARSET"]:
+            kwargs["charset"] = config["MYSQL_CHARSET"]
+        if config["MYSQL_SQL_MODE"]:
+            kwargs["sql_mode"] = config["MYSQL_SQL_MODE"]
+        kwargs["cursorclass"] = _profiled_cursor(getattr(cursors, config["MYSQL_CURSORCLASS"] or "Cursor"))
+        if config["MYSQL_AUTOCOMMIT"]:
+            kwargs["autocommit"] = config["MYSQL_AUTOCOMMIT"]
+        if config["MYSQL_CUSTOM_OPTIONS"]:
+            kwargs.update(config["MYSQL_CUSTOM_OPTIONS"])
+        return MySQLdb.connect(**kwargs)
+
+    @staticmethod
+    def _register_metrics(pool):
+        from .utils.metrics import registry
+
+        wait = registry.histogram(
+            "db_pool_wait_seconds", "Time spent waiting for a pooled DB connection",
+            buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0))
+        pool.on_wait = wait.observe
+
+        def collect():
+            stats = pool.get_stats()
+            lines = []
+            for key in ("max_size", "open", "idle", "in_use"):
+                lines.append(f"# TYPE db_pool_{key} gauge")
+                lines.append(f"db_pool_{key} {stats[key]}")
+            for key in ("checkouts", "timeouts", "reconnects"):
+                lines.append(f"# TYPE db_pool_{key}_total counter")
+                lines.append(f"db_pool_{key}_total {stats[key]}")
+            return "\n".join(lines) + "\n"
+
+        registry.add_collector("db_pool", collect)
+
+    @property
+    def pool(self):
+        """Pool of the current app"""
+        return current_app.extensions["mysql_pool"]
+
+    @property
+    def connection(self):
+        """Connection checked out for the current app context (None outside one)"""
+        if not has_app_context():
+            return None
+        conn = g.get("_mysql_connection")
+        if conn is None:
+            conn = self.pool.acquire()
+            g._mysql_connection = conn
+        return conn
+
+    def teardown(self, exception):
+        """Return the app context's connection to the pool"""
+        conn = g.pop("_mysql_connection", None)
+        if conn is not None:
+            self.pool.release(conn)
@@ -1,10 +1,10 @@
 """
 Flask extensions (initialized without app)
 """
-from flask_mysqldb import MySQL
 from flask_bcrypt import Bcrypt
 from flask_socketio import SocketIO
+from .db_pool import PooledMySQL
 
-mysql = MySQL()
+mysql = PooledMySQL()  # flask_mysqldb-compatible, backed by a connection pool
 bcrypt = Bcrypt()
 socketio = SocketIO(cors_allowed_origins="*", async_mode='threading')
@@ -6,5 +6,15 @@ from .stats import UserStats, UserActivity
 from .courses import Course, Module, UserProgress, Quiz
 from .achievements import Achievement
 from .portfolio import PortfolioLink
+from .dashboard import DashboardData
+from .streaks import UserStreak
+from .rollups import ActivityRollup
+from ..utils.metrics import instrument_model
 
-__all__ = ["User", "UserStats", "UserActivity", "Course", "Module", "UserProgress", "Quiz", "Achievement", "PortfolioLink"]
+# Time every model method for /metrics (db_query_duration_seconds)
+for _model in (User, UserStats, UserActivity, Course, Module, UserProgress, Quiz, Achievement, PortfolioLink,
+               DashboardData, UserStreak, ActivityRollup):
+    instrument_model(_model)
+
+__all__ = ["User", "UserStats", "UserActivity", "Course", "Module", "UserProgress", "Quiz", "Achievement", "PortfolioLink",
+           "DashboardData", "UserStreak", "ActivityRollup"]
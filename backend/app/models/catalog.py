@@ -0,0 +1,165 @@
+"""
+Course catalog cache
+All active courses, modules and parsed quizzes are loaded once (three
+queries) into a frozen snapshot indexed by id; Course/Module/Quiz lookups are
+served from it and return private copies, so callers may still mutate results
+- Reloaded after invalidate() (version bump) in this process
+- Every CATALOG_CACHE_TTL seconds a one-row version query (row counts and
+  latest updated_at) decides whether other writers changed the catalog
+"""
+import threading
+import time
+from types import MappingProxyType
+
+from ..utils.db_helpers import db_cursor
+from ..utils.metrics import registry
+
+CATALOG_LOADS = registry.counter(
+    "catalog_cache_loads_total", "Catalog cache loads by reason (initial/invalidated/changed)", ("reason",))
+
+
+def freeze(value):
+    """Read-only copy: dicts become mappingproxies, lists become tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value):
+    """Mutable copy of a frozen value"""
+    if isinstance(value, MappingProxyType):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+class CatalogSnapshot:
+    """Frozen catalog indexed by id"""
+
+    def __init__(self, courses, modules, quizzes, version):
+        self.courses = tuple(freeze(course) for course in courses)
+        self.courses_by_id = MappingProxyType({course['id']: course for course in self.courses})
+        modules = tuple(freeze(module) for module in modules)
+        self.modules_by_id = MappingProxyType({module['id']: module for module in modules})
+        by_course = {}
+        for module in modules:
+            by_course.setdefault(module['course_id'], []).append(module)
+        self.modules_by_course = MappingProxyType({key: tuple(items) for key, items in by_course.items()})
+        self.quizzes_by_module = MappingProxyType({quiz['module_id']: freeze(quiz) for quiz in quizzes})
+        self.version = version
+        self.loaded_at = time.monotonic()
+
+
+class CatalogCache:
+    """Read-through cache of the course catalog"""
+
+    VERSION_SQL = """
+        SELECT
+            (SELECT CONCAT(COUNT(*), '/', COALESCE(MAX(updated_at), '')) FROM courses) AS courses,
+            (SELECT CONCAT(COUNT(*), '/', COALESCE(MAX(updated_at), '')) FROM modules) AS modules,
+            (SELECT CONCAT(COUNT(*), '/', COALESCE(MAX(updated_at), '')) FROM quizzes) AS quizzes
+    """
+
+    def __init__(self, ttl=300.0):
+        self.ttl = ttl
+        self._snapshot = None
+        self._invalidated = False
+        self._lock = threading.Lock()
+        self.loads = 0
+
+    def invalidate(self):
+        """Reload on next access (call after changing catalog tables)"""
+        self._invalidated = True
+
+    def get(self):
+        """Current snapshot, loading or revalidating it when needed"""
+        snapshot = self._snapshot
+        if snapshot is not None and not self._invalidated and time.monotonic() - snapshot.loaded_at < self._ttl():
+            return snapshot
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None and not self._invalidated and time.monotonic() - snapshot.loaded_at < self._ttl():
+                return snapshot
+            self._snapshot = self._refresh(snapshot)
+            return self._snapshot
+
+    def _ttl(self):
+        from flask import current_app, has_app_context
+        if has_app_context():
+            return current_app.config.get("CATALOG_CACHE_TTL", self.ttl)
+        return self.ttl
+
+    def _refresh(self, snapshot):
+        cur = None
+        try:
+            cur = db_cursor()
+            cur.execute(self.VERSION_SQL)
+            row = cur.fetchone()
+            version = (row['courses'], row['modules'], row['quizzes'])
+            if snapshot is not None and not self._invalidated and snapshot.version == version:
+                snapshot.loaded_at = time.monotonic()
+                return snapshot
+            reason = "initial" if snapshot is None else ("invalidated" if self._invalidated else "changed")
+            self._invalidated = False
+            snapshot = self._load(cur, version)
+            self.loads += 1
+            CATALOG_LOADS.inc(reason)
+            return snapshot
+        finally:
+            if cur:
+                cur.close()
+
+    @staticmethod
+    def _load(cur, version):
+        from .courses import Course, Module, Quiz
+
+        cur.execute("""
+            SELECT id, title, title_hindi, description, level, duration_hours,
+                   total_modules, category, created_at, updated_at
+            FROM courses
+            WHERE is_active = 1
+            ORDER BY sort_order, created_at
+        """)
+        courses = [Course._format_course(row) for row in cur.fetchall()]
+
+        cur.execute("""
+            SELECT id, course_id, title, title_hindi, description, module_order,
+                   duration_minutes, content_type, content_data, prerequisites,
+                   is_locked, created_at, updated_at
+            FROM modules
+            WHERE is_active = 1
+            ORDER BY course_id, module_order
+        """)
+        modules = [Module._format_module(row) for row in cur.fetchall()]
+
+        cur.execute("""
+            SELECT id, module_id, title, questions_data, passing_score,
+                   time_limit_minutes, max_attempts, created_at, updated_at
+            FROM quizzes
+            WHERE is_active = 1
+            ORDER BY id
+        """)
+        # First active quiz per module, as the per-module query returned
+        quizzes = {}
+        for row in cur.fetchall():
+            quizzes.setdefault(row['module_id'], Quiz._format_quiz(row))
+
+        return CatalogSnapshot(courses, modules, quizzes.values(), version)
+
+    def get_stats(self):
+        snapshot = self._snapshot
+        return {
+            'loaded': snapshot is not None,
+            'loads': self.loads,
+            'courses': len(snapshot.courses) if snapshot else 0,
+            'modules': len(snapshot.modules_by_id) if snapshot else 0,
+            'quizzes': len(snapshot.quizzes_by_module) if snapshot else 0,
+            'age_seconds': round(time.monotonic() - snapshot.loaded_at, 1) if snapshot else None
+        }
+
+
+# Global catalog cache
+catalog = CatalogCache()
@@ -5,7 +5,9 @@ Course and Module Models for Learning Management System
 - Real-time progress updates
 """
 from ..extensions import mysql
-from datetime import datetime, timedelta
+from .catalog import catalog, thaw
+from .streaks import UserStreak
+from datetime import datetime
 import json
 
 
@@ -13,67 +15,37 @@ class Course:
     """Course model for managing learning courses"""
     
     @staticmethod
-    def get_all_courses():
-        """Get all available courses"""
+    def get_all_courses(limit=None):
+        """Get all available courses (first `limit` in display order if given)"""
         try:
-            cur = mysql.connection.cursor()
-            cur.execute("""
-                SELECT id, title, title_hindi, description, level, duration_hours, 
-                       total_modules, category, created_at, updated_at
-                FROM courses 
-                WHERE is_active = 1 
-                ORDER BY sort_order, created_at
-            """)
-            courses = cur.fetchall()
-            cur.close()
-            
-            return [
-                {
-                    'id': course['id'],
-                    'title': course['title'],
-                    'title_hindi': course['title_hindi'],
-                    'description': course['description'],
-                    'level': course['level'],
-                    'duration_hours': course['duration_hours'],
-                    'total_modules': course['total_modules'],
-                    'category': course['category'],
-                    'created_at': course['created_at'],
-                    'updated_at': course['updated_at']
-                }
-                for course in courses
-            ]
+            courses = catalog.get().courses
+            return [thaw(course) for course in (courses[:limit] if limit else courses)]
         except Exception as e:
             print(f"Error getting courses: {e}")
             return []
     
+    @staticmethod
+    def _format_course(course):
+        """Course row as a plain dict"""
+        return {
+            'id': course['id'],
+            'title': course['title'],
+            'title_hindi': course['title_hindi'],
+            'description': course['description'],
+            'level': course['level'],
+            'duration_hours': course['duration_hours'],
+            'total_modules': course['total_modules'],
+            'category': course['category'],
+            'created_at': course['created_at'],
+            'updated_at': course['updated_at']
+        }
+    
     @staticmethod
     def get_course_by_id(course_id):
         """Get course by ID"""
         try:
-            cur = mysql.connection.cursor()
-            cur.execute("""
-                SELECT id, title, title_hindi, description, level, duration_hours, 
-                       total_modules, category, created_at, updated_at
-                FROM courses 
-                WHERE id = %s AND is_active = 1
-            """, [course_id])
-            course = cur.fetchone()
-            cur.close()
-            
-            if course:
-                return {
-                    'id': course['id'],
-                    'title': course['title'],
-                    'title_hindi': course['title_hindi'],
-                    'description': course['description'],
-                    'level': course['level'],
-                    'duration_hours': course['duration_hours'],
-                    'total_modules': course['total_modules'],
-                    'category': course['category'],
-                    'created_at': course['created_at'],
-                    'updated_at': course['updated_at']
-                }
-            return None
+            course = catalog.get().courses_by_id.get(int(course_id))
+            return thaw(course) if course else None
         except Exception as e:
             print(f"Error getting course: {e}")
             return None
@@ -86,36 +58,7 @@ class Module:
     def get_course_modules(course_id):
         """Get all modules for a course"""
         try:
-            cur = mysql.connection.cursor()
-            cur.execute("""
-                SELECT id, course_id, title, title_hindi, description, module_order, 
-                       duration_minutes, content_type, content_data, prerequisites, 
-                       is_locked, created_at, updated_at
-                FROM modules 
-                WHERE course_id = %s AND is_active = 1 
-                ORDER BY module_order
-            """, [course_id])
-            modules = cur.fetchall()
-            cur.close()
-            
-            return [
-                {
-                    'id': module['id'],
-                    'course_id': module['course_id'],
-                    'title': module['title'],
-                    'title_hindi': module['title_hindi'],
-                    'description': module['description'],
-                    'module_order': module['module_order'],
-                    'duration_minutes': module['duration_minutes'],
-                    'content_type': module['content_type'],
-                    'content_data': json.loads(module['content_data']) if module['content_data'] else {},
-                    'prerequisites': json.loads(module['prerequisites']) if module['prerequisites'] else [],
-                    'is_locked': bool(module['is_locked']),
-                    'created_at': module['created_at'],
-                    'updated_at': module['updated_at']
-                }
-                for module in modules
-            ]
+            return [thaw(module) for module in catalog.get().modules_by_course.get(int(course_id), ())]
         except Exception as e:
             print(f"Error getting modules: {e}")
             return []
@@ -124,37 +67,30 @@ class Module:
     def get_module_by_id(module_id):
         """Get module by ID"""
         try:
-            cur = mysql.connection.cursor()
-            cur.execute("""
-                SELECT id, course_id, title, title_hindi, description, module_order, 
-                       duration_minutes, content_type, content_data, prerequisites, 
-                       is_locked, created_at, updated_at
-                FROM modules 
-                WHERE id = %s AND is_active = 1
-            """, [module_id])
-            module = cur.fetchone()
-            cur.close()
-            
-            if module:
-                return {
-                    'id': module['id'],
-                    'course_id': module['course_id'],
-                    'title': module['title'],
-                    'title_hindi': module['title_hindi'],
-                    'description': module['description'],
-                    'module_order': module['module_order'],
-                    'duration_minutes': module['duration_minutes'],
-                    'content_type': module['content_type'],
-                    'content_data': json.loads(module['content_data']) if module['content_data'] else {},
-                    'prerequisites': json.loads(module['prerequisites']) if module['prerequisites'] else [],
-                    'is_locked': bool(module['is_locked']),
-                    'created_at': module['created_at'],
-                    'updated_at': module['updated_at']
-                }
-            return None
+            module = catalog.get().modules_by_id.get(int(module_id))
+            return thaw(module) if module else None
         except Exception as e:
             print(f"Error getting module: {e}")
             return None
+    
+    @staticmethod
+    def _format_module(module):
+        """Module row with content_data and prerequisites parsed"""
+        return {
+            'id': module['id'],
+            'course_id': module['course_id'],
+            'title': module['title'],
+            'title_hindi': module['title_hindi'],
+            'description': module['description'],
+            'module_order': module['module_order'],
+            'duration_minutes': module['duration_minutes'],
+            'content_type': module['content_type'],
+            'content_data': json.loads(module['content_data']) if module['content_data'] else {},
+            'prerequisites': json.loads(module['prerequisites']) if module['prerequisites'] else [],
+            'is_locked': bool(module['is_locked']),
+            'created_at': module['created_at'],
+            'updated_at': module['updated_at']
+        }
 
 
 class UserProgress:
@@ -176,25 +112,53 @@ class UserProgress:
             cur.close()
             
             if progress:
-                return {
-                    'id': progress['id'],
-                    'user_id': progress['user_id'],
-                    'course_id': progress['course_id'],
-                    'modules_completed': progress['modules_completed'],
-                    'total_modules': progress['total_modules'],
-                    'progress_percentage': float(progress['progress_percentage']) if progress['progress_percentage'] else 0.0,
-                    'time_spent_minutes': progress['time_spent_minutes'],
-                    'last_accessed': progress['last_accessed'].isoformat() if progress['last_accessed'] else None,
-                    'is_completed': bool(progress['is_completed']),
-                    'completion_date': progress['completion_date'].isoformat() if progress['completion_date'] else None,
-                    'created_at': progress['created_at'].isoformat() if progress['created_at'] else None,
-                    'updated_at': progress['updated_at'].isoformat() if progress['updated_at'] else None
-                }
+                return UserProgress._format_course_progress(progress)
             return None
         except Exception as e:
             print(f"Error getting user course progress: {e}")
             return None
     
+    @staticmethod
+    def get_user_courses_progress(user_id, course_ids):
+        """Get user's progress for several courses in one query, keyed by course_id"""
+        if not course_ids:
+            return {}
+        try:
+            cur = mysql.connection.cursor()
+            placeholders = ", ".join(["%s"] * len(course_ids))
+            cur.execute(f"""
+                SELECT id, user_id, course_id, modules_completed, total_modules, 
+                       progress_percentage, time_spent_minutes, last_accessed, 
+                       is_completed, completion_date, created_at, updated_at
+                FROM user_course_progress 
+                WHERE user_id = %s AND course_id IN ({placeholders})
+            """, [user_id, *course_ids])
+            rows = cur.fetchall()
+            cur.close()
+            
+            return {row['course_id']: UserProgress._format_course_progress(row) for row in rows}
+        except Exception as e:
+            print(f"Error getting user courses progress: {e}")
+            return {}
+    
+    @staticmethod
+    def _format_course_progress(progress):
+        """user_course_progress row as a JSON-friendly dict"""
+        return {
+            'id': progress['id'],
+            'user_id': progress['user_id'],
+            'course_id': progress['course_id'],
+            'modules_completed': progress['modules_completed'],
+            'total_modules': progress['total_modules'],
+            'progress_percentage': float(progress['progress_percentage']) if progress['progress_percentage'] else 0.0,
+            'time_spent_minutes': progress['time_spent_minutes'],
+            'last_accessed': progress['last_accessed'].isoformat() if progress['last_accessed'] else None,
+            'is_completed': bool(progress['is_completed']),
+            'completion_date': progress['completion_date'].isoformat() if progress['completion_date'] else None,
+            'created_at': progress['created_at'].isoformat() if progress['created_at'] else None,
+            'updated_at': progress['updated_at'].isoformat() if progress['updated_at'] else None
+        }
+    
     @staticmethod
     def get_user_module_progress(user_id, module_id):
         """Get user's progress for a specific module"""
@@ -272,6 +236,7 @@ class UserProgress:
                     datetime.now() if progress_percentage >= 100 else None
                 ])
             
+            UserStreak.record(cur, user_id)
             mysql.connection.commit()
             cur.close()
             
@@ -393,26 +358,8 @@ class UserProgress:
             
             recent_activity = cur.fetchall()
             
-            # Calculate streak
-            cur.execute("""
-                SELECT DISTINCT DATE(last_accessed) as activity_date
-                FROM user_module_progress 
-                WHERE user_id = %s AND last_accessed >= DATE_SUB(NOW(), INTERVAL 365 DAY)
-                ORDER BY activity_date DESC
-            """, [user_id])
-            
-            activity_dates = [row['activity_date'] for row in cur.fetchall()]
-            
-            # Calculate current streak
-            streak_days = 0
-            current_date = datetime.now().date()
-            
-            for i, activity_date in enumerate(activity_dates):
-                expected_date = current_date - timedelta(days=i)
-                if activity_date == expected_date:
-                    streak_days += 1
-                else:
-                    break
+            # Current streak (maintained incrementally in user_streaks)
+            streak_days = UserStreak.get_streak_days(user_id, cur)
             
             cur.close()
             
@@ -449,33 +396,27 @@ class Quiz:
     def get_module_quiz(module_id):
         """Get quiz for a module"""
         try:
-            cur = mysql.connection.cursor()
-            cur.execute("""
-                SELECT id, module_id, title, questions_data, passing_score, 
-                       time_limit_minutes, max_attempts, created_at, updated_at
-                FROM quizzes 
-                WHERE module_id = %s AND is_active = 1
-            """, [module_id])
-            quiz = cur.fetchone()
-            cur.close()
-            
-            if quiz:
-                return {
-                    'id': quiz['id'],
-                    'module_id': quiz['module_id'],
-                    'title': quiz['title'],
-                    'questions': json.loads(quiz['questions_data']) if quiz['questions_data'] else [],
-                    'passing_score': float(quiz['passing_score']) if quiz['passing_score'] else 70.0,
-                    'time_limit_minutes': quiz['time_limit_minutes'],
-                    'max_attempts': quiz['max_attempts'],
-                    'created_at': quiz['created_at'],
-                    'updated_at': quiz['updated_at']
-                }
-            return None
+            quiz = catalog.get().quizzes_by_module.get(int(module_id))
+            return thaw(quiz) if quiz else None
         except Exception as e:
             print(f"Error getting quiz: {e}")
             return None
     
+    @staticmethod
+    def _format_quiz(quiz):
+        """Quiz row with questions parsed"""
+        return {
+            'id': quiz['id'],
+            'module_id': quiz['module_id'],
+            'title': quiz['title'],
+            'questions': json.loads(quiz['questions_data']) if quiz['questions_data'] else [],
+            'passing_score': float(quiz['passing_score']) if quiz['passing_score'] else 70.0,
+            'time_limit_minutes': quiz['time_limit_minutes'],
+            'max_attempts': quiz['max_attempts'],
+            'created_at': quiz['created_at'],
+            'updated_at': quiz['updated_at']
+        }
+    
     @staticmethod
     def submit_quiz_attempt(user_id, quiz_id, answers, score):
         """Submit a quiz attempt"""
@@ -495,4 +436,4 @@ class Quiz:
         except Exception as e:
             print(f"Error submitting quiz attempt: {e}")
             mysql.connection.rollback()
-            return None
\ No newline at end of file
+            return None
\ No newline at end of file
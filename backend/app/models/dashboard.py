@@ -0,0 +1,36 @@
+"""
+Dashboard data loader
+Fetches everything the dashboard page renders with a fixed number of queries:
+user, stats, courses, course progress (batched with IN), achievements and
+weekly activity - independent of how many courses are shown
+"""
+from .achievements import Achievement
+from .courses import Course, UserProgress
+from .stats import UserActivity, UserStats
+from .user import User
+
+# Upper bound on queries per DashboardData.load() call (catalog cache warm)
+DASHBOARD_MAX_QUERIES = 6
+
+DEFAULT_STATS = {
+    'courses': 0, 'progress': 0, 'achievements': 0,
+    'points': 0, 'modules_completed': 0
+}
+
+
+class DashboardData:
+    @staticmethod
+    def load(user_id, course_limit=3):
+        """Dashboard context: user, stats, courses with user_progress, achievements, weekly_activity"""
+        courses = Course.get_all_courses(limit=course_limit)
+        progress = UserProgress.get_user_courses_progress(user_id, [course['id'] for course in courses])
+        for course in courses:
+            course['user_progress'] = progress.get(course['id'])
+
+        return {
+            'user': User.get_by_id(user_id) or {},
+            'stats': UserStats.get_by_user_id(user_id) or dict(DEFAULT_STATS),
+            'courses': courses,
+            'achievements': Achievement.get_user_achievements(user_id),
+            'weekly_activity': UserActivity.get_weekly_activity(user_id)
+        }
@@ -0,0 +1,187 @@
+"""
+Learning path module registry
+The numbered ISL learning path (titles, Hindi titles, page templates and
+availability) lives here as config; the registry indexes it once at import
+- next_modules(id): the following three path modules, precomputed per id
+- coming_soon(): announced modules that are not available yet, precomputed
+- all_modules(): path entries merged with their DB `modules` rows (DB fields
+  win), rebuilt only when the catalog cache loads a new snapshot
+Shared by the pages, learning and courses routes
+"""
+from types import MappingProxyType
+
+from .catalog import catalog, freeze, thaw
+
+DEFAULT_TEMPLATE = "courses/module_learning.html"
+NEXT_MODULES_SHOWN = 3
+
+LEARNING_PATH = (
+    {
+        "id": 1,
+        "title": "ISL Alphabet & Fingerspelling",
+        "title_hindi": "भारतीय सांकेतिक वर्णमाला",
+        "description": "Master the 26 letters of ISL alphabet with proper hand shapes and movements.",
+        "template": "courses/module1.html",
+        "available": True
+    },
+    {
+        "id": 2,
+        "title": "Numbers & Mathematical Concepts",
+        "title_hindi": "संख्या और गणित",
+        "description": "Learn cardinal numbers, ordinal numbers, and basic arithmetic operations in ISL.",
+        "template": "courses/module2.html",
+        "available": True
+    },
+    {
+        "id": 3,
+        "title": "Family & Relationships",
+        "title_hindi": "परिवार और रिश्ते",
+        "description": "Essential vocabulary for family members, relationships, and social connections.",
+        "template": "courses/module3.html",
+        "available": True
+    },
+    {
+        "id": 4,
+        "title": "Colors, Shapes & Objects",
+        "title_hindi": "रंग, आकार और वस्तुएं",
+        "description": "Learn to describe the visual world - colors, geometric shapes, and common objects.",
+        "template": "courses/module4.html",
+        "available": True
+    },
+    {
+        "id": 5,
+        "title": "Time & Calendar Concepts",
+        "title_hindi": "समय और कैलेंडर",
+        "description": "Master time expressions, days, months, seasons, and temporal concepts.",
+        "template": "courses/module5.html",
+        "available": True
+    },
+    {
+        "id": 6,
+        "title": "Basic Grammar & Sentence Structure",
+        "title_hindi": "व्याकरण और वाक्य संरचना",
+        "description": "Understand ISL grammar rules, word order, and sentence formation.",
+        "template": "courses/module6.html",
+        "available": True
+    },
+    {
+        "id": 7,
+        "title": "Daily Activities & Routines",
+        "title_hindi": "दैनिक गतिविधियां",
+        "description": "Learn signs for everyday activities, routines, and common actions.",
+        "template": DEFAULT_TEMPLATE,
+        "available": False,
+        "coming_soon": True
+    },
+    {
+        "id": 8,
+        "title": "Emotions & Feelings",
+        "title_hindi": "भावनाएं और अनुभूतियां",
+        "description": "Express emotions, feelings, and psychological states through ISL.",
+        "template": DEFAULT_TEMPLATE,
+        "available": False,
+        "coming_soon": True
+    },
+    {
+        "id": 9,
+        "title": "Places & Directions",
+        "title_hindi": "स्थान और दिशाएं",
+        "description": "Navigate and describe locations, directions, and geographical concepts.",
+        "template": DEFAULT_TEMPLATE,
+        "available": False,
+        "coming_soon": True
+    },
+    {
+        "id": 10,
+        "title": "Food & Health",
+        "title_hindi": "भोजन और स्वास्थ्य",
+        "description": "Learn vocabulary related to food, nutrition, health, and medical terms.",
+        "template": DEFAULT_TEMPLATE,
+        "available": False,
+        "coming_soon": True
+    },
+    {
+        "id": 11,
+        "title": "Education & Work",
+        "title_hindi": "शिक्षा और कार्य",
+        "description": "Professional and educational vocabulary for academic and workplace settings.",
+        "template": DEFAULT_TEMPLATE,
+        "available": False,
+        "coming_soon": True
+    },
+    {
+        "id": 12,
+        "title": "Advanced Grammar & Discourse",
+        "title_hindi": "उन्नत व्याकरण",
+        "description": "Advanced linguistic structures, discourse markers, and complex communication.",
+        "template": DEFAULT_TEMPLATE,
+        "available": False,
+        "coming_soon": True
+    }
+)
+
+_EMPTY = MappingProxyType({})
+
+
+class ModuleRegistry:
+    """Indexed learning path with precomputed navigation lists"""
+
+    def __init__(self, path=LEARNING_PATH, cache=catalog):
+        entries = tuple(freeze(entry) for entry in path)
+        self.cache = cache
+        self.by_id = MappingProxyType({entry['id']: entry for entry in entries})
+        self._next = MappingProxyType({
+            entry['id']: entries[index + 1:index + 1 + NEXT_MODULES_SHOWN]
+            for index, entry in enumerate(entries)
+        })
+        self._coming_soon = tuple(entry for entry in entries if entry.get('coming_soon'))
+        self._merged = (None, _EMPTY)  # (catalog snapshot, merged entries by id)
+
+    def entry(self, module_id):
+        """Path entry for a module, {} when it is not on the path"""
+        return thaw(self.by_id.get(module_id, _EMPTY))
+
+    def is_available(self, module_id):
+        return bool(self.by_id.get(module_id, _EMPTY).get('available'))
+
+    def template_for(self, module_id, default=DEFAULT_TEMPLATE):
+        """Page template of an available module, `default` otherwise"""
+        entry = self.by_id.get(module_id, _EMPTY)
+        return entry['template'] if entry.get('available') else default
+
+    def title(self, module_id):
+        entry = self.by_id.get(module_id)
+        return entry['title'] if entry else f"Module {module_id}"
+
+    def next_modules(self, module_id):
+        """Up to three path modules following `module_id`"""
+        return thaw(self._next.get(module_id, ()))
+
+    def coming_soon(self):
+        return thaw(self._coming_soon)
+
+    def all_modules(self):
+        """Path entries by id, merged with their DB module rows"""
+        return thaw(self._merged_entries())
+
+    def _merged_entries(self):
+        snapshot = self.cache.get()
+        built_for, merged = self._merged
+        if built_for is snapshot:
+            return merged
+        merged = {}
+        for module_id, entry in self.by_id.items():
+            row = snapshot.modules_by_id.get(module_id)
+            merged[module_id] = MappingProxyType({**entry, **row}) if row else entry
+        merged = MappingProxyType(merged)
+        self._merged = (snapshot, merged)
+        return merged
+
+
+# Global registry
+module_registry = ModuleRegistry()
+
+
+def get_module_registry():
+    """Get the global module registry"""
+    return module_registry
@@ -2,7 +2,7 @@
 Portfolio links model
 """
 from ..extensions import mysql
-from ..utils.db_helpers import db_cursor
+from ..utils.db_helpers import db_cursor, row_dict
 
 class PortfolioLink:
     @staticmethod
@@ -32,8 +32,7 @@ class PortfolioLink:
             """, [user_id])
             rows = cur.fetchall()
             if rows:
-                cols = [desc[0] for desc in cur.description]
-                return [dict(zip(cols, row)) for row in rows]
+                return [row_dict(cur, row) for row in rows]
             return []
         finally:
             if cur:
@@ -0,0 +1,137 @@
+"""
+Activity rollups for the chart APIs
+- activity_rollups: per-user day and month buckets of user_activity
+  (minutes and entries per activity type), updated with every log write
+- daily_activity_summary: per-user day buckets of activity_log_realtime,
+  maintained by RealtimeActivityService.write_activity_batch
+Chart endpoints read a bounded number of bucket rows instead of grouping the
+raw logs; `flask backfill-rollups` rebuilds both from history
+"""
+from datetime import date
+from ..extensions import mysql
+from ..utils.db_helpers import db_cursor
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def months_back(day, count):
+    """First day of the month `count` months before `day`"""
+    index = day.year * 12 + day.month - 1 - count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+class ActivityRollup:
+    @staticmethod
+    def record(cur, user_id, activity_type, duration_minutes, activity_date=None):
+        """Add one user_activity entry to its day and month buckets; runs in the caller's transaction"""
+        day = activity_date or date.today()
+        cur.execute("""
+            INSERT INTO activity_rollups (user_id, period, period_start, activity_type, minutes, entries)
+            VALUES (%s, 'day', %s, %s, %s, 1), (%s, 'month', %s, %s, %s, 1)
+            ON DUPLICATE KEY UPDATE
+            minutes = minutes + VALUES(minutes),
+            entries = entries + 1
+        """, (user_id, day, activity_type, duration_minutes,
+              user_id, month_start(day), activity_type, duration_minutes))
+
+    @staticmethod
+    def get_buckets(user_id, period, since):
+        """Bucket rows (period_start, activity_type, minutes, entries) from `since` on"""
+        cur = None
+        try:
+            cur = db_cursor()
+            cur.execute("""
+                SELECT period_start, activity_type, minutes, entries
+                FROM activity_rollups
+                WHERE user_id = %s AND period = %s AND period_start >= %s
+                ORDER BY period_start
+            """, (user_id, period, since))
+            return list(cur.fetchall())
+        finally:
+            if cur:
+                cur.close()
+
+    @staticmethod
+    def get_total_minutes(user_id, activity_type):
+        """All-time minutes for an activity type, summed over month buckets"""
+        cur = None
+        try:
+            cur = db_cursor()
+            cur.execute("""
+                SELECT COALESCE(SUM(minutes), 0) AS total_minutes
+                FROM activity_rollups
+                WHERE user_id = %s AND period = 'month' AND activity_type = %s
+            """, (user_id, activity_type))
+            return int(cur.fetchone()['total_minutes'])
+        finally:
+            if cur:
+                cur.close()
+
+    @staticmethod
+    def get_active_days(user_id, since):
+        """Days with any user_activity since `since`"""
+        cur = None
+        try:
+            cur = db_cursor()
+            cur.execute("""
+                SELECT COUNT(DISTINCT period_start) AS active_days
+                FROM activity_rollups
+                WHERE user_id = %s AND period = 'day' AND period_start >= %s
+            """, (user_id, since))
+            return cur.fetchone()['active_days']
+        finally:
+            if cur:
+                cur.close()
+
+    @staticmethod
+    def backfill(user_id=None):
+        """Rebuild all buckets from the raw logs; returns rows written per table"""
+        user_filter = "WHERE user_id = %s" if user_id is not None else ""
+        params = [user_id] if user_id is not None else []
+        written = {}
+        cur = None
+        try:
+            cur = db_cursor()
+            for period, bucket in (('day', "activity_date"),
+                                   ('month', "DATE_FORMAT(activity_date, '%%Y-%%m-01')")):
+                cur.execute(f"""
+                    INSERT INTO activity_rollups (user_id, period, period_start, activity_type, minutes, entries)
+                    SELECT user_id, '{period}', {bucket}, activity_type, SUM(duration_minutes), COUNT(*)
+                    FROM user_activity
+                    {user_filter}
+                    GROUP BY user_id, {bucket}, activity_type
+                    ON DUPLICATE KEY UPDATE minutes = VALUES(minutes), entries = VALUES(entries)
+                """, params)
+                written[f"activity_rollups.{period}"] = cur.rowcount
+
+            cur.execute(f"""
+                INSERT INTO daily_activity_summary
+                (user_id, activity_date, total_study_minutes, modules_worked_on, modules_completed,
+                 quizzes_completed, practice_sessions, xp_earned)
+                SELECT user_id, DATE(created_at),
+                       SUM(duration_minutes),
+                       COUNT(DISTINCT module_id),
+                       SUM(activity_type = 'module_complete'),
+                       SUM(activity_type IN ('quiz_attempt', 'quiz_pass')),
+                       SUM(activity_type = 'practice_session'),
+                       SUM(xp_earned)
+                FROM activity_log_realtime
+                {user_filter}
+                GROUP BY user_id, DATE(created_at)
+                ON DUPLICATE KEY UPDATE
+                total_study_minutes = VALUES(total_study_minutes),
+                modules_worked_on = VALUES(modules_worked_on),
+                modules_completed = VALUES(modules_completed),
+                quizzes_completed = VALUES(quizzes_completed),
+                practice_sessions = VALUES(practice_sessions),
+                xp_earned = VALUES(xp_earned)
+            """, params)
+            written["daily_activity_summary"] = cur.rowcount
+
+            mysql.connection.commit()
+            return written
+        finally:
+            if cur:
+                cur.close()
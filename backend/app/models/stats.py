@@ -2,8 +2,10 @@
 Enhanced User statistics and activity models with real-time features
 """
 from ..extensions import mysql
-from ..utils.db_helpers import db_cursor
-from datetime import datetime, timedelta
+from ..utils.db_helpers import db_cursor, row_dict
+from .rollups import ActivityRollup
+from .streaks import UserStreak
+from datetime import date, timedelta
 import json
 
 class UserStats:
@@ -23,8 +25,7 @@ class UserStats:
                 row = cur.fetchone()
             
             if row:
-                cols = [desc[0] for desc in cur.description]
-                return dict(zip(cols, row))
+                return row_dict(cur, row)
             return None
         finally:
             if cur:
@@ -67,8 +68,7 @@ class UserStats:
             cur.execute("SELECT * FROM user_stats WHERE user_id = %s", [user_id])
             row = cur.fetchone()
             if row:
-                cols = [desc[0] for desc in cur.description]
-                return dict(zip(cols, row))
+                return row_dict(cur, row)
             return None
         finally:
             if cur:
@@ -85,6 +85,8 @@ class UserActivity:
                 INSERT INTO user_activity (user_id, activity_type, duration_minutes, activity_date)
                 VALUES (%s, %s, %s, CURDATE())
             """, (user_id, activity_type, duration_minutes))
+            ActivityRollup.record(cur, user_id, activity_type, duration_minutes)
+            UserStreak.record(cur, user_id)
             mysql.connection.commit()
         finally:
             if cur:
@@ -105,8 +107,7 @@ class UserActivity:
             """, [user_id])
             rows = cur.fetchall()
             if rows:
-                cols = [desc[0] for desc in cur.description]
-                return [dict(zip(cols, row)) for row in rows]
+                return [row_dict(cur, row) for row in rows]
             return []
         finally:
             if cur:
@@ -202,36 +203,8 @@ class UserActivity:
     
     @staticmethod
     def calculate_streak_days(user_id):
-        """Calculate consecutive days of activity"""
-        cur = None
-        try:
-            cur = db_cursor()
-            cur.execute("""
-                SELECT DISTINCT activity_date
-                FROM user_activity 
-                WHERE user_id = %s 
-                ORDER BY activity_date DESC
-                LIMIT 30
-            """, [user_id])
-            
-            dates = [row['activity_date'] for row in cur.fetchall()]
-            if not dates:
-                return 0
-            
-            streak = 0
-            current_date = datetime.now().date()
-            
-            for date in dates:
-                if date == current_date or date == current_date - timedelta(days=streak):
-                    streak += 1
-                    current_date = date
-                else:
-                    break
-            
-            return streak
-        finally:
-            if cur:
-                cur.close()
+        """Consecutive days of activity (maintained incrementally in user_streaks)"""
+        return UserStreak.get_streak_days(user_id)
     
     @staticmethod
     def get_user_tasks(user_id, limit=50):
@@ -429,20 +402,16 @@ class UserActivity:
         try:
             cur = db_cursor()
             
-            # Get last 7 days of activity
-            cur.execute("""
-                SELECT 
-                    DATE(activity_date) as date,
-                    SUM(duration_minutes) as study_minutes,
-                    COUNT(DISTINCT user_id) as sessions
-                FROM user_activity 
-                WHERE user_id = %s 
-                AND activity_date >= DATE_SUB(CURDATE(), INTERVAL 7 DAY)
-                GROUP BY DATE(activity_date)
-                ORDER BY date
-            """, [user_id])
-            
-            activity_data = cur.fetchall()
+            # Get last 7 days of activity (day buckets)
+            activity_data = []
+            for bucket in ActivityRollup.get_buckets(user_id, 'day', date.today() - timedelta(days=7)):
+                if activity_data and activity_data[-1]['date'] == bucket['period_start']:
+                    day = activity_data[-1]
+                else:
+                    day = {'date': bucket['period_start'], 'study_minutes': 0, 'sessions': 0}
+                    activity_data.append(day)
+                day['study_minutes'] += bucket['minutes']
+                day['sessions'] += bucket['entries']
             
             # Get tasks completed per day
             cur.execute("""
@@ -474,29 +443,10 @@ class UserActivity:
         try:
             cur = db_cursor()
             
-            # Get current streak
-            current_streak = UserActivity.calculate_streak_days(user_id)
-            
-            # Get longest streak
-            cur.execute("""
-                SELECT activity_date
-                FROM user_activity 
-                WHERE user_id = %s 
-                GROUP BY activity_date
-                ORDER BY activity_date
-            """, [user_id])
-            
-            dates = [row['activity_date'] for row in cur.fetchall()]
-            
-            longest_streak = 0
-            current_count = 0
-            
-            for i in range(len(dates)):
-                if i == 0 or dates[i] == dates[i-1] + timedelta(days=1):
-                    current_count += 1
-                    longest_streak = max(longest_streak, current_count)
-                else:
-                    current_count = 1
+            # Get current and longest streak
+            streak = UserStreak.get(user_id, cur)
+            current_streak = streak['current_streak']
+            longest_streak = streak['longest_streak']
             
             # Get this week's activity
             cur.execute("""
@@ -527,4 +477,4 @@ class UserActivity:
             }
         finally:
             if cur:
-                cur.close()
\ No newline at end of file
+                cur.close()
\ No newline at end of file
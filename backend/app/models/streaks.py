@@ -0,0 +1,70 @@
+"""
+Activity streaks
+One row per user in user_streaks holds the current run, the longest run and
+the last active date. Every activity write advances it in O(1); reads are a
+primary-key lookup instead of walking lists of distinct activity dates.
+"""
+from datetime import date, timedelta
+from ..utils.db_helpers import db_cursor
+
+# Advance a streak by one active day. Assignments run left to right, so
+# current_streak sees the old last_active_date and longest_streak the new run
+RECORD_SQL = """
+    INSERT INTO user_streaks (user_id, current_streak, longest_streak, last_active_date)
+    VALUES (%s, 1, 1, %s)
+    ON DUPLICATE KEY UPDATE
+    current_streak = CASE
+        WHEN VALUES(last_active_date) <= last_active_date THEN current_streak
+        WHEN VALUES(last_active_date) = last_active_date + INTERVAL 1 DAY THEN current_streak + 1
+        ELSE 1
+    END,
+    longest_streak = GREATEST(longest_streak, current_streak),
+    last_active_date = GREATEST(last_active_date, VALUES(last_active_date))
+"""
+
+EMPTY_STREAK = {'current_streak': 0, 'longest_streak': 0, 'last_active_date': None}
+
+
+class UserStreak:
+    @staticmethod
+    def record(cur, user_id, activity_date=None):
+        """Count a day of activity; runs in the caller's transaction"""
+        cur.execute(RECORD_SQL, (user_id, activity_date or date.today()))
+
+    @staticmethod
+    def record_many(cur, user_days):
+        """Count several (user_id, date) pairs; days older than a user's last active day are ignored"""
+        if user_days:
+            cur.executemany(RECORD_SQL, sorted(set(user_days), key=lambda pair: pair[1]))
+
+    @staticmethod
+    def get(user_id, cur=None):
+        """Current and longest streak; the current run is 0 once a whole day was missed"""
+        own_cursor = cur is None
+        try:
+            if own_cursor:
+                cur = db_cursor()
+            cur.execute("""
+                SELECT current_streak, longest_streak, last_active_date
+                FROM user_streaks WHERE user_id = %s
+            """, [user_id])
+            row = cur.fetchone()
+        finally:
+            if own_cursor and cur:
+                cur.close()
+
+        if not row:
+            return dict(EMPTY_STREAK)
+        current = row['current_streak']
+        if row['last_active_date'] < date.today() - timedelta(days=1):
+            current = 0
+        return {
+            'current_streak': current,
+            'longest_streak': max(row['longest_streak'], current),
+            'last_active_date': row['last_active_date']
+        }
+
+    @staticmethod
+    def get_streak_days(user_id, cur=None):
+        """Current streak in days"""
+        return UserStreak.get(user_id, cur)['current_streak']
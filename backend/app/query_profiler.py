@@ -0,0 +1,198 @@
+"""
+SQL query profiler
+Every statement run through a pooled connection's cursor (db_cursor() and
+mysql.connection.cursor() alike) is recorded here by fingerprint
+- Fingerprint: the statement with literals and IN lists collapsed to ?
+- Per fingerprint: calls, total/max time, rows and the routes issuing it
+- Per route: requests, queries and DB time per request
+- Statements slower than SLOW_QUERY_MS are logged with their call site
+- get_report() backs the /api/admin/queries endpoint
+"""
+import logging
+import os
+import re
+import sys
+import threading
+from collections import OrderedDict
+
+from flask import has_request_context, request
+
+_STRING = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|%\(\w+\)s")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_VALUES_LIST = re.compile(r"(\(\s*\?(?:\s*,\s*\?)*\s*\))(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+# Frames from these files are skipped when looking for a slow query's call site
+_INTERNAL_FILES = (os.path.join("app", "db_pool.py"), os.path.join("app", "query_profiler.py"),
+                   os.path.join("utils", "metrics.py"), "MySQLdb")
+
+
+def fingerprint(sql):
+    """Normalized statement shape shared by all calls that differ only in values"""
+    if isinstance(sql, bytes):
+        sql = sql.decode("utf-8", "replace")
+    sql = _STRING.sub("?", sql)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _VALUES_LIST.sub(r"\1", sql)
+    sql = _IN_LIST.sub("(?+)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def _call_site():
+    """file:line (function) of the nearest frame outside the DB layer"""
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if not any(part in filename for part in _INTERNAL_FILES):
+            return f"{os.path.relpath(filename)}:{frame.f_lineno} ({frame.f_code.co_name})"
+        frame = frame.f_back
+    return "unknown"
+
+
+def _current_route():
+    if has_request_context():
+        return request.endpoint or "unmatched"
+    return "background"
+
+
+class _QueryStats:
+    __slots__ = ("sql", "calls", "total", "max", "rows", "routes")
+
+    def __init__(self, sql):
+        self.sql = sql
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.routes = {}
+
+    def to_dict(self):
+        return {
+            'fingerprint': self.sql,
+            'calls': self.calls,
+            'total_ms': round(self.total * 1000, 3),
+            'avg_ms': round(self.total / max(self.calls, 1) * 1000, 3),
+            'max_ms': round(self.max * 1000, 3),
+            'rows': self.rows,
+            'avg_rows': round(self.rows / max(self.calls, 1), 1),
+            'routes': dict(sorted(self.routes.items(), key=lambda item: -item[1]))
+        }
+
+
+class QueryProfiler:
+    """Aggregates query cost by fingerprint and by route"""
+
+    MAX_ROUTES_PER_QUERY = 10
+
+    def __init__(self, enabled=True, slow_ms=200.0, max_fingerprints=1000):
+        self.enabled = enabled
+        self.slow_ms = slow_ms
+        self.max_fingerprints = max_fingerprints
+        self._fingerprints = OrderedDict()  # raw statement -> fingerprint
+        self._queries = {}
+        self._routes = {}
+        self._lock = threading.Lock()
+        self.slow_queries = 0
+        self.logger = logging.getLogger(__name__)
+
+    def configure(self, app):
+        self.enabled = app.config.get("DB_PROFILER_ENABLED", self.enabled)
+        self.slow_ms = app.config.get("SLOW_QUERY_MS", self.slow_ms)
+        self.logger = app.logger
+
+    def _fingerprint(self, sql):
+        # Statements come from a fixed set of templates, so this cache almost always hits
+        key = self._fingerprints.get(sql)
+        if key is None:
+            key = self._fingerprints[sql] = fingerprint(sql)
+            if len(self._fingerprints) > self.max_fingerprints:
+                self._fingerprints.popitem(last=False)
+        return key
+
+    def record(self, sql, seconds, rows):
+        """Record one executed statement"""
+        if not self.enabled:
+            return
+        route = _current_route()
+        with self._lock:
+            key = self._fingerprint(sql)
+            stats = self._queries.get(key)
+            if stats is None:
+                if len(self._queries) >= self.max_fingerprints:
+                    return
+                stats = self._queries[key] = _QueryStats(key)
+            stats.calls += 1
+            stats.total += seconds
+            stats.rows += max(rows or 0, 0)
+            if seconds > stats.max:
+                stats.max = seconds
+            if route in stats.routes or len(stats.routes) < self.MAX_ROUTES_PER_QUERY:
+                stats.routes[route] = stats.routes.get(route, 0) + 1
+
+        if self.slow_ms and seconds * 1000 >= self.slow_ms:
+            self.slow_queries += 1
+            self.logger.warning("Slow query %.1fms (%s rows) at %s [%s]: %s",
+                           seconds * 1000, rows, _call_site(), route, key)
+
+    def record_request(self, route, queries, seconds):
+        """Record the DB cost of one finished request"""
+        if not self.enabled:
+            return
+        with self._lock:
+            stats = self._routes.get(route)
+            if stats is None:
+                stats = self._routes[route] = {'requests': 0, 'queries': 0, 'db_time': 0.0, 'max_queries': 0}
+            stats['requests'] += 1
+            stats['queries'] += queries
+            stats['db_time'] += seconds
+            stats['max_queries'] = max(stats['max_queries'], queries)
+
+    def get_report(self, limit=20, sort="total"):
+        """Top fingerprints (by total, avg, max, calls or rows) and per-route costs"""
+        sort_keys = {
+            'total': lambda s: s.total,
+            'avg': lambda s: s.total / max(s.calls, 1),
+            'max': lambda s: s.max,
+            'calls': lambda s: s.calls,
+            'rows': lambda s: s.rows
+        }
+        with self._lock:
+            queries = sorted(self._queries.values(), key=sort_keys.get(sort, sort_keys['total']), reverse=True)
+            top = [stats.to_dict() for stats in queries[:limit]]
+            routes = {
+                route: {
+                    'requests': stats['requests'],
+                    'avg_queries': round(stats['queries'] / stats['requests'], 2),
+                    'max_queries': stats['max_queries'],
+                    'avg_db_ms': round(stats['db_time'] / stats['requests'] * 1000, 3),
+                    'total_db_ms': round(stats['db_time'] * 1000, 3)
+                }
+                for route, stats in sorted(self._routes.items(), key=lambda item: -item[1]['db_time'])
+            }
+        return {
+            'enabled': self.enabled,
+            'slow_query_ms': self.slow_ms,
+            'slow_queries': self.slow_queries,
+            'fingerprints': len(self._queries),
+            'sort': sort if sort in sort_keys else 'total',
+            'top_queries': top,
+            'routes': routes
+        }
+
+    def reset(self):
+        with self._lock:
+            self._queries = {}
+            self._routes = {}
+            self.slow_queries = 0
+
+
+# Global profiler instance
+query_profiler = QueryProfiler()
+
+
+def get_query_profiler():
+    """Get the global query profiler"""
+    return query_profiler
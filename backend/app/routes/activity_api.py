@@ -85,9 +85,12 @@ def log_activity():
             metadata=data.get("metadata", {})
         )
         
+        # Buffered events are written within ACTIVITY_FLUSH_INTERVAL_MS and have no id yet
+        queued = activity_id == RealtimeActivityService.QUEUED
         return jsonify({
             "status": "success",
-            "activity_id": activity_id,
+            "activity_id": None if queued else activity_id,
+            "queued": queued,
             "message": "Activity logged successfully"
         })
     except Exception as e:
@@ -284,4 +287,4 @@ except ImportError:
         pass
     
     def broadcast_progress_update(user_id: int, progress_data: dict):
-        pass
\ No newline at end of file
+        pass
\ No newline at end of file
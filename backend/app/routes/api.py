@@ -1,9 +1,12 @@
 """
-API routes: /api/hours_spent, /api/performance_grade
+API routes: /api/hours_spent, /api/performance_grade, /api/admin/queries
+Activity figures come from the activity_rollups day/month buckets
 """
 from datetime import date, timedelta
-from flask import Blueprint, jsonify, session
-from ..utils.decorators import login_required
+from flask import Blueprint, jsonify, request, session
+from ..models.rollups import ActivityRollup, months_back
+from ..query_profiler import get_query_profiler
+from ..utils.decorators import admin_required, login_required
 from ..utils.db_helpers import db_cursor
 
 api_bp = Blueprint("api", __name__)
@@ -13,50 +16,23 @@ api_bp = Blueprint("api", __name__)
 def hours_spent():
     """Get user's study hours for the last 6 months"""
     user_id = session["user_id"]
-    cur = None
     try:
-        cur = db_cursor()
-        
-        # Aggregate last 6 months of activity
-        cur.execute("""
-            SELECT 
-                DATE_FORMAT(activity_date, '%%b %%Y') AS month,
-                SUM(CASE WHEN activity_type='study' THEN duration_minutes ELSE 0 END) AS study,
-                SUM(CASE WHEN activity_type='online_test' THEN duration_minutes ELSE 0 END) AS online_test
-            FROM user_activity
-            WHERE user_id=%s AND activity_date >= DATE_SUB(CURDATE(), INTERVAL 6 MONTH)
-            GROUP BY month
-            ORDER BY MIN(activity_date) ASC
-        """, [user_id])
-        
-        rows = cur.fetchall()
-        labels = []
-        study = []
-        online_test = []
-        
-        # Fill last 6 months with zeros if no activity
+        # Last 6 month buckets
         today = date.today()
-        for i in reversed(range(6)):
-            month_date = (today.replace(day=1) - timedelta(days=i*30))
-            month_name = month_date.strftime("%b %Y")
-            
-            # Check if row exists for this month
-            found = next((r for r in rows if r[0] == month_name), None)
-            labels.append(month_name)
-            study.append(found[1] if found else 0)
-            online_test.append(found[2] if found else 0)
+        months = [months_back(today, i) for i in reversed(range(6))]
+        minutes = {}
+        for bucket in ActivityRollup.get_buckets(user_id, 'month', months[0]):
+            minutes[(bucket['period_start'], bucket['activity_type'])] = bucket['minutes']
         
+        # Fill months without activity with zeros
         return jsonify({
-            "labels": labels,
-            "study": study,
-            "online_test": online_test
+            "labels": [month.strftime("%b %Y") for month in months],
+            "study": [minutes.get((month, 'study'), 0) for month in months],
+            "online_test": [minutes.get((month, 'online_test'), 0) for month in months]
         })
     
     except Exception as e:
         return jsonify({"labels": [], "study": [], "online_test": []}), 500
-    finally:
-        if cur:
-            cur.close()
 
 @api_bp.route("/performance_grade")
 @login_required
@@ -71,13 +47,7 @@ def performance_grade():
         performance_score = 0
         
         # Factor 1: Study activity (40% weight)
-        cur.execute("""
-            SELECT COALESCE(SUM(duration_minutes), 0) as total_study_minutes
-            FROM user_activity
-            WHERE user_id=%s AND activity_type='study'
-        """, [user_id])
-        
-        study_minutes = cur.fetchone()[0] or 0
+        study_minutes = ActivityRollup.get_total_minutes(user_id, 'study')
         study_score = min(study_minutes / 60 / 10, 4.0)  # Max 4 points for 10+ hours
         
         # Factor 2: Task completion rate (30% weight)
@@ -90,20 +60,14 @@ def performance_grade():
         """, [user_id])
         
         task_data = cur.fetchone()
-        total_tasks = task_data[0] or 0
-        completed_tasks = task_data[1] or 0
+        total_tasks = task_data['total_tasks'] or 0
+        completed_tasks = task_data['completed_tasks'] or 0
         
         completion_rate = (completed_tasks / max(total_tasks, 1)) if total_tasks > 0 else 0
         completion_score = completion_rate * 3.0  # Max 3 points for 100% completion
         
         # Factor 3: Consistency/streak (30% weight)
-        cur.execute("""
-            SELECT COUNT(DISTINCT activity_date) as active_days
-            FROM user_activity
-            WHERE user_id=%s AND activity_date >= DATE_SUB(CURDATE(), INTERVAL 30 DAY)
-        """, [user_id])
-        
-        active_days = cur.fetchone()[0] or 0
+        active_days = ActivityRollup.get_active_days(user_id, date.today() - timedelta(days=30))
         consistency_score = min(active_days / 15, 3.0)  # Max 3 points for 15+ active days
         
         # Calculate final grade (out of 10)
@@ -117,3 +81,18 @@ def performance_grade():
     finally:
         if cur:
             cur.close()
+
+@api_bp.route("/admin/queries")
+@admin_required
+def query_profile():
+    """Top query fingerprints by cost (?limit=20&sort=total|avg|max|calls|rows) and DB cost per route"""
+    limit = min(request.args.get("limit", 20, type=int), 200)
+    sort = request.args.get("sort", "total")
+    return jsonify({"status": "success", "data": get_query_profiler().get_report(limit, sort)})
+
+@api_bp.route("/admin/queries/reset", methods=["POST"])
+@admin_required
+def reset_query_profile():
+    """Clear collected query statistics"""
+    get_query_profiler().reset()
+    return jsonify({"status": "success"})
@@ -9,6 +9,7 @@ from flask_socketio import emit, join_room, leave_room
 from ..utils.decorators import login_required
 from ..extensions import socketio
 from ..models.courses import Course, Module, UserProgress, Quiz
+from ..models.module_registry import get_module_registry
 from ..models.stats import UserActivity
 import logging
 from datetime import datetime
@@ -95,11 +96,14 @@ def get_module_details(module_id):
         # Get quiz if exists
         quiz = Quiz.get_module_quiz(module_id)
         
+        registry = get_module_registry()
         return jsonify({
             "status": "success",
             "module": module,
             "progress": progress,
-            "quiz": quiz
+            "quiz": quiz,
+            "available": registry.is_available(module_id),
+            "next_modules": registry.next_modules(module_id)
         })
     except Exception as e:
         logger.error(f"Error getting module details: {e}")
@@ -444,4 +448,4 @@ def handle_stats_request():
 # PAGE ROUTES
 # =====================================
 
-# Module page route moved to pages.py to avoid conflicts
\ No newline at end of file
+# Module page route moved to pages.py to avoid conflicts
\ No newline at end of file
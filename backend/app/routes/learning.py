@@ -3,11 +3,12 @@ Learning Management System routes with real-time progress tracking
 """
 from flask import Blueprint, render_template, request, redirect, url_for, flash, session, jsonify
 from flask_socketio import emit, join_room, leave_room
-from datetime import datetime, timedelta
+from datetime import datetime
 import json
 from ..extensions import mysql, socketio
 from ..utils.decorators import login_required
 from ..utils.db_helpers import db_cursor
+from ..models.streaks import UserStreak
 
 learning_bp = Blueprint("learning", __name__)
 
@@ -36,17 +37,8 @@ def module_page(module_id):
     # Get module progress
     progress = get_module_progress(uid, module_id)
     
-    # Module templates mapping
-    module_templates = {
-        1: "courses/module1.html",
-        2: "courses/module2.html", 
-        3: "courses/module3.html",
-        4: "courses/module4.html",
-        5: "courses/module5.html",
-        6: "courses/module6.html"
-    }
-    
-    template = module_templates.get(module_id, "courses/module1.html")
+    from ..models.module_registry import get_module_registry
+    template = get_module_registry().template_for(module_id, "courses/module1.html")
     
     return render_template(
         template,
@@ -283,6 +275,7 @@ def end_session(session_id, user_id):
         """, [session_id])
         
         duration = cur.fetchone()[0] or 0
+        UserStreak.record(cur, user_id)
         mysql.connection.commit()
         return duration
     finally:
@@ -290,37 +283,8 @@ def end_session(session_id, user_id):
             cur.close()
 
 def calculate_learning_streak(user_id):
-    """Calculate consecutive days of learning activity"""
-    cur = None
-    try:
-        cur = db_cursor()
-        
-        cur.execute("""
-            SELECT DISTINCT DATE(start_time) as study_date
-            FROM learning_sessions 
-            WHERE user_id = %s AND end_time IS NOT NULL
-            ORDER BY study_date DESC
-            LIMIT 30
-        """, [user_id])
-        
-        dates = [row[0] for row in cur.fetchall()]
-        if not dates:
-            return 0
-        
-        streak = 0
-        current_date = datetime.now().date()
-        
-        for date in dates:
-            if date == current_date or date == current_date - timedelta(days=streak):
-                streak += 1
-                current_date = date
-            else:
-                break
-        
-        return streak
-    finally:
-        if cur:
-            cur.close()
+    """Consecutive days of learning activity (maintained incrementally in user_streaks)"""
+    return UserStreak.get_streak_days(user_id)
 
 def log_learning_activity(user_id, activity_type, description):
     """Log learning activity"""
@@ -355,4 +319,4 @@ def handle_leave_learning_room(data):
         uid = session["user_id"]
         room = f"learning_{uid}"
         leave_room(room)
-        emit("left_learning_room", {"room": room, "user_id": uid})
\ No newline at end of file
+        emit("left_learning_room", {"room": room, "user_id": uid})
\ No newline at end of file
@@ -1,9 +1,17 @@
 """
-Enhanced Media routes: /text_to_speech, /speech_to_text, /translate, /tts_capabilities, /stt_capabilities
+Enhanced Media routes: /text_to_speech, /tts/audio, /tts/stream, /speech_to_text, /translate, /tts_capabilities, /stt_capabilities
+Socket.IO: tts_stream_start / tts_stream_text / tts_stream_stop (streaming TTS of live transcripts)
+           stt_stream_start / stt_stream_chunk / stt_stream_stop (chunked speech recognition)
 """
-from flask import Blueprint, request, jsonify
+import base64
+from flask import Blueprint, Response, request, jsonify, send_file, redirect, url_for, stream_with_context, session, current_app
+from flask_socketio import emit
 from ..utils.decorators import login_required
-from ..services.tts_service import text_to_speech_service, get_tts_capabilities
+from ..extensions import socketio
+from ..services.tts_service import text_to_speech_service, get_tts_capabilities, stream_gtts_mp3, gtts_cache_key
+from ..services.tts_cache_service import get_tts_cache, MIME_TYPES
+from ..services.tts_stream_service import start_tts_stream, get_tts_stream, stop_tts_stream
+from ..services.stt_stream_service import start_stt_stream, get_stt_stream, stop_stt_stream, MAX_CHUNK_BYTES
 from ..services.stt_service import speech_to_text_service, get_stt_capabilities
 from ..services.translation_service import get_translation_service
 
@@ -25,6 +33,7 @@ def text_to_speech():
         audio_format = data.get("audio_format", "mp3")
         use_azure = data.get("use_azure", None)  # None for auto-detect
         auto_translate = data.get("auto_translate", True)  # Enable auto-translation by default
+        inline = data.get("inline", False)  # Also return a base64 data URL
         
         result = text_to_speech_service(
             text=text,
@@ -34,7 +43,8 @@ def text_to_speech():
             pitch=pitch,
             audio_format=audio_format,
             use_azure=use_azure,
-            auto_translate=auto_translate
+            auto_translate=auto_translate,
+            inline=inline
         )
         
         if result["status"] == "success":
@@ -44,6 +54,32 @@ def text_to_speech():
     except Exception as e:
         return jsonify({"status": "error", "message": f"TTS failed: {str(e)}"}), 500
 
+@media_bp.route("/tts/audio/<key>.<audio_format>", methods=["GET"])
+@login_required
+def tts_audio(key, audio_format):
+    """Cached TTS audio; content-addressed, so it never changes (ETag, Range, long max-age)"""
+    path = get_tts_cache().audio_path(key, audio_format)
+    if not path:
+        return jsonify({"status": "error", "message": "Audio not found"}), 404
+    return send_file(path, mimetype=MIME_TYPES[audio_format], conditional=True,
+                     etag=key, max_age=31536000)
+
+@media_bp.route("/tts/stream", methods=["GET"])
+@login_required
+def tts_stream():
+    """gTTS MP3 streamed as chunks are synthesized, for <audio src>; cached clips redirect to /tts/audio"""
+    text = request.args.get("text", "")
+    lang = request.args.get("lang", "hi")
+    if not text.strip():
+        return jsonify({"status": "error", "message": "No text provided"}), 400
+    
+    key = gtts_cache_key(text, lang, "mp3")
+    if get_tts_cache().get(key) is not None:
+        return redirect(url_for("media.tts_audio", key=key, audio_format="mp3"))
+    
+    return Response(stream_with_context(stream_gtts_mp3(text, lang)), mimetype="audio/mpeg",
+                    headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"})
+
 @media_bp.route("/tts_capabilities", methods=["GET"])
 @login_required
 def tts_capabilities():
@@ -141,4 +177,106 @@ def stt_capabilities():
             "capabilities": capabilities
         })
     except Exception as e:
-        return jsonify({"status": "error", "message": f"Failed to get STT capabilities: {str(e)}"}), 500
\ No newline at end of file
+        return jsonify({"status": "error", "message": f"Failed to get STT capabilities: {str(e)}"}), 500
+
+
+# =====================================
+# STREAMING TTS (Socket.IO)
+# =====================================
+
+@socketio.on('tts_stream_start')
+def handle_tts_stream_start(data=None):
+    """Start speaking a live transcript; options as for /text_to_speech, source 'isl' or 'text'"""
+    if not session.get("user_id"):
+        emit('tts_stream_error', {'message': 'Login required'})
+        return
+    data = data or {}
+    stream = start_tts_stream(
+        request.sid,
+        current_app._get_current_object(),
+        lang=data.get("lang", "en"),
+        voice_gender=data.get("voice_gender", "default"),
+        speech_rate=data.get("speech_rate", "medium"),
+        pitch=data.get("pitch", "medium"),
+        audio_format=data.get("audio_format", "mp3"),
+        use_azure=data.get("use_azure", None),
+        source=data.get("source", "text")
+    )
+    emit('tts_stream_started', {'source': stream.source})
+
+
+@socketio.on('tts_stream_text')
+def handle_tts_stream_text(data):
+    """Transcript so far, with an increasing seq; only sentences not spoken yet are synthesized"""
+    stream = get_tts_stream(request.sid)
+    if not stream:
+        emit('tts_stream_error', {'message': 'No TTS stream started'})
+        return
+    seq = data.get("seq")
+    stream.feed_transcript(data.get("text", ""), final=bool(data.get("final", False)),
+                           seq=seq if isinstance(seq, int) else None)
+
+
+@socketio.on('tts_stream_stop')
+def handle_tts_stream_stop():
+    stop_tts_stream(request.sid)
+    emit('tts_stream_stopped', {})
+
+
+# =====================================
+# STREAMING STT (Socket.IO)
+# =====================================
+
+@socketio.on('stt_stream_start')
+def handle_stt_stream_start(data=None):
+    """Start chunked recognition; encoding 'pcm16' (with sample_rate) or a container such as 'webm'/'ogg'"""
+    if not session.get("user_id"):
+        emit('stt_stream_error', {'message': 'Login required'})
+        return
+    data = data or {}
+    try:
+        stream = start_stt_stream(
+            request.sid,
+            current_app._get_current_object(),
+            lang=data.get("lang", "en"),
+            encoding=data.get("encoding", "pcm16"),
+            sample_rate=data.get("sample_rate", 16000)
+        )
+        emit('stt_stream_started', {'backend': stream.backend, 'max_chunk_bytes': MAX_CHUNK_BYTES})
+    except Exception as e:
+        current_app.logger.error(f"STT stream start error: {e}")
+        emit('stt_stream_error', {'message': 'Speech recognition unavailable'})
+
+
+@socketio.on('stt_stream_chunk')
+def handle_stt_stream_chunk(chunk, seq=None):
+    """One chunk of audio (binary, or base64 text), with its sequence number counted from 0"""
+    stream = get_stt_stream(request.sid)
+    if not stream:
+        emit('stt_stream_error', {'message': 'No STT stream started'})
+        return
+    try:
+        if isinstance(chunk, str):
+            chunk = base64.b64decode(chunk.split(",", 1)[-1])
+        stream.feed(chunk, seq=seq if isinstance(seq, int) else None)
+    except ValueError as e:
+        emit('stt_stream_error', {'message': str(e)})
+    except Exception as e:
+        current_app.logger.error(f"STT stream chunk error: {e}")
+        stop_stt_stream(request.sid)
+        emit('stt_stream_error', {'message': 'Speech recognition failed'})
+
+
+@socketio.on('stt_stream_stop')
+def handle_stt_stream_stop(data=None):
+    """End of audio (last_seq: seq of the last chunk sent); final results for the last words follow"""
+    last_seq = (data or {}).get("last_seq")
+    stop_stt_stream(request.sid, last_seq=last_seq if isinstance(last_seq, int) else None)
+    emit('stt_stream_stopped', {})
+
+
+@socketio.on('disconnect')
+def handle_media_disconnect():
+    """Drop the client's streaming sessions"""
+    stop_tts_stream(request.sid)
+    stop_stt_stream(request.sid)
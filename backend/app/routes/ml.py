@@ -4,11 +4,14 @@ Machine Learning routes for ISL Recognition
 - Adaptive learning with data collection
 - Session management
 """
-from flask import Blueprint, request, jsonify, session
+from flask import Blueprint, request, jsonify, session, current_app
 from flask_socketio import emit, join_room, leave_room
 from ..utils.decorators import login_required
 from ..extensions import socketio
 from ..services.translation_service import get_translation_service
+from ..services.model_warmup_service import get_model_warmup_service
+from ..services.health_monitor_service import get_health_monitor_service
+from ..services.tts_stream_service import get_tts_stream
 import logging
 import os
 import sys
@@ -25,14 +28,39 @@ logger = logging.getLogger(__name__)
 # Global recognizer instance (lazy loaded)
 _recognizer = None
 
+def _get_inference_pool():
+    """Start the inference worker pool when ISL_INFERENCE_WORKERS > 0"""
+    workers = current_app.config.get("ISL_INFERENCE_WORKERS", 0)
+    if workers <= 0:
+        return None
+    try:
+        from backend.ml.inference_pool import get_inference_pool
+        return get_inference_pool(
+            num_workers=workers,
+            threads_per_worker=current_app.config.get("ISL_INFERENCE_THREADS", 1),
+            model_path=current_app.config.get("MODEL_PATH", "checkpoints/best.pth"),
+            timeout=current_app.config.get("ISL_INFERENCE_TIMEOUT", 2.0),
+            num_slots=current_app.config.get("ISL_FRAME_SLOTS", 0) or None
+        )
+    except Exception as e:
+        logger.warning(f"Inference pool unavailable, running in-process: {e}")
+        return None
+
 def get_recognizer():
     """Get or create the enhanced ISL recognizer instance"""
     global _recognizer
     if _recognizer is None:
+        from backend.ml.stage_timing import get_stage_timings
+        get_stage_timings().enabled = current_app.config.get("ISL_STAGE_TIMING", False)
         try:
             # Try enhanced recognizer first
             from backend.ml.enhanced_isl_recognition import get_enhanced_recognizer
-            _recognizer = get_enhanced_recognizer()
+            _recognizer = get_enhanced_recognizer(
+                model_path=current_app.config.get("MODEL_PATH", "checkpoints/best.pth"),
+                inference_pool=_get_inference_pool(),
+                watch_interval=current_app.config.get("ISL_MODEL_WATCH_INTERVAL", 0),
+                watch_pattern=current_app.config.get("ISL_MODEL_WATCH_PATTERN") or None
+            )
             logger.info("Enhanced ISL recognizer loaded successfully")
         except Exception as e:
             logger.warning(f"Enhanced recognizer failed, falling back to basic: {e}")
@@ -281,7 +309,12 @@ def get_classes():
 
 @ml_bp.route("/api/isl/diagnostics", methods=["GET"])
 def isl_diagnostics():
-    """Comprehensive ISL system diagnostics"""
+    """Comprehensive ISL system diagnostics (cached snapshot, refreshed in the background)"""
+    return _serve_health_snapshot('diagnostics', _build_isl_diagnostics)
+
+
+def _build_isl_diagnostics():
+    """Diagnostics payload and HTTP status for the health monitor"""
     try:
         import os
         import sys
@@ -363,20 +396,40 @@ def isl_diagnostics():
         except Exception as e:
             diagnostics["model"] = {"loaded": False, "error": str(e)}
         
-        return jsonify(diagnostics)
+        return diagnostics, 200
         
     except Exception as e:
-        return jsonify({
+        return {
             "status": "error",
             "message": str(e),
             "timestamp": datetime.now().isoformat()
-        }), 500
+        }, 500
 
 
 # =====================================
 # WEBSOCKET HANDLERS FOR LIVE RECOGNITION
 # =====================================
 
+def _formed_words(recognizer):
+    """Words formed so far, if this client has a streaming TTS session that speaks ISL"""
+    stream = get_tts_stream(request.sid)
+    if stream and stream.source == 'isl' and hasattr(recognizer, 'word_engine'):
+        return list(recognizer.word_engine.get_formed_words())
+    return None
+
+
+def _speak_new_words(recognizer, before):
+    """Queue the words this event finalized on this client's ISL TTS session
+    The recognizer and its word list are shared by every client, so new words are
+    the entries that were not in the list before the event; a word completed by
+    another client's event running at the same time is still attributed to both"""
+    stream = get_tts_stream(request.sid)
+    if before is None or not stream:
+        return
+    seen = {id(info) for info in before}
+    stream.feed_words([info for info in recognizer.word_engine.get_formed_words() if id(info) not in seen])
+
+
 @socketio.on('join_isl_room')
 def handle_join_isl():
     """Join ISL recognition room for real-time updates"""
@@ -406,12 +459,14 @@ def handle_isl_frame(data):
             emit('isl_error', {'error': 'Recognizer not available'})
             return
         
+        words = _formed_words(recognizer)
         result = recognizer.process_base64_frame(data['image'])
         
         if 'error' in result:
             emit('isl_error', result)
         else:
             emit('isl_prediction', result)
+            _speak_new_words(recognizer, words)
             
     except Exception as e:
         logger.error(f"WebSocket ISL error: {e}")
@@ -444,8 +499,10 @@ def handle_clear_text():
     try:
         recognizer = get_recognizer()
         if recognizer:
+            words = _formed_words(recognizer)
             result = recognizer.clear_text()
             emit('isl_text_cleared', result)
+            _speak_new_words(recognizer, words)
     except Exception as e:
         emit('isl_error', {'error': str(e)})
 
@@ -456,8 +513,10 @@ def handle_backspace():
     try:
         recognizer = get_recognizer()
         if recognizer:
+            words = _formed_words(recognizer)
             result = recognizer.backspace()
             emit('isl_text_updated', result)
+            _speak_new_words(recognizer, words)
     except Exception as e:
         emit('isl_error', {'error': str(e)})
 
@@ -468,8 +527,10 @@ def handle_add_space():
     try:
         recognizer = get_recognizer()
         if recognizer:
+            words = _formed_words(recognizer)
             result = recognizer.add_space()
             emit('isl_text_updated', result)
+            _speak_new_words(recognizer, words)
     except Exception as e:
         emit('isl_error', {'error': str(e)})
 
@@ -483,6 +544,7 @@ def handle_force_word(data=None):
             emit('isl_error', {'error': 'Recognizer not available'})
             return
         
+        words = _formed_words(recognizer)
         # If a specific word is provided, use it
         if data and 'word' in data:
             # Clear current word and add the suggested word
@@ -510,6 +572,7 @@ def handle_force_word(data=None):
                 result = recognizer.add_space()
         
         emit('isl_text_updated', result)
+        _speak_new_words(recognizer, words)
     except Exception as e:
         emit('isl_error', {'error': str(e)})
 
@@ -575,12 +638,20 @@ def get_word_suggestions():
 
 @ml_bp.route("/api/isl/performance", methods=["GET"])
 def get_performance_metrics():
-    """Get performance metrics for the ISL system"""
+    """Get performance metrics for the ISL system (?format=prometheus for stage latencies as text)"""
     try:
         recognizer = get_recognizer()
         if not recognizer:
             return jsonify({"status": "error", "message": "Recognizer not available"}), 503
         
+        from backend.ml.stage_timing import get_stage_timings
+        stage_timings = get_stage_timings()
+        if request.args.get('format') == 'prometheus':
+            return current_app.response_class(
+                stage_timings.prometheus(),
+                mimetype="text/plain; version=0.0.4"
+            )
+        
         model_info = recognizer.get_model_info()
         
         return jsonify({
@@ -591,7 +662,8 @@ def get_performance_metrics():
                 "enhanced_features": model_info.get('enhanced_features', False),
                 "temporal_smoothing": model_info.get('temporal_smoothing', False),
                 "word_formation": model_info.get('word_formation', False),
-                "context_awareness": model_info.get('context_awareness', False)
+                "context_awareness": model_info.get('context_awareness', False),
+                "stage_timing": stage_timings.summary()
             }
         })
         
@@ -838,10 +910,48 @@ def auto_translate_isl():
 
 # =====================================
 # SYSTEM READINESS API
+# Served from health monitor snapshots: the checks below run in the monitor
+# thread, requests only return the latest result (304 when unchanged)
+
+def _serve_health_snapshot(name, builder, placeholder=None):
+    """Serve the latest snapshot of a health check with ETag/304 support"""
+    monitor = get_health_monitor_service()
+    monitor.register(name, builder)
+    monitor.start(current_app._get_current_object())
+    
+    snapshot = monitor.get(name)
+    if snapshot is None:
+        if placeholder is not None:
+            # First poll while the monitor runs its initial checks
+            response = jsonify(placeholder)
+            response.headers['Cache-Control'] = 'no-store'
+            return response
+        snapshot = monitor.refresh(name)
+    
+    response = current_app.response_class(snapshot.body, status=snapshot.status_code,
+                                          mimetype="application/json")
+    response.set_etag(snapshot.etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
 
 @ml_bp.route("/api/system/readiness", methods=["GET"])
 def check_system_readiness():
     """Check if all systems are ready for ISL recognition"""
+    return _serve_health_snapshot('readiness', _build_system_readiness, placeholder={
+        "status": "success",
+        "readiness": {
+            'overall_ready': False,
+            'components': {},
+            'timestamp': datetime.now().isoformat(),
+            'ready_message': '⏳ Checking system status...',
+            'issues': []
+        }
+    })
+
+
+def _build_system_readiness():
+    """Readiness payload and HTTP status for the health monitor"""
     try:
         readiness_status = {
             'overall_ready': False,
@@ -851,11 +961,18 @@ def check_system_readiness():
             'issues': []
         }
         
-        # Check ML Model
+        # Check ML Model (never block on the model while it warms up)
         try:
-            recognizer = get_recognizer()
-            if recognizer and recognizer.model is not None:
-                model_info = recognizer.get_model_info()
+            warmup = get_model_warmup_service().get_status()
+            readiness_status['warmup'] = warmup
+            recognizer = None if warmup['state'] == 'warming' else get_recognizer()
+            model_info = recognizer.get_model_info() if recognizer else {}
+            if warmup['state'] == 'warming':
+                readiness_status['components']['ml_model'] = {
+                    'status': 'warming',
+                    'details': {'warmup': warmup}
+                }
+            elif model_info.get('model_loaded'):
                 readiness_status['components']['ml_model'] = {
                     'status': 'ready',
                     'details': {
@@ -863,7 +980,8 @@ def check_system_readiness():
                         'device': model_info.get('device', 'unknown'),
                         'classes': model_info.get('num_classes', 0),
                         'enhanced_features': model_info.get('enhanced_features', False),
-                        'mediapipe_available': model_info.get('mediapipe_available', False)
+                        'mediapipe_available': model_info.get('mediapipe_available', False),
+                        'warmup': warmup
                     }
                 }
             else:
@@ -954,7 +1072,10 @@ def check_system_readiness():
         else:
             readiness_status['overall_ready'] = False
             ready_count = len(ready_components)
-            readiness_status['ready_message'] = f'⏳ System loading... ({ready_count}/{total_components} components ready)'
+            if readiness_status['components'].get('ml_model', {}).get('status') == 'warming':
+                readiness_status['ready_message'] = f'🔥 Warming up ISL model... ({ready_count}/{total_components} components ready)'
+            else:
+                readiness_status['ready_message'] = f'⏳ System loading... ({ready_count}/{total_components} components ready)'
         
         # Add performance info if ML model is ready
         if readiness_status['components'].get('ml_model', {}).get('status') == 'ready':
@@ -969,14 +1090,14 @@ def check_system_readiness():
             except:
                 pass
         
-        return jsonify({
+        return {
             "status": "success",
             "readiness": readiness_status
-        })
+        }, 200
         
     except Exception as e:
         logger.error(f"System readiness check error: {e}")
-        return jsonify({
+        return {
             "status": "error", 
             "message": str(e),
             "readiness": {
@@ -984,19 +1105,35 @@ def check_system_readiness():
                 'ready_message': '❌ System check failed',
                 'issues': [str(e)]
             }
-        }), 500
+        }, 500
 
 
 @ml_bp.route("/api/system/startup-status", methods=["GET"])
 def get_startup_status():
     """Get detailed startup status for progress tracking"""
+    return _serve_health_snapshot('startup', _build_startup_status, placeholder={
+        "status": "success",
+        "startup": {
+            'phases': [],
+            'overall_progress': 0,
+            'all_ready': False,
+            'completed_phases': 0,
+            'total_phases': 0,
+            'ready_message': '⏳ Checking system status...'
+        }
+    })
+
+
+def _build_startup_status():
+    """Startup status payload and HTTP status for the health monitor"""
     try:
         startup_phases = []
         
         # Phase 1: ML Model Loading
+        warming = get_model_warmup_service().is_warming()
         try:
-            recognizer = get_recognizer()
-            if recognizer and recognizer.model is not None:
+            recognizer = None if warming else get_recognizer()
+            if recognizer and recognizer.get_model_info().get('model_loaded'):
                 startup_phases.append({
                     'phase': 'ml_model',
                     'name': 'ML Model Loading',
@@ -1009,7 +1146,7 @@ def get_startup_status():
                     'phase': 'ml_model',
                     'name': 'ML Model Loading',
                     'status': 'loading',
-                    'message': '⏳ Loading Enhanced ISL model...',
+                    'message': '🔥 Warming up Enhanced ISL model...' if warming else '⏳ Loading Enhanced ISL model...',
                     'progress': 50
                 })
         except Exception as e:
@@ -1043,8 +1180,8 @@ def get_startup_status():
         
         # Phase 3: MediaPipe
         try:
-            recognizer = get_recognizer()
-            if recognizer and hasattr(recognizer, 'mp_hands') and recognizer.mp_hands is not None:
+            recognizer = None if warming else get_recognizer()
+            if recognizer and recognizer.get_model_info().get('mediapipe_available'):
                 startup_phases.append({
                     'phase': 'mediapipe',
                     'name': 'Hand Detection (MediaPipe)',
@@ -1105,7 +1242,7 @@ def get_startup_status():
         
         all_ready = len(completed_phases) == total_phases
         
-        return jsonify({
+        return {
             "status": "success",
             "startup": {
                 'phases': startup_phases,
@@ -1115,11 +1252,11 @@ def get_startup_status():
                 'total_phases': total_phases,
                 'ready_message': '🎉 System Ready! Start signing to begin ISL recognition.' if all_ready else f'⏳ Loading... ({len(completed_phases)}/{total_phases} components ready)'
             }
-        })
+        }, 200
         
     except Exception as e:
         logger.error(f"Startup status error: {e}")
-        return jsonify({
+        return {
             "status": "error",
             "message": str(e),
             "startup": {
@@ -1127,4 +1264,4 @@ def get_startup_status():
                 'overall_progress': 0,
                 'ready_message': '❌ System startup check failed'
             }
-        }), 500
\ No newline at end of file
+        }, 500
@@ -10,43 +10,23 @@ pages_bp = Blueprint("pages", __name__)
 @login_required
 def dashboard():
     """Main user dashboard with personalized data"""
-    from ..models.stats import UserStats, UserActivity
-    from ..models.courses import Course, UserProgress
-    from ..models.achievements import Achievement
-    from ..models.user import User
+    from ..models.dashboard import DashboardData
     
     user_id = session.get("user_id")
     username = session.get("username")
     
-    # Get user data
-    user = User.get_by_id(user_id) if user_id else {}
-    
-    # Get user stats
-    stats = UserStats.get_by_user_id(user_id) or {
-        'courses': 0, 'progress': 0, 'achievements': 0, 
-        'points': 0, 'modules_completed': 0
-    }
-    
-    # Get user courses with progress
-    courses = Course.get_all_courses()[:3]  # Get top 3 courses
-    for course in courses:
-        progress = UserProgress.get_user_course_progress(user_id, course['id'])
-        course['user_progress'] = progress
-    
-    # Get achievements
-    achievements = Achievement.get_user_achievements(user_id) or []
-    
-    # Get weekly activity
-    weekly_activity = UserActivity.get_weekly_activity(user_id) or []
+    # User, stats, top 3 courses with progress, achievements and weekly activity
+    # in a fixed number of queries (see DASHBOARD_MAX_QUERIES)
+    data = DashboardData.load(user_id, course_limit=3)
     
     return render_template("dashboard.html", 
                          username=username,
-                         user=user,
+                         user=data['user'],
                          session=session,
-                         stats=stats,
-                         courses=courses,
-                         achievements=achievements,
-                         weekly_activity=weekly_activity,
+                         stats=data['stats'],
+                         courses=data['courses'],
+                         achievements=data['achievements'],
+                         weekly_activity=data['weekly_activity'],
                          active_page="dashboard")
 
 
@@ -72,11 +52,11 @@ def learn():
     # Get learning statistics
     learning_stats = UserProgress.get_user_overall_stats(user_id)
     
-    # Get courses with progress
+    # Get courses with progress (one batched progress query)
     courses = Course.get_all_courses()
+    progress = UserProgress.get_user_courses_progress(user_id, [course['id'] for course in courses])
     for course in courses:
-        progress = UserProgress.get_user_course_progress(user_id, course['id'])
-        course['user_progress'] = progress
+        course['user_progress'] = progress.get(course['id'])
     
     # Format stats for template
     stats = {
@@ -152,6 +132,7 @@ def learn_course(course_id):
 def learn_module(module_id):
     """Individual module learning page with upcoming module notifications"""
     from ..models.courses import Module, Course, UserProgress, Quiz
+    from ..models.module_registry import get_module_registry
     from ..models.user import User
     
     user_id = session.get("user_id")
@@ -179,136 +160,26 @@ def learn_module(module_id):
     # Get course progress for context
     course_progress = UserProgress.get_user_course_progress(user_id, course['id'])
     
-    # Define all available modules with their details
-    all_modules = {
-        1: {
-            "title": "ISL Alphabet & Fingerspelling",
-            "title_hindi": "भारतीय सांकेतिक वर्णमाला",
-            "description": "Master the 26 letters of ISL alphabet with proper hand shapes and movements.",
-            "template": "courses/module1.html",
-            "available": True
-        },
-        2: {
-            "title": "Numbers & Mathematical Concepts", 
-            "title_hindi": "संख्या और गणित",
-            "description": "Learn cardinal numbers, ordinal numbers, and basic arithmetic operations in ISL.",
-            "template": "courses/module2.html",
-            "available": True
-        },
-        3: {
-            "title": "Family & Relationships",
-            "title_hindi": "परिवार और रिश्ते", 
-            "description": "Essential vocabulary for family members, relationships, and social connections.",
-            "template": "courses/module3.html",
-            "available": True
-        },
-        4: {
-            "title": "Colors, Shapes & Objects",
-            "title_hindi": "रंग, आकार और वस्तुएं",
-            "description": "Learn to describe the visual world - colors, geometric shapes, and common objects.",
-            "template": "courses/module4.html",
-            "available": True
-        },
-        5: {
-            "title": "Time & Calendar Concepts",
-            "title_hindi": "समय और कैलेंडर",
-            "description": "Master time expressions, days, months, seasons, and temporal concepts.",
-            "template": "courses/module5.html",
-            "available": True
-        },
-        6: {
-            "title": "Basic Grammar & Sentence Structure",
-            "title_hindi": "व्याकरण और वाक्य संरचना", 
-            "description": "Understand ISL grammar rules, word order, and sentence formation.",
-            "template": "courses/module6.html",
-            "available": True
-        },
-        7: {
-            "title": "Daily Activities & Routines",
-            "title_hindi": "दैनिक गतिविधियां",
-            "description": "Learn signs for everyday activities, routines, and common actions.",
-            "template": "courses/module_learning.html",
-            "available": False,
-            "coming_soon": True
-        },
-        8: {
-            "title": "Emotions & Feelings",
-            "title_hindi": "भावनाएं और अनुभूतियां",
-            "description": "Express emotions, feelings, and psychological states through ISL.",
-            "template": "courses/module_learning.html", 
-            "available": False,
-            "coming_soon": True
-        },
-        9: {
-            "title": "Places & Directions",
-            "title_hindi": "स्थान और दिशाएं",
-            "description": "Navigate and describe locations, directions, and geographical concepts.",
-            "template": "courses/module_learning.html",
-            "available": False,
-            "coming_soon": True
-        },
-        10: {
-            "title": "Food & Health",
-            "title_hindi": "भोजन और स्वास्थ्य", 
-            "description": "Learn vocabulary related to food, nutrition, health, and medical terms.",
-            "template": "courses/module_learning.html",
-            "available": False,
-            "coming_soon": True
-        },
-        11: {
-            "title": "Education & Work",
-            "title_hindi": "शिक्षा और कार्य",
-            "description": "Professional and educational vocabulary for academic and workplace settings.",
-            "template": "courses/module_learning.html",
-            "available": False,
-            "coming_soon": True
-        },
-        12: {
-            "title": "Advanced Grammar & Discourse",
-            "title_hindi": "उन्नत व्याकरण",
-            "description": "Advanced linguistic structures, discourse markers, and complex communication.",
-            "template": "courses/module_learning.html",
-            "available": False,
-            "coming_soon": True
-        }
-    }
-    
-    # Get current module info
-    current_module_info = all_modules.get(module_id, {})
+    registry = get_module_registry()
+    current_module_info = registry.entry(module_id)
     
     # Check if module is available
     if not current_module_info.get("available", False):
         # Show coming soon notification
-        upcoming_modules = [mod for mod_id, mod in all_modules.items() 
-                          if mod_id > 6 and mod.get("coming_soon", False)]
-        
         return render_template("courses/coming_soon.html",
                              username=username,
                              user=user,
                              session=session,
                              requested_module=current_module_info,
                              module_id=module_id,
-                             upcoming_modules=upcoming_modules,
+                             upcoming_modules=registry.coming_soon(),
                              active_page="learn")
     
-    # Get template for available modules
-    template = current_module_info.get("template", "courses/module_learning.html")
-    
-    # Get next available modules for notifications
-    next_modules = []
-    for next_id in range(module_id + 1, min(module_id + 4, 13)):  # Show next 3 modules
-        if next_id in all_modules:
-            next_module = all_modules[next_id].copy()
-            next_module['id'] = next_id
-            next_modules.append(next_module)
-    
-    # Merge module data with database info if available
-    if module:
-        current_module_info.update(module)
-    else:
-        # Use predefined module info if not in database
-        module = current_module_info
-        module['id'] = module_id
+    template = registry.template_for(module_id)
+    
+    # Next modules for notifications and the path merged with DB module data
+    next_modules = registry.next_modules(module_id)
+    all_modules = registry.all_modules()
     
     return render_template(template,
                          username=username,
@@ -443,4 +314,4 @@ import os
 def uploaded_file(filename):
     """Serve uploaded files"""
     upload_folder = os.path.join(os.getcwd(), "storage", "uploads")
-    return send_from_directory(upload_folder, filename)
\ No newline at end of file
+    return send_from_directory(upload_folder, filename)
\ No newline at end of file
@@ -1,19 +1,26 @@
 """
 Business logic services
+Exports resolve on first access so importing one service does not load them all
 """
-from .auth_service import send_otp_sms, send_otp_email, generate_otp, validate_phone_number
-from .tts_service import text_to_speech_service
-from .stt_service import speech_to_text_service
-from .isl_service import get_isl_service
-from .translation_service import get_translation_service
+import importlib
 
-__all__ = [
-    "send_otp_sms", 
-    "send_otp_email", 
-    "generate_otp", 
-    "validate_phone_number",
-    "text_to_speech_service",
-    "speech_to_text_service",
-    "get_isl_service",
-    "get_translation_service"
-]
+_EXPORTS = {
+    "send_otp_sms": ".auth_service",
+    "send_otp_email": ".auth_service",
+    "generate_otp": ".auth_service",
+    "validate_phone_number": ".auth_service",
+    "text_to_speech_service": ".tts_service",
+    "speech_to_text_service": ".stt_service",
+    "get_isl_service": ".isl_service",
+    "get_translation_service": ".translation_service"
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
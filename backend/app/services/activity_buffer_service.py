@@ -0,0 +1,223 @@
+"""
+Write-behind buffer for activity logging
+RealtimeActivityService.log_activity queues events here and returns at once;
+a background thread writes them with RealtimeActivityService.write_activity_batch
+every ACTIVITY_FLUSH_INTERVAL_MS or as soon as ACTIVITY_FLUSH_MAX_EVENTS are pending
+- Events from many requests share one multi-row INSERT and aggregated UPSERTs
+- A failing batch is retried event by event so one bad row cannot block the rest
+- Pending events are flushed on shutdown (atexit)
+- When the buffer is not running (disabled, full, or forked) callers write synchronously
+- Flush latency, batch size and queue depth are exported to /metrics
+"""
+import atexit
+import os
+import threading
+import time
+from collections import deque
+
+from ..utils.metrics import ACTIVITY_BATCH_SIZE, ACTIVITY_EVENTS, ACTIVITY_FLUSH_LATENCY, registry
+
+
+class ActivityWriteBuffer:
+    """Coalesces activity events and writes them in batches from a background thread"""
+
+    def __init__(self, interval=0.5, max_events=200, max_pending=10000, max_attempts=3):
+        self.interval = interval
+        self.max_events = max_events
+        self.max_pending = max_pending
+        self.max_attempts = max_attempts
+
+        self._pending = deque()  # [attempts, event]
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._app = None
+        self._atexit_registered = False
+
+        self.flushes = 0
+        self.written = 0
+        self.dropped = 0
+        self.failures = 0
+        self.last_error = None
+        self.last_flush_ms = 0.0
+        self.max_batch = 0
+
+    @property
+    def running(self):
+        return self._thread is not None and self._pid == os.getpid() and not self._stop.is_set()
+
+    def start(self, app):
+        """Start the flush thread once per process"""
+        with self._lock:
+            if self.running:
+                return False
+            self._app = app
+            self.interval = app.config.get("ACTIVITY_FLUSH_INTERVAL_MS", self.interval * 1000) / 1000.0
+            self.max_events = app.config.get("ACTIVITY_FLUSH_MAX_EVENTS", self.max_events)
+            # Events queued before a fork belong to the parent
+            self._pending = deque()
+            self._stop.clear()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="activity-writer", daemon=True)
+            self._thread.start()
+            if not self._atexit_registered:
+                atexit.register(self.stop)
+                self._atexit_registered = True
+        self._register_metrics()
+        app.logger.info(f"Activity write-behind buffer started (every {self.interval * 1000:.0f}ms "
+                        f"or {self.max_events} events)")
+        return True
+
+    def submit(self, event):
+        """Queue an event; False means the caller should write it synchronously"""
+        if not self.running:
+            return False
+        with self._lock:
+            if len(self._pending) >= self.max_pending:
+                return False
+            self._pending.append([0, event])
+            pending = len(self._pending)
+        ACTIVITY_EVENTS.inc("queued")
+        if pending >= self.max_events:
+            self._wakeup.set()
+        return True
+
+    def _take(self):
+        with self._lock:
+            count = min(len(self._pending), self.max_events)
+            return [self._pending.popleft() for _ in range(count)]
+
+    def flush(self):
+        """Write everything pending now; returns the number of events written"""
+        written = 0
+        with self._flush_lock:
+            while True:
+                batch = self._take()
+                if not batch:
+                    break
+                start = time.perf_counter()
+                with self._app.app_context():
+                    ok, retry = self._write(batch)
+                elapsed = time.perf_counter() - start
+
+                self.flushes += 1
+                self.written += ok
+                self.last_flush_ms = round(elapsed * 1000, 3)
+                self.max_batch = max(self.max_batch, len(batch))
+                ACTIVITY_FLUSH_LATENCY.observe(elapsed)
+                ACTIVITY_BATCH_SIZE.observe(len(batch))
+                ACTIVITY_EVENTS.inc("written", amount=ok)
+                written += ok
+
+                if retry:
+                    # Database unavailable: keep the events (oldest first) and try again next round
+                    with self._lock:
+                        self._pending.extendleft(reversed(retry))
+                    break
+        return written
+
+    def _write(self, batch):
+        """Write a batch; returns (events written, entries to retry later)"""
+        from .realtime_activity_service import RealtimeActivityService
+
+        try:
+            RealtimeActivityService.write_activity_batch([event for _, event in batch])
+            return len(batch), []
+        except Exception as e:
+            self.failures += 1
+            self.last_error = str(e)
+            self._app.logger.error(f"Activity batch of {len(batch)} failed: {e}")
+
+        # Isolate bad rows: write one at a time
+        ok, failed = 0, []
+        for entry in batch:
+            try:
+                RealtimeActivityService.write_activity_batch([entry[1]])
+                ok += 1
+            except Exception as e:
+                self.last_error = str(e)
+                failed.append(entry)
+
+        if ok:
+            # Others went through, so these rows are bad rather than the database
+            self._drop(failed)
+            return ok, []
+
+        retry = []
+        for entry in failed:
+            entry[0] += 1
+            if entry[0] < self.max_attempts:
+                retry.append(entry)
+        self._drop([entry for entry in failed if entry[0] >= self.max_attempts])
+        return 0, retry
+
+    def _drop(self, entries):
+        if not entries:
+            return
+        self.dropped += len(entries)
+        ACTIVITY_EVENTS.inc("dropped", amount=len(entries))
+        self._app.logger.error(f"Dropped {len(entries)} activity events: {self.last_error}")
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                self.last_error = str(e)
+                self._app.logger.error(f"Activity flush failed: {e}")
+
+    def stop(self, timeout=5.0):
+        """Stop the flush thread and write everything still pending"""
+        if self._thread is None or self._pid != os.getpid():
+            return
+        self._stop.set()
+        self._wakeup.set()
+        self._thread.join(timeout)
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"Error flushing activity events at shutdown: {e}")
+
+    def _register_metrics(self):
+        def collect():
+            return (
+                "# TYPE activity_buffer_pending gauge\n"
+                f"activity_buffer_pending {len(self._pending)}\n"
+            )
+
+        registry.add_collector("activity_buffer", collect)
+
+    def get_stats(self):
+        """Buffer state for diagnostics"""
+        return {
+            'running': self.running,
+            'pending': len(self._pending),
+            'interval_ms': round(self.interval * 1000),
+            'max_events': self.max_events,
+            'flushes': self.flushes,
+            'written': self.written,
+            'dropped': self.dropped,
+            'failures': self.failures,
+            'last_flush_ms': self.last_flush_ms,
+            'max_batch': self.max_batch,
+            'last_error': self.last_error
+        }
+
+
+# Global buffer instance
+_activity_buffer = None
+_activity_buffer_lock = threading.Lock()
+
+
+def get_activity_buffer():
+    """Get the global activity write-behind buffer"""
+    global _activity_buffer
+    with _activity_buffer_lock:
+        if _activity_buffer is None:
+            _activity_buffer = ActivityWriteBuffer()
+        return _activity_buffer
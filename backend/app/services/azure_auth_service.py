@@ -0,0 +1,115 @@
+"""
+Azure Speech access tokens and pooled HTTP
+- AzureTokenManager caches the STS token (valid for 10 minutes), refreshes it
+  in the background once it is AZURE_TOKEN_REFRESH_AFTER seconds old and only
+  blocks callers when no usable token is left
+- get_http_session(): one keep-alive requests.Session with a connection pool,
+  shared by the STS, synthesis and voices-list calls
+Both endpoints can point at a local stub server through AZURE_SPEECH_TOKEN_URL
+and AZURE_TTS_ENDPOINT
+"""
+import logging
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+HTTP_TIMEOUT = float(os.getenv("AZURE_HTTP_TIMEOUT", 10))
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_http_session():
+    """Shared keep-alive session for Azure Speech endpoints"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                pool_size = int(os.getenv("AZURE_HTTP_POOL_SIZE", 10))
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+class AzureTokenManager:
+    """Cached, proactively refreshed Azure STS bearer token"""
+
+    def __init__(self, subscription_key, region, token_url=None, session=None,
+                 valid_for=540.0, refresh_after=None):
+        self.subscription_key = subscription_key
+        self.token_url = token_url or f"https://{region}.api.cognitive.microsoft.com/sts/v1.0/issueToken"
+        self.session = session
+        # Tokens live 10 minutes; stop using one after `valid_for` seconds
+        self.valid_for = valid_for
+        self.refresh_after = refresh_after if refresh_after is not None else float(
+            os.getenv("AZURE_TOKEN_REFRESH_AFTER", 480))
+        self._token = None
+        self._issued_at = 0.0
+        self._lock = threading.Lock()  # synchronous fetches only
+        self._refresh_lock = threading.Lock()  # held by the background refresh while it runs
+        self.fetches = 0
+        self.logger = logging.getLogger(__name__)
+
+    def get_token(self):
+        """Current token; fetched synchronously only when none is usable"""
+        token, age = self._token, time.monotonic() - self._issued_at
+        if token is not None and age < self.refresh_after:
+            return token
+        if token is not None and age < self.valid_for:
+            self._refresh_in_background()
+            return token
+        with self._lock:
+            if self._token is not None and time.monotonic() - self._issued_at < self.valid_for:
+                return self._token
+            return self._fetch()
+
+    def invalidate(self):
+        """Drop the cached token (e.g. after a 401)"""
+        self._token = None
+
+    def _fetch(self):
+        if not self.subscription_key:
+            raise Exception("Azure Speech subscription key not configured")
+        session = self.session or get_http_session()
+        response = session.post(self.token_url, headers={'Ocp-Apim-Subscription-Key': self.subscription_key},
+                                timeout=HTTP_TIMEOUT)
+        if response.status_code != 200:
+            raise Exception(f"Failed to get access token: {response.status_code}")
+        self.fetches += 1
+        self._token = response.text
+        self._issued_at = time.monotonic()
+        return self._token
+
+    def _refresh_in_background(self):
+        # Never waits: a refresh already in flight means there is nothing to do
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            threading.Thread(target=self._background_refresh, name="azure-token-refresh", daemon=True).start()
+        except Exception:
+            self._refresh_lock.release()
+            raise
+
+    def _background_refresh(self):
+        # The STS call runs without self._lock, so callers are never held up by it
+        try:
+            if time.monotonic() - self._issued_at >= self.refresh_after:
+                self._fetch()
+        except Exception as e:
+            # The current token stays usable until valid_for; the next call retries
+            self.logger.warning(f"Azure token refresh failed: {e}")
+        finally:
+            self._refresh_lock.release()
+
+    def get_stats(self):
+        return {
+            'has_token': self._token is not None,
+            'age_seconds': round(time.monotonic() - self._issued_at, 1) if self._token else None,
+            'fetches': self.fetches
+        }
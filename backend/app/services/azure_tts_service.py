@@ -4,16 +4,18 @@ Supports multiple languages with high-quality neural voices
 """
 import os
 import base64
-import requests
 import time
 from io import BytesIO
 from flask import current_app
+from .azure_auth_service import AzureTokenManager, get_http_session, HTTP_TIMEOUT
 
 class AzureTTSService:
     def __init__(self):
         self.subscription_key = os.getenv('AZURE_SPEECH_KEY')
         self.region = os.getenv('AZURE_SPEECH_REGION', 'eastus')
-        self.base_url = f"https://{self.region}.tts.speech.microsoft.com/"
+        self.base_url = (os.getenv('AZURE_TTS_ENDPOINT') or f"https://{self.region}.tts.speech.microsoft.com").rstrip('/') + '/'
+        self.token_manager = AzureTokenManager(self.subscription_key, self.region,
+                                               token_url=os.getenv('AZURE_SPEECH_TOKEN_URL'))
         
         # Enhanced voice mapping with more voice types
         self.voice_mapping = {
@@ -178,20 +180,18 @@ class AzureTTSService:
         }
 
     def get_access_token(self):
-        """Get access token for Azure Speech Services"""
-        if not self.subscription_key:
-            raise Exception("Azure Speech subscription key not configured")
-            
-        token_url = f"https://{self.region}.api.cognitive.microsoft.com/sts/v1.0/issueToken"
-        headers = {
-            'Ocp-Apim-Subscription-Key': self.subscription_key
-        }
-        
-        response = requests.post(token_url, headers=headers)
-        if response.status_code == 200:
-            return response.text
-        else:
-            raise Exception(f"Failed to get access token: {response.status_code}")
+        """Get access token for Azure Speech Services (cached, refreshed ahead of expiry)"""
+        return self.token_manager.get_token()
+
+    def _authorized_request(self, method, url, headers=None, **kwargs):
+        """Request with the cached bearer token on the shared session; one retry with a new token on 401"""
+        session = get_http_session()
+        for attempt in range(2):
+            request_headers = dict(headers or {}, Authorization=f'Bearer {self.get_access_token()}')
+            response = session.request(method, url, headers=request_headers, timeout=HTTP_TIMEOUT, **kwargs)
+            if response.status_code != 401 or attempt:
+                return response
+            self.token_manager.invalidate()
 
     def create_ssml(self, text, language='en', voice_gender='default', speech_rate='medium', pitch='medium'):
         """Create enhanced SSML with voice-specific adjustments"""
@@ -340,6 +340,17 @@ class AzureTTSService:
     def synthesize_speech(self, text, language='en', voice_gender='default', 
                          speech_rate='medium', pitch='medium', audio_format='mp3', auto_translate=True):
         """
+        Convert text to speech, returning the audio inline as a data URL
+        """
+        result = self.synthesize_audio(text, language, voice_gender, speech_rate, pitch, audio_format, auto_translate)
+        if result["status"] == "success":
+            audio_base64 = base64.b64encode(result.pop("audio")).decode('utf-8')
+            result["audio_data"] = f"data:audio/{audio_format};base64,{audio_base64}"
+        return result
+
+    def synthesize_audio(self, text, language='en', voice_gender='default', 
+                         speech_rate='medium', pitch='medium', audio_format='mp3', auto_translate=True):
+        """
         Convert text to speech with auto-translation support
         
         Args:
@@ -352,7 +363,7 @@ class AzureTTSService:
             auto_translate: Whether to auto-translate text to target language
             
         Returns:
-            dict: {"status": "success", "audio_data": "data:audio/mp3;base64,..."}
+            dict: {"status": "success", "audio": b"...", ...voice and translation details}
         """
         try:
             # Validate inputs
@@ -375,9 +386,6 @@ class AzureTTSService:
                 if translation_result.get('translation_needed'):
                     current_app.logger.info(f"Translated: '{text[:50]}...' -> '{final_text[:50]}...'")
             
-            # Get access token
-            access_token = self.get_access_token()
-            
             # Create SSML with final text
             ssml = self.create_ssml(final_text, language, voice_gender, speech_rate, pitch)
             
@@ -393,26 +401,17 @@ class AzureTTSService:
             # Make TTS request
             tts_url = f"{self.base_url}cognitiveservices/v1"
             headers = {
-                'Authorization': f'Bearer {access_token}',
                 'Content-Type': 'application/ssml+xml',
                 'X-Microsoft-OutputFormat': output_format,
                 'User-Agent': 'VediSpeak-TTS'
             }
             
-            response = requests.post(tts_url, headers=headers, data=ssml.encode('utf-8'))
+            response = self._authorized_request('POST', tts_url, headers=headers, data=ssml.encode('utf-8'))
             
             if response.status_code == 200:
-                # Convert to base64
-                audio_content = response.content
-                audio_base64 = base64.b64encode(audio_content).decode('utf-8')
-                
-                # Create data URL
-                mime_type = f"audio/{audio_format}"
-                audio_data_url = f"data:{mime_type};base64,{audio_base64}"
-                
                 result = {
                     "status": "success", 
-                    "audio_data": audio_data_url,
+                    "audio": response.content,
                     "voice_name": self.voice_mapping.get(language, {}).get(voice_gender, 'default'),
                     "voice_type": voice_gender,
                     "language": self.language_names.get(language, language),
@@ -440,13 +439,8 @@ class AzureTTSService:
     def get_available_voices(self):
         """Get list of available voices for each language"""
         try:
-            access_token = self.get_access_token()
             voices_url = f"{self.base_url}cognitiveservices/voices/list"
-            headers = {
-                'Authorization': f'Bearer {access_token}'
-            }
-            
-            response = requests.get(voices_url, headers=headers)
+            response = self._authorized_request('GET', voices_url)
             if response.status_code == 200:
                 return response.json()
             else:
@@ -483,4 +477,4 @@ def azure_text_to_speech_service(text, lang='en', voice_gender='default',
         pitch=pitch,
         audio_format=audio_format,
         auto_translate=auto_translate
-    )
\ No newline at end of file
+    )
\ No newline at end of file
@@ -0,0 +1,120 @@
+"""
+Background health monitor
+Rebuilds readiness/startup/diagnostics payloads on its own schedule and keeps
+pre-serialized snapshots with ETags, so polling endpoints answer in O(1)
+(304 Not Modified when nothing changed) instead of re-checking every component
+"""
+import hashlib
+import json
+import threading
+from datetime import datetime
+
+
+def _fingerprint(payload):
+    """Content hash ignoring timestamps, so unchanged status keeps its ETag"""
+    def strip(value):
+        if isinstance(value, dict):
+            return {k: strip(v) for k, v in value.items() if k != 'timestamp'}
+        if isinstance(value, list):
+            return [strip(v) for v in value]
+        return value
+    data = json.dumps(strip(payload), sort_keys=True, default=str)
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()[:16]
+
+
+class HealthSnapshot:
+    """Serialized payload with its ETag and HTTP status"""
+
+    def __init__(self, payload, status_code=200):
+        self.body = json.dumps(payload, default=str)
+        self.etag = _fingerprint(payload)
+        self.status_code = status_code
+        self.updated_at = datetime.now()
+
+
+class HealthMonitorService:
+    """Refreshes registered health checks in a background thread"""
+
+    def __init__(self, interval=2.0):
+        self.interval = interval
+        self.checks = {}
+        self.snapshots = {}
+        self.refresh_count = 0
+        self.last_refresh = None
+        self.last_error = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._app = None
+
+    def start(self, app):
+        """Start the refresh thread once"""
+        with self._lock:
+            if self._thread is not None:
+                return False
+            self._app = app
+            self.interval = app.config.get("HEALTH_MONITOR_INTERVAL", self.interval)
+            self._thread = threading.Thread(target=self._run, name="health-monitor", daemon=True)
+            self._thread.start()
+        app.logger.info(f"Health monitor started (every {self.interval}s)")
+        return True
+
+    def stop(self):
+        """Stop the refresh thread"""
+        self._stop.set()
+
+    def register(self, name, builder):
+        """builder() -> (payload, status_code), called inside an app context"""
+        self.checks.setdefault(name, builder)
+
+    def get(self, name):
+        """Latest snapshot for a check, or None before its first refresh"""
+        return self.snapshots.get(name)
+
+    def refresh(self, name):
+        """Rebuild one check now; keeps the previous snapshot if only timestamps changed"""
+        payload, status_code = self.checks[name]()
+        snapshot = HealthSnapshot(payload, status_code)
+        previous = self.snapshots.get(name)
+        if previous is None or previous.etag != snapshot.etag or previous.status_code != status_code:
+            self.snapshots[name] = snapshot
+        return self.snapshots[name]
+
+    def _run(self):
+        with self._app.app_context():
+            while True:
+                for name in list(self.checks):
+                    try:
+                        self.refresh(name)
+                    except Exception as e:
+                        self.last_error = f"{name}: {e}"
+                        self._app.logger.error(f"Health check {name} failed: {e}")
+                self.refresh_count += 1
+                self.last_refresh = datetime.now()
+                if self._stop.wait(self.interval):
+                    break
+
+    def get_status(self):
+        """Monitor state for diagnostics"""
+        return {
+            'running': self._thread is not None and not self._stop.is_set(),
+            'interval': self.interval,
+            'checks': sorted(self.checks),
+            'refresh_count': self.refresh_count,
+            'last_refresh': self.last_refresh.isoformat() if self.last_refresh else None,
+            'last_error': self.last_error
+        }
+
+
+# Global service instance
+_health_monitor_service = None
+_health_monitor_service_lock = threading.Lock()
+
+
+def get_health_monitor_service():
+    """Get the global health monitor service"""
+    global _health_monitor_service
+    with _health_monitor_service_lock:
+        if _health_monitor_service is None:
+            _health_monitor_service = HealthMonitorService()
+        return _health_monitor_service
@@ -4,8 +4,6 @@ ISL (Indian Sign Language) inference service
 import io
 import base64
 import threading
-import numpy as np
-from PIL import Image
 from flask import current_app
 from collections import deque
 
@@ -105,6 +103,8 @@ class ISLService:
             
             # Decode base64 image
             header, encoded = image_data.split(",", 1)
+            import numpy as np
+            from PIL import Image
             img = Image.open(io.BytesIO(base64.b64decode(encoded))).convert("RGB")
             frame = np.array(img)[:, :, ::-1]  # RGB -> BGR for OpenCV
             
@@ -0,0 +1,107 @@
+"""
+ISL model preload and warm-up service
+Loads the recognizer and runs dummy batches in a background thread at startup
+so the first /api/isl/* request does not pay model load and first-inference costs
+"""
+import threading
+import time
+from datetime import datetime
+
+
+class ModelWarmupService:
+    """Background preload/warm-up of the ISL recognizer"""
+
+    IDLE = 'idle'
+    WARMING = 'warming'
+    READY = 'ready'
+    FAILED = 'failed'
+
+    def __init__(self):
+        self.state = self.IDLE
+        self.error = None
+        self.started_at = None
+        self.finished_at = None
+        self.timings = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self, app):
+        """Start the warm-up thread once"""
+        with self._lock:
+            if self.state != self.IDLE:
+                return False
+            self.state = self.WARMING
+            self.started_at = datetime.now()
+
+        self._thread = threading.Thread(target=self._run, args=(app,),
+                                        name="isl-model-warmup", daemon=True)
+        self._thread.start()
+        app.logger.info("ISL model warm-up started in background")
+        return True
+
+    def _run(self, app):
+        """Load the recognizer and run warm-up batches inside an app context"""
+        with app.app_context():
+            try:
+                from ..routes.ml import get_recognizer
+
+                start = time.perf_counter()
+                recognizer = get_recognizer()
+                load_ms = (time.perf_counter() - start) * 1000
+                if recognizer is None:
+                    raise RuntimeError("ISL recognizer not available")
+
+                warmup = {}
+                start = time.perf_counter()
+                if hasattr(recognizer, 'warm_up'):
+                    warmup = recognizer.warm_up(
+                        batch_sizes=app.config.get("ISL_WARMUP_BATCH_SIZES", (1,)),
+                        iterations=app.config.get("ISL_WARMUP_ITERATIONS", 3)
+                    )
+                warmup_ms = (time.perf_counter() - start) * 1000
+
+                if not recognizer.get_model_info().get('model_loaded'):
+                    raise RuntimeError("Model not loaded")
+
+                self.timings = {
+                    'load_ms': round(load_ms, 2),
+                    'warmup_ms': round(warmup_ms, 2),
+                    'total_ms': round(load_ms + warmup_ms, 2),
+                    'details': warmup
+                }
+                self.state = self.READY
+                app.logger.info(f"ISL model warm-up finished in {self.timings['total_ms']} ms")
+            except Exception as e:
+                self.error = str(e)
+                self.state = self.FAILED
+                app.logger.error(f"ISL model warm-up failed: {e}")
+            finally:
+                self.finished_at = datetime.now()
+
+    def is_warming(self):
+        """True while the background warm-up is still running"""
+        return self.state == self.WARMING
+
+    def get_status(self):
+        """Warm-up state and timings for readiness reporting"""
+        return {
+            'state': self.state,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'timings': self.timings,
+            'error': self.error
+        }
+
+
+# Global service instance
+_model_warmup_service = None
+_model_warmup_service_lock = threading.Lock()
+
+
+def get_model_warmup_service():
+    """Get the global model warm-up service"""
+    global _model_warmup_service
+    with _model_warmup_service_lock:
+        if _model_warmup_service is None:
+            _model_warmup_service = ModelWarmupService()
+        return _model_warmup_service
@@ -3,14 +3,89 @@ Real-time Activity Tracking Service
 Handles all real-time user activity, progress tracking, and statistics
 """
 from datetime import datetime, timedelta, date
+from collections import OrderedDict
+from decimal import Decimal
+from flask import current_app, has_app_context
 from ..extensions import mysql
+from ..models.streaks import UserStreak
 from ..utils.db_helpers import db_cursor
+from ..utils.metrics import DASHBOARD_CACHE
+import copy
 import json
+import threading
+import time
 from typing import Dict, List, Optional, Tuple
 
+
+def _json_default(value):
+    """JSON encoding for DB values in dashboard snapshots"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+class DashboardStatsCache:
+    """Per-user dashboard stats, bounded LRU
+    Activity writes in this process invalidate immediately; DASHBOARD_CACHE_TTL
+    bounds staleness for writes made by other worker processes"""
+    
+    def __init__(self, max_users=2048, ttl=30.0):
+        self.max_users = max_users
+        self.ttl = ttl
+        self._entries = OrderedDict()  # user_id -> (stats, snapshot_date, cached_at)
+        self._generations = {}
+        self._lock = threading.Lock()
+    
+    def _ttl(self):
+        if has_app_context():
+            return current_app.config.get("DASHBOARD_CACHE_TTL", self.ttl)
+        return self.ttl
+    
+    def get(self, user_id):
+        """Copy of the cached stats, or None when missing, expired or from an earlier day"""
+        ttl = self._ttl()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            stats, snapshot_date, cached_at = entry
+            if snapshot_date != date.today() or time.monotonic() - cached_at > ttl:
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+        return copy.deepcopy(stats)
+    
+    def generation(self, user_id):
+        """Token for set(); changes whenever the user is invalidated"""
+        return self._generations.get(user_id, 0)
+    
+    def set(self, user_id, stats, snapshot_date, generation):
+        """Cache stats unless the user was invalidated while they were being loaded"""
+        with self._lock:
+            if self._generations.get(user_id, 0) != generation:
+                return
+            self._entries[user_id] = (stats, snapshot_date, time.monotonic())
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+
+
+_dashboard_cache = DashboardStatsCache()
+
+
 class RealtimeActivityService:
     """Service for managing real-time user activity and statistics"""
     
+    # log_activity result when the event went to the write-behind buffer (no id yet)
+    QUEUED = -1
+    
     # XP Points Configuration
     XP_REWARDS = {
         'module_start': 5,
@@ -34,26 +109,40 @@ class RealtimeActivityService:
         'Master': 1500
     }
     
+    # Modules mapped to the skill they develop
+    MODULE_SKILLS = {
+        1: 'alphabet',
+        2: 'numbers',
+        3: 'vocabulary',
+        4: 'vocabulary',
+        5: 'vocabulary',
+        6: 'grammar'
+    }
+    
     @classmethod
     def initialize_user_stats(cls, user_id: int) -> bool:
-        """Initialize real-time stats for a new user"""
+        """Initialize real-time stats for a new user
+        Rows that already exist are left alone; the dashboard snapshot is only
+        invalidated when a row was actually created"""
         cur = None
         try:
             cur = db_cursor()
+            created = 0
             
             # Create user stats entry
             cur.execute("""
                 INSERT IGNORE INTO user_stats_realtime (user_id)
                 VALUES (%s)
             """, [user_id])
+            created += cur.rowcount
             
             # Create skill development entries
             skills = ['alphabet', 'numbers', 'vocabulary', 'grammar', 'conversation', 'comprehension']
-            for skill in skills:
-                cur.execute("""
-                    INSERT IGNORE INTO skill_development (user_id, skill_category)
-                    VALUES (%s, %s)
-                """, (user_id, skill))
+            cur.executemany("""
+                INSERT IGNORE INTO skill_development (user_id, skill_category)
+                VALUES (%s, %s)
+            """, [(user_id, skill) for skill in skills])
+            created += cur.rowcount
             
             # Create weekly goal
             week_start = date.today() - timedelta(days=date.today().weekday())
@@ -61,8 +150,13 @@ class RealtimeActivityService:
                 INSERT IGNORE INTO weekly_goals (user_id, week_start_date)
                 VALUES (%s, %s)
             """, (user_id, week_start))
+            created += cur.rowcount
             
+            if created > 0:
+                cls._invalidate_dashboard(cur, user_id)
             mysql.connection.commit()
+            if created > 0:
+                _dashboard_cache.invalidate(user_id)
             return True
         except Exception as e:
             print(f"Error initializing user stats: {e}")
@@ -73,51 +167,166 @@ class RealtimeActivityService:
     
     @classmethod
     def log_activity(cls, user_id: int, activity_type: str, **kwargs) -> int:
-        """Log user activity and update statistics"""
+        """Log user activity and update statistics
+        Returns the activity id, QUEUED when handed to the write-behind buffer, 0 on error"""
+        event = cls._build_activity_event(user_id, activity_type, **kwargs)
+        
+        from .activity_buffer_service import get_activity_buffer
+        if get_activity_buffer().submit(event):
+            return cls.QUEUED
+        
+        try:
+            # Runs on the caller's connection: a failure must not undo the caller's own work
+            return cls.write_activity_batch([event], savepoint=True)
+        except Exception as e:
+            print(f"Error logging activity: {e}")
+            return 0
+    
+    @classmethod
+    def _build_activity_event(cls, user_id: int, activity_type: str, **kwargs) -> Dict:
+        """Activity row with XP calculated and the time it happened"""
+        duration_minutes = kwargs.get('duration_minutes', 0)
+        
+        # Calculate XP earned
+        xp_earned = cls.XP_REWARDS.get(activity_type, 0)
+        
+        # Special XP calculations
+        if activity_type == 'practice_session' and duration_minutes > 0:
+            xp_earned += min(duration_minutes // 5, 20)  # Bonus XP for longer sessions
+        
+        return {
+            'user_id': user_id,
+            'activity_type': activity_type,
+            'module_id': kwargs.get('module_id'),
+            'description': kwargs.get('description', ''),
+            'xp_earned': xp_earned,
+            'duration_minutes': duration_minutes,
+            'metadata': json.dumps(kwargs.get('metadata', {})),
+            'created_at': datetime.now()
+        }
+    
+    @classmethod
+    def write_activity_batch(cls, events: List[Dict], savepoint: bool = False) -> int:
+        """Write activity events and their aggregates; returns the first activity id
+        One multi-row INSERT for the log, then one aggregated UPSERT per table
+        (per user, day, week or skill) instead of a round trip per event and table.
+        On failure the batch is rolled back: the whole transaction, or with
+        savepoint=True only the batch, leaving the caller's uncommitted statements"""
         cur = None
         try:
             cur = db_cursor()
+            if savepoint:
+                cur.execute("SAVEPOINT activity_batch")
             
-            # Extract parameters
-            module_id = kwargs.get('module_id')
-            description = kwargs.get('description', '')
-            duration_minutes = kwargs.get('duration_minutes', 0)
-            metadata = kwargs.get('metadata', {})
-            
-            # Calculate XP earned
-            xp_earned = cls.XP_REWARDS.get(activity_type, 0)
-            
-            # Special XP calculations
-            if activity_type == 'practice_session' and duration_minutes > 0:
-                xp_earned += min(duration_minutes // 5, 20)  # Bonus XP for longer sessions
-            
-            # Log the activity
-            cur.execute("""
+            cur.executemany("""
                 INSERT INTO activity_log_realtime 
-                (user_id, activity_type, module_id, description, xp_earned, duration_minutes, metadata)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-            """, (user_id, activity_type, module_id, description, xp_earned, duration_minutes, json.dumps(metadata)))
-            
+                (user_id, activity_type, module_id, description, xp_earned, duration_minutes, metadata, created_at)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+            """, [(e['user_id'], e['activity_type'], e['module_id'], e['description'], e['xp_earned'],
+                   e['duration_minutes'], e['metadata'], e['created_at']) for e in events])
             activity_id = cur.lastrowid
             
-            # Update user stats
-            cls._update_user_stats(cur, user_id, activity_type, xp_earned, duration_minutes, module_id)
+            user_totals = OrderedDict()
+            daily_totals = OrderedDict()
+            weekly_totals = OrderedDict()
+            skill_totals = OrderedDict()
+            for e in events:
+                user_id, activity_type = e['user_id'], e['activity_type']
+                day = e['created_at'].date()
+                minutes, xp = e['duration_minutes'], e['xp_earned']
+                completed = 1 if activity_type == 'module_complete' else 0
+                quiz = 1 if activity_type in ['quiz_attempt', 'quiz_pass'] else 0
+                practice = 1 if activity_type == 'practice_session' else 0
+                
+                totals = user_totals.setdefault(user_id, [0, 0, 0, day])
+                totals[0] += minutes
+                totals[1] += xp
+                totals[2] += completed
+                totals[3] = max(totals[3], day)
+                
+                totals = daily_totals.setdefault((user_id, day), [0, 0, 0, 0, 0])
+                totals[0] += minutes
+                totals[1] += completed
+                totals[2] += quiz
+                totals[3] += practice
+                totals[4] += xp
+                
+                week_start = day - timedelta(days=day.weekday())
+                totals = weekly_totals.setdefault((user_id, week_start), [0, 0, 0])
+                totals[0] += minutes
+                totals[1] += completed
+                totals[2] += practice
+                
+                if e['module_id']:
+                    skill = cls.MODULE_SKILLS.get(e['module_id'], 'conversation')
+                    skill_totals[(user_id, skill)] = skill_totals.get((user_id, skill), 0) + xp
+            
+            skill_level = " ".join(
+                f"WHEN total_xp_points >= {threshold} THEN '{level}'"
+                for level, threshold in sorted(cls.SKILL_LEVELS.items(), key=lambda item: -item[1])
+            )
+            cur.executemany(f"""
+                INSERT INTO user_stats_realtime
+                (user_id, total_study_minutes, total_xp_points, modules_completed, last_activity_date)
+                VALUES (%s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                total_study_minutes = total_study_minutes + VALUES(total_study_minutes),
+                total_xp_points = total_xp_points + VALUES(total_xp_points),
+                modules_completed = modules_completed + VALUES(modules_completed),
+                last_activity_date = GREATEST(COALESCE(last_activity_date, VALUES(last_activity_date)), VALUES(last_activity_date)),
+                skill_level = CASE {skill_level} ELSE 'Beginner' END
+            """, [(user_id, *totals) for user_id, totals in user_totals.items()])
+            
+            cur.executemany("""
+                INSERT INTO daily_activity_summary 
+                (user_id, activity_date, total_study_minutes, modules_completed, quizzes_completed,
+                 practice_sessions, xp_earned)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                total_study_minutes = total_study_minutes + VALUES(total_study_minutes),
+                modules_completed = modules_completed + VALUES(modules_completed),
+                quizzes_completed = quizzes_completed + VALUES(quizzes_completed),
+                practice_sessions = practice_sessions + VALUES(practice_sessions),
+                xp_earned = xp_earned + VALUES(xp_earned)
+            """, [(user_id, day, *totals) for (user_id, day), totals in daily_totals.items()])
+            
+            cur.executemany("""
+                INSERT INTO weekly_goals
+                (user_id, week_start_date, current_study_minutes, current_modules, current_practice_sessions)
+                VALUES (%s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                current_study_minutes = current_study_minutes + VALUES(current_study_minutes),
+                current_modules = current_modules + VALUES(current_modules),
+                current_practice_sessions = current_practice_sessions + VALUES(current_practice_sessions)
+            """, [(user_id, week_start, *totals) for (user_id, week_start), totals in weekly_totals.items()])
             
-            # Update daily summary
-            cls._update_daily_summary(cur, user_id, activity_type, duration_minutes, xp_earned)
+            if skill_totals:
+                cur.executemany("""
+                    INSERT INTO skill_development (user_id, skill_category, xp_points, last_practice_date)
+                    VALUES (%s, %s, %s, NOW())
+                    ON DUPLICATE KEY UPDATE
+                    xp_points = xp_points + VALUES(xp_points),
+                    skill_level = LEAST(10, 1 + FLOOR(xp_points / 100)),
+                    last_practice_date = NOW()
+                """, [(user_id, skill, xp) for (user_id, skill), xp in skill_totals.items()])
             
-            # Update weekly goals
-            cls._update_weekly_goals(cur, user_id, activity_type, duration_minutes)
+            UserStreak.record_many(cur, list(daily_totals))
             
-            # Update skill development
-            if module_id:
-                cls._update_skill_development(cur, user_id, module_id, xp_earned)
+            cls._update_dashboard_snapshots(cur, events, list(user_totals), daily_totals, weekly_totals, skill_totals)
             
             mysql.connection.commit()
+            for user_id in user_totals:
+                _dashboard_cache.invalidate(user_id)
             return activity_id
-        except Exception as e:
-            print(f"Error logging activity: {e}")
-            return 0
+        except Exception:
+            # Don't leave the batch's statements pending on the pooled connection,
+            # where the next successful commit in this app context would apply them
+            if cur:
+                if savepoint:
+                    cur.execute("ROLLBACK TO SAVEPOINT activity_batch")
+                else:
+                    mysql.connection.rollback()
+            raise
         finally:
             if cur:
                 cur.close()
@@ -129,17 +338,8 @@ class RealtimeActivityService:
         try:
             cur = db_cursor()
             
-            # Get module name mapping
-            module_names = {
-                1: "ISL Alphabet & Fingerspelling",
-                2: "Numbers & Mathematical Concepts",
-                3: "Family & Relationships",
-                4: "Colors, Shapes & Objects",
-                5: "Time & Calendar Concepts",
-                6: "Basic Grammar & Sentence Structure"
-            }
-            
-            module_name = module_names.get(module_id, f"Module {module_id}")
+            from ..models.module_registry import get_module_registry
+            module_name = get_module_registry().title(module_id)
             progress_percentage = progress_data.get('progress_percentage', 0)
             time_spent = progress_data.get('time_spent_minutes', 0)
             quiz_score = progress_data.get('quiz_score', 0)
@@ -187,7 +387,9 @@ class RealtimeActivityService:
                                duration_minutes=time_spent,
                                description=f"Studied {module_name}")
             
+            cls._invalidate_dashboard(cur, user_id)
             mysql.connection.commit()
+            _dashboard_cache.invalidate(user_id)
             return True
         except Exception as e:
             print(f"Error updating module progress: {e}")
@@ -198,106 +400,46 @@ class RealtimeActivityService:
     
     @classmethod
     def get_user_dashboard_stats(cls, user_id: int) -> Dict:
-        """Get comprehensive dashboard statistics for user"""
+        """Get comprehensive dashboard statistics for user
+        Served from the in-process cache, else the materialized snapshot row
+        (one primary-key read), else rebuilt from the activity tables"""
+        stats = _dashboard_cache.get(user_id)
+        if stats is not None:
+            DASHBOARD_CACHE.inc('cache')
+            return stats
+        
         cur = None
         try:
+            generation = _dashboard_cache.generation(user_id)
+            today = date.today()
             cur = db_cursor()
             
-            # Get basic stats
-            cur.execute("""
-                SELECT * FROM user_stats_realtime WHERE user_id = %s
-            """, [user_id])
-            basic_stats = cur.fetchone() or {}
-            
-            # Get today's activity
-            cur.execute("""
-                SELECT 
-                    COALESCE(SUM(duration_minutes), 0) as today_minutes,
-                    COALESCE(SUM(xp_earned), 0) as today_xp,
-                    COUNT(*) as today_activities
-                FROM activity_log_realtime 
-                WHERE user_id = %s AND DATE(created_at) = CURDATE()
-            """, [user_id])
-            today_stats = cur.fetchone() or {}
-            
-            # Get weekly progress
-            cur.execute("""
-                SELECT 
-                    current_study_minutes,
-                    study_minutes_goal,
-                    current_modules,
-                    modules_goal,
-                    current_practice_sessions,
-                    practice_sessions_goal
-                FROM weekly_goals 
-                WHERE user_id = %s AND week_start_date = DATE_SUB(CURDATE(), INTERVAL WEEKDAY(CURDATE()) DAY)
-            """, [user_id])
-            weekly_stats = cur.fetchone() or {}
-            
-            # Get skill levels
             cur.execute("""
-                SELECT skill_category, skill_level, xp_points 
-                FROM skill_development 
-                WHERE user_id = %s
-                ORDER BY skill_category
-            """, [user_id])
-            skills = cur.fetchall() or []
-            
-            # Get recent activities
-            cur.execute("""
-                SELECT activity_type, description, xp_earned, created_at, module_id
-                FROM activity_log_realtime 
-                WHERE user_id = %s 
-                ORDER BY created_at DESC 
-                LIMIT 10
+                SELECT snapshot, snapshot_date, version FROM user_dashboard_snapshot WHERE user_id = %s
             """, [user_id])
-            recent_activities = cur.fetchall() or []
-            
-            # Get active modules
-            cur.execute("""
-                SELECT module_id, module_name, progress_percentage, time_spent_minutes, last_accessed
-                FROM module_progress_realtime 
-                WHERE user_id = %s AND progress_percentage > 0 AND progress_percentage < 100
-                ORDER BY last_accessed DESC
-                LIMIT 5
-            """, [user_id])
-            active_modules = cur.fetchall() or []
-            
-            # Calculate streak details
-            streak_info = cls._calculate_streak_details(cur, user_id)
-            
-            # Calculate skill level
-            total_xp = basic_stats.get('total_xp_points', 0)
-            skill_level = cls._get_skill_level_from_xp(total_xp)
-            
-            return {
-                'basic_stats': {
-                    'total_study_hours': round(basic_stats.get('total_study_minutes', 0) / 60, 1),
-                    'modules_completed': basic_stats.get('modules_completed', 0),
-                    'total_xp_points': total_xp,
-                    'skill_level': skill_level,
-                    'current_streak': basic_stats.get('current_streak_days', 0),
-                    'longest_streak': basic_stats.get('longest_streak_days', 0)
-                },
-                'today_stats': {
-                    'study_minutes': today_stats.get('today_minutes', 0),
-                    'study_hours': round(today_stats.get('today_minutes', 0) / 60, 1),
-                    'xp_earned': today_stats.get('today_xp', 0),
-                    'activities_count': today_stats.get('today_activities', 0)
-                },
-                'weekly_progress': {
-                    'study_minutes': weekly_stats.get('current_study_minutes', 0),
-                    'study_goal': weekly_stats.get('study_minutes_goal', 300),
-                    'modules_completed': weekly_stats.get('current_modules', 0),
-                    'modules_goal': weekly_stats.get('modules_goal', 2),
-                    'practice_sessions': weekly_stats.get('current_practice_sessions', 0),
-                    'practice_goal': weekly_stats.get('practice_sessions_goal', 10)
-                },
-                'skills': skills,
-                'recent_activities': recent_activities,
-                'active_modules': active_modules,
-                'streak_info': streak_info
-            }
+            row = cur.fetchone()
+            
+            if row and row['snapshot'] and row['snapshot_date'] == today:
+                stats = json.loads(row['snapshot'])
+                DASHBOARD_CACHE.inc('snapshot')
+            else:
+                snapshot = json.dumps(cls._build_dashboard_stats(cur, user_id), default=_json_default)
+                stats = json.loads(snapshot)
+                
+                # Only store if no activity write bumped the version since it was read
+                version = row['version'] if row else 0
+                cur.execute("""
+                    INSERT INTO user_dashboard_snapshot (user_id, snapshot, snapshot_date, version)
+                    VALUES (%s, %s, %s, 0)
+                    ON DUPLICATE KEY UPDATE
+                    snapshot = IF(version = %s, VALUES(snapshot), snapshot),
+                    snapshot_date = IF(version = %s, VALUES(snapshot_date), snapshot_date)
+                """, (user_id, snapshot, today, version, version))
+                mysql.connection.commit()
+                DASHBOARD_CACHE.inc('rebuild')
+            
+            _dashboard_cache.set(user_id, stats, today, generation)
+            return copy.deepcopy(stats)
         except Exception as e:
             print(f"Error getting dashboard stats: {e}")
             return {}
@@ -305,6 +447,105 @@ class RealtimeActivityService:
             if cur:
                 cur.close()
     
+    @classmethod
+    def _build_dashboard_stats(cls, cur, user_id: int) -> Dict:
+        """Aggregate dashboard statistics from the activity tables"""
+        # Get basic stats
+        cur.execute("""
+            SELECT * FROM user_stats_realtime WHERE user_id = %s
+        """, [user_id])
+        basic_stats = cur.fetchone() or {}
+        
+        # Get today's activity
+        cur.execute("""
+            SELECT 
+                COALESCE(SUM(duration_minutes), 0) as today_minutes,
+                COALESCE(SUM(xp_earned), 0) as today_xp,
+                COUNT(*) as today_activities
+            FROM activity_log_realtime 
+            WHERE user_id = %s AND DATE(created_at) = CURDATE()
+        """, [user_id])
+        today_stats = cur.fetchone() or {}
+        
+        # Get weekly progress
+        cur.execute("""
+            SELECT 
+                current_study_minutes,
+                study_minutes_goal,
+                current_modules,
+                modules_goal,
+                current_practice_sessions,
+                practice_sessions_goal
+            FROM weekly_goals 
+            WHERE user_id = %s AND week_start_date = DATE_SUB(CURDATE(), INTERVAL WEEKDAY(CURDATE()) DAY)
+        """, [user_id])
+        weekly_stats = cur.fetchone() or {}
+        
+        # Get skill levels
+        cur.execute("""
+            SELECT skill_category, skill_level, xp_points 
+            FROM skill_development 
+            WHERE user_id = %s
+            ORDER BY skill_category
+        """, [user_id])
+        skills = cur.fetchall() or []
+        
+        # Get recent activities
+        cur.execute("""
+            SELECT activity_type, description, xp_earned, created_at, module_id
+            FROM activity_log_realtime 
+            WHERE user_id = %s 
+            ORDER BY created_at DESC 
+            LIMIT 10
+        """, [user_id])
+        recent_activities = cur.fetchall() or []
+        
+        # Get active modules
+        cur.execute("""
+            SELECT module_id, module_name, progress_percentage, time_spent_minutes, last_accessed
+            FROM module_progress_realtime 
+            WHERE user_id = %s AND progress_percentage > 0 AND progress_percentage < 100
+            ORDER BY last_accessed DESC
+            LIMIT 5
+        """, [user_id])
+        active_modules = cur.fetchall() or []
+        
+        # Calculate streak details
+        streak_info = cls._calculate_streak_details(cur, user_id)
+        
+        # Calculate skill level
+        total_xp = basic_stats.get('total_xp_points', 0)
+        skill_level = cls._get_skill_level_from_xp(total_xp)
+        
+        return {
+            'basic_stats': {
+                'total_study_hours': round(basic_stats.get('total_study_minutes', 0) / 60, 1),
+                'modules_completed': basic_stats.get('modules_completed', 0),
+                'total_xp_points': total_xp,
+                'skill_level': skill_level,
+                'current_streak': streak_info['current_streak'],
+                'longest_streak': streak_info['longest_streak']
+            },
+            'today_stats': {
+                'study_minutes': today_stats.get('today_minutes', 0),
+                'study_hours': round(today_stats.get('today_minutes', 0) / 60, 1),
+                'xp_earned': today_stats.get('today_xp', 0),
+                'activities_count': today_stats.get('today_activities', 0)
+            },
+            'weekly_progress': {
+                'study_minutes': weekly_stats.get('current_study_minutes', 0),
+                'study_goal': weekly_stats.get('study_minutes_goal', 300),
+                'modules_completed': weekly_stats.get('current_modules', 0),
+                'modules_goal': weekly_stats.get('modules_goal', 2),
+                'practice_sessions': weekly_stats.get('current_practice_sessions', 0),
+                'practice_goal': weekly_stats.get('practice_sessions_goal', 10)
+            },
+            'skills': skills,
+            'recent_activities': recent_activities,
+            'active_modules': active_modules,
+            'streak_info': streak_info
+        }
+
     @classmethod
     def get_live_activity_feed(cls, user_id: int, limit: int = 20) -> List[Dict]:
         """Get live activity feed for real-time updates"""
@@ -354,7 +595,7 @@ class RealtimeActivityService:
     
     @classmethod
     def get_weekly_chart_data(cls, user_id: int) -> Dict:
-        """Get data for weekly progress charts"""
+        """Get data for weekly progress charts (from the daily_activity_summary buckets)"""
         cur = None
         try:
             cur = db_cursor()
@@ -362,15 +603,14 @@ class RealtimeActivityService:
             # Get last 7 days of activity
             cur.execute("""
                 SELECT 
-                    DATE(created_at) as activity_date,
-                    SUM(duration_minutes) as study_minutes,
-                    SUM(xp_earned) as xp_earned,
-                    COUNT(CASE WHEN activity_type = 'practice_session' THEN 1 END) as practice_sessions,
-                    COUNT(CASE WHEN activity_type = 'module_complete' THEN 1 END) as modules_completed
-                FROM activity_log_realtime 
+                    activity_date,
+                    total_study_minutes as study_minutes,
+                    xp_earned,
+                    practice_sessions,
+                    modules_completed
+                FROM daily_activity_summary 
                 WHERE user_id = %s 
-                AND created_at >= DATE_SUB(NOW(), INTERVAL 7 DAY)
-                GROUP BY DATE(created_at)
+                AND activity_date >= DATE_SUB(CURDATE(), INTERVAL 6 DAY)
                 ORDER BY activity_date
             """, [user_id])
             
@@ -490,161 +730,113 @@ class RealtimeActivityService:
     
     # Private helper methods
     @classmethod
-    def _update_user_stats(cls, cur, user_id: int, activity_type: str, xp_earned: int, duration_minutes: int, module_id: int = None):
-        """Update user statistics"""
-        # Update basic stats
+    def _invalidate_dashboard(cls, cur, user_id: int):
+        """Mark the materialized dashboard snapshot stale in the writer's transaction"""
         cur.execute("""
-            UPDATE user_stats_realtime 
-            SET 
-                total_study_minutes = total_study_minutes + %s,
-                total_xp_points = total_xp_points + %s,
-                modules_completed = modules_completed + %s,
-                last_activity_date = CURDATE(),
-                skill_level = %s
-            WHERE user_id = %s
-        """, (
-            duration_minutes,
-            xp_earned,
-            1 if activity_type == 'module_complete' else 0,
-            cls._get_skill_level_from_xp_query(cur, user_id, xp_earned),
-            user_id
-        ))
-        
-        # Update streak
-        cls._update_streak(cur, user_id)
-    
-    @classmethod
-    def _update_daily_summary(cls, cur, user_id: int, activity_type: str, duration_minutes: int, xp_earned: int):
-        """Update daily activity summary"""
-        cur.execute("""
-            INSERT INTO daily_activity_summary 
-            (user_id, activity_date, total_study_minutes, quizzes_completed, practice_sessions, xp_earned)
-            VALUES (%s, CURDATE(), %s, %s, %s, %s)
-            ON DUPLICATE KEY UPDATE
-            total_study_minutes = total_study_minutes + VALUES(total_study_minutes),
-            quizzes_completed = quizzes_completed + VALUES(quizzes_completed),
-            practice_sessions = practice_sessions + VALUES(practice_sessions),
-            xp_earned = xp_earned + VALUES(xp_earned)
-        """, (
-            user_id,
-            duration_minutes,
-            1 if activity_type in ['quiz_attempt', 'quiz_pass'] else 0,
-            1 if activity_type == 'practice_session' else 0,
-            xp_earned
-        ))
+            INSERT INTO user_dashboard_snapshot (user_id, version) VALUES (%s, 1)
+            ON DUPLICATE KEY UPDATE version = version + 1, snapshot = NULL
+        """, [user_id])
     
     @classmethod
-    def _update_weekly_goals(cls, cur, user_id: int, activity_type: str, duration_minutes: int):
-        """Update weekly goals progress"""
-        week_start = date.today() - timedelta(days=date.today().weekday())
+    def _update_dashboard_snapshots(cls, cur, events: List[Dict], user_ids: List[int],
+                                    daily_totals: Dict, weekly_totals: Dict, skill_totals: Dict):
+        """Apply an activity batch to the stored dashboard snapshots in the writer's transaction
+        Today's and this week's counters, skills and recent activities get the batch's
+        deltas; basic stats and streaks are re-read from their single rows. Snapshots
+        that are missing, from an earlier day or lack a skill row are cleared instead
+        and rebuilt on the next read. Every version is bumped so rebuilds that started
+        before this write are not stored"""
+        placeholders = ", ".join(["%s"] * len(user_ids))
+        cur.execute(f"""
+            SELECT user_id, snapshot, snapshot_date FROM user_dashboard_snapshot
+            WHERE user_id IN ({placeholders}) FOR UPDATE
+        """, user_ids)
+        today = date.today()
+        current = {row['user_id']: json.loads(row['snapshot']) for row in cur.fetchall()
+                   if row['snapshot'] and row['snapshot_date'] == today}
         
-        cur.execute("""
-            INSERT INTO weekly_goals (user_id, week_start_date)
-            VALUES (%s, %s)
-            ON DUPLICATE KEY UPDATE
-            current_study_minutes = current_study_minutes + %s,
-            current_modules = current_modules + %s,
-            current_practice_sessions = current_practice_sessions + %s
-        """, (
-            user_id,
-            week_start,
-            duration_minutes,
-            1 if activity_type == 'module_complete' else 0,
-            1 if activity_type == 'practice_session' else 0
-        ))
-    
-    @classmethod
-    def _update_skill_development(cls, cur, user_id: int, module_id: int, xp_earned: int):
-        """Update skill development based on module"""
-        # Map modules to skills
-        module_skill_map = {
-            1: 'alphabet',
-            2: 'numbers',
-            3: 'vocabulary',
-            4: 'vocabulary',
-            5: 'vocabulary',
-            6: 'grammar'
-        }
+        basic = {}
+        if current:
+            cur.execute(f"""
+                SELECT user_id, total_study_minutes, total_xp_points, modules_completed
+                FROM user_stats_realtime WHERE user_id IN ({", ".join(["%s"] * len(current))})
+            """, list(current))
+            basic = {row['user_id']: row for row in cur.fetchall()}
         
-        skill_category = module_skill_map.get(module_id, 'conversation')
+        week_start = today - timedelta(days=today.weekday())
+        snapshots = []
+        for user_id in user_ids:
+            stats = current.get(user_id)
+            if stats is not None and user_id in basic:
+                skills = {skill['skill_category']: skill for skill in stats['skills']}
+                user_skills = {skill: xp for (uid, skill), xp in skill_totals.items() if uid == user_id}
+                if all(skill in skills for skill in user_skills):
+                    cls._apply_snapshot_deltas(
+                        cur, stats, user_id, basic[user_id], skills, user_skills, today,
+                        [e for e in events if e['user_id'] == user_id],
+                        daily_totals.get((user_id, today)), weekly_totals.get((user_id, week_start)))
+                    snapshots.append((user_id, json.dumps(stats, default=_json_default), today))
+                    continue
+            snapshots.append((user_id, None, None))
         
-        cur.execute("""
-            UPDATE skill_development 
-            SET 
-                xp_points = xp_points + %s,
-                skill_level = LEAST(10, 1 + FLOOR((xp_points + %s) / 100)),
-                last_practice_date = NOW()
-            WHERE user_id = %s AND skill_category = %s
-        """, (xp_earned, xp_earned, user_id, skill_category))
+        cur.executemany("""
+            INSERT INTO user_dashboard_snapshot (user_id, snapshot, snapshot_date, version) VALUES (%s, %s, %s, 1)
+            ON DUPLICATE KEY UPDATE version = version + 1,
+            snapshot = VALUES(snapshot), snapshot_date = VALUES(snapshot_date)
+        """, snapshots)
     
     @classmethod
-    def _update_streak(cls, cur, user_id: int):
-        """Update user's activity streak"""
-        # Get recent activity dates
-        cur.execute("""
-            SELECT DISTINCT DATE(created_at) as activity_date
-            FROM activity_log_realtime 
-            WHERE user_id = %s 
-            ORDER BY activity_date DESC
-            LIMIT 30
-        """, [user_id])
+    def _apply_snapshot_deltas(cls, cur, stats: Dict, user_id: int, basic: Dict, skills: Dict,
+                               skill_xp: Dict, today: date, events: List[Dict], today_totals, week_totals):
+        """Update one snapshot in place; mirrors the UPSERTs of write_activity_batch"""
+        total_xp = basic['total_xp_points']
+        streak_info = cls._calculate_streak_details(cur, user_id)
+        stats['basic_stats'].update({
+            'total_study_hours': round(basic['total_study_minutes'] / 60, 1),
+            'modules_completed': basic['modules_completed'],
+            'total_xp_points': total_xp,
+            'skill_level': cls._get_skill_level_from_xp(total_xp),
+            'current_streak': streak_info['current_streak'],
+            'longest_streak': streak_info['longest_streak']
+        })
+        stats['streak_info'] = streak_info
         
-        dates = [row['activity_date'] for row in cur.fetchall()]
+        if today_totals:
+            minutes, _completed, _quizzes, _practice, xp = today_totals
+            today_stats = stats['today_stats']
+            today_stats['study_minutes'] += minutes
+            today_stats['study_hours'] = round(today_stats['study_minutes'] / 60, 1)
+            today_stats['xp_earned'] += xp
+            today_stats['activities_count'] += sum(1 for e in events if e['created_at'].date() == today)
         
-        current_streak = 0
-        longest_streak = 0
+        if week_totals:
+            minutes, completed, practice = week_totals
+            weekly = stats['weekly_progress']
+            weekly['study_minutes'] += minutes
+            weekly['modules_completed'] += completed
+            weekly['practice_sessions'] += practice
         
-        if dates:
-            # Calculate current streak
-            today = date.today()
-            yesterday = today - timedelta(days=1)
-            
-            if today in dates:
-                current_streak = 1
-                check_date = yesterday
-                
-                while check_date in dates:
-                    current_streak += 1
-                    check_date -= timedelta(days=1)
-            elif yesterday in dates:
-                current_streak = 1
-                check_date = yesterday - timedelta(days=1)
-                
-                while check_date in dates:
-                    current_streak += 1
-                    check_date -= timedelta(days=1)
-            
-            # Calculate longest streak
-            temp_streak = 0
-            for i, activity_date in enumerate(dates):
-                if i == 0 or activity_date == dates[i-1] - timedelta(days=1):
-                    temp_streak += 1
-                    longest_streak = max(longest_streak, temp_streak)
-                else:
-                    temp_streak = 1
+        for skill, xp in skill_xp.items():
+            row = skills[skill]
+            row['xp_points'] += xp
+            row['skill_level'] = min(10, 1 + int(row['xp_points'] // 100))
         
-        # Update user stats
-        cur.execute("""
-            UPDATE user_stats_realtime 
-            SET current_streak_days = %s, longest_streak_days = GREATEST(longest_streak_days, %s)
-            WHERE user_id = %s
-        """, (current_streak, longest_streak, user_id))
+        recent = [{
+            'activity_type': e['activity_type'],
+            'description': e['description'],
+            'xp_earned': e['xp_earned'],
+            'created_at': e['created_at'].replace(microsecond=0).isoformat(),
+            'module_id': e['module_id']
+        } for e in events]
+        stats['recent_activities'] = sorted(recent + stats['recent_activities'],
+                                            key=lambda activity: activity['created_at'], reverse=True)[:10]
     
     @classmethod
     def _calculate_streak_details(cls, cur, user_id: int) -> Dict:
         """Calculate detailed streak information"""
-        cur.execute("""
-            SELECT current_streak_days, longest_streak_days 
-            FROM user_stats_realtime 
-            WHERE user_id = %s
-        """, [user_id])
-        
-        result = cur.fetchone()
-        if not result:
-            return {'current_streak': 0, 'longest_streak': 0, 'streak_percentage': 0}
-        
-        current_streak = result['current_streak_days'] or 0
-        longest_streak = result['longest_streak_days'] or 0
+        streak = UserStreak.get(user_id, cur)
+        current_streak = streak['current_streak']
+        longest_streak = streak['longest_streak']
         
         return {
             'current_streak': current_streak,
@@ -660,18 +852,6 @@ class RealtimeActivityService:
                 return level
         return 'Beginner'
     
-    @classmethod
-    def _get_skill_level_from_xp_query(cls, cur, user_id: int, additional_xp: int) -> str:
-        """Get skill level from database query"""
-        cur.execute("""
-            SELECT total_xp_points FROM user_stats_realtime WHERE user_id = %s
-        """, [user_id])
-        
-        result = cur.fetchone()
-        current_xp = (result['total_xp_points'] if result else 0) + additional_xp
-        
-        return cls._get_skill_level_from_xp(current_xp)
-    
     @classmethod
     def _format_time_ago(cls, timestamp: datetime) -> str:
         """Format timestamp as 'time ago' string"""
@@ -687,4 +867,4 @@ class RealtimeActivityService:
             minutes = diff.seconds // 60
             return f"{minutes} minute{'s' if minutes > 1 else ''} ago"
         else:
-            return "Just now"
\ No newline at end of file
+            return "Just now"
\ No newline at end of file
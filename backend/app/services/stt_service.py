@@ -1,22 +1,67 @@
 """
 Enhanced Speech-to-Text service with Azure Speech Services and Google fallback
 Supports multilingual recognition including Bengali and other Indian languages
+Audio is decoded once, in memory, to 16kHz mono PCM (ffmpeg over pipes) and
+handed to Azure through a push stream and to speech_recognition as AudioData;
+no temp files are written
 """
 import os
+import json
 import base64
-import tempfile
-import speech_recognition as sr
-from pydub import AudioSegment
+import subprocess
+from io import BytesIO
 from flask import current_app
+from ..utils.lazy_imports import lazy_import, module_available
 
-# Import Azure Speech Services
-try:
-    import azure.cognitiveservices.speech as speechsdk
-    AZURE_STT_AVAILABLE = True
-except ImportError:
-    AZURE_STT_AVAILABLE = False
+# Speech stacks load on first recognition, not at app boot
+np = lazy_import("numpy")
+sr = lazy_import("speech_recognition")
+pydub = lazy_import("pydub")
+speechsdk = lazy_import("azure.cognitiveservices.speech")
+
+# Azure Speech Services
+AZURE_STT_AVAILABLE = module_available("azure.cognitiveservices.speech")
+if not AZURE_STT_AVAILABLE:
     print("Warning: Azure Speech SDK not available. Install with: pip install azure-cognitiveservices-speech")
 
+# Map language codes to Azure Speech locale codes
+AZURE_LOCALES = {
+    'auto': 'en-US',  # Default for auto-detect
+    'en': 'en-US',
+    'hi': 'hi-IN',
+    'hinglish': 'hi-IN',  # Use Hindi for Hinglish
+    'bn': 'bn-IN',     # Bengali (India)
+    'ta': 'ta-IN',     # Tamil (India)
+    'te': 'te-IN',     # Telugu (India)
+    'gu': 'gu-IN',     # Gujarati (India)
+    'kn': 'kn-IN',     # Kannada (India)
+    'ml': 'ml-IN',     # Malayalam (India)
+    'mr': 'mr-IN',     # Marathi (India)
+    'pa': 'pa-IN',     # Punjabi (India)
+    'ur': 'ur-IN',     # Urdu (India)
+    'or': 'or-IN',     # Odia (India)
+    'as': 'as-IN',     # Assamese (India)
+}
+
+# Map language codes to Google Speech locale codes
+GOOGLE_LOCALES = {
+    'auto': 'en-US',
+    'en': 'en-US',
+    'hi': 'hi-IN',
+    'hinglish': 'hi-IN',
+    'bn': 'bn-IN',     # Bengali (India)
+    'ta': 'ta-IN',     # Tamil (India)
+    'te': 'te-IN',     # Telugu (India)
+    'gu': 'gu-IN',     # Gujarati (India)
+    'kn': 'kn-IN',     # Kannada (India)
+    'ml': 'ml-IN',     # Malayalam (India)
+    'mr': 'mr-IN',     # Marathi (India)
+    'pa': 'pa-Guru-IN', # Punjabi (India)
+    'ur': 'ur-PK',     # Urdu (Pakistan - better support)
+    'or': 'hi-IN',     # Fallback to Hindi for Odia
+    'as': 'hi-IN',     # Fallback to Hindi for Assamese
+}
+
 def speech_to_text_service(audio_data, lang='en'):
     """
     Enhanced speech-to-text with Azure Speech Services and Google fallback
@@ -29,9 +74,6 @@ def speech_to_text_service(audio_data, lang='en'):
     Returns:
         dict: {"status": "success", "text": "transcribed text", "method": "azure/google", "confidence": float}
     """
-    temp_mp3 = None
-    temp_wav = None
-    
     try:
         if not audio_data:
             return {"status": "error", "message": "No audio data received"}
@@ -48,46 +90,118 @@ def speech_to_text_service(audio_data, lang='en'):
         if len(audio_bytes) > (25 * 1024 * 1024):
             return {"status": "error", "message": "Audio file too large (max 25MB)"}
         
-        # Write to temporary MP3 file
-        tmp_mp3 = tempfile.NamedTemporaryFile(delete=False, suffix=".mp3")
-        tmp_mp3.write(audio_bytes)
-        tmp_mp3.flush()
-        tmp_mp3.close()
-        temp_mp3 = tmp_mp3.name
-        
-        # Convert to WAV using pydub (16kHz mono for better recognition)
-        tmp_wav = tempfile.NamedTemporaryFile(delete=False, suffix=".wav")
-        tmp_wav.close()
-        temp_wav = tmp_wav.name
-        
-        sound = AudioSegment.from_file(temp_mp3).set_channels(1).set_frame_rate(16000)
-        sound.export(temp_wav, format="wav")
-        
-        # Try Azure Speech Services first (better multilingual support)
-        azure_result = try_azure_stt(temp_wav, lang)
-        if azure_result["status"] == "success":
-            return azure_result
-        
-        # Fallback to Google Speech Recognition
-        current_app.logger.info("Azure STT failed, falling back to Google Speech Recognition")
-        google_result = try_google_stt(temp_wav, lang)
-        return google_result
+        # Decode once to 16kHz mono PCM; both backends read the same buffer
+        audio = PCMAudio.decode(audio_bytes)
+        return recognize_pcm(audio, lang)
     
     except Exception as e:
         current_app.logger.error(f"STT error: {e}")
         return {"status": "error", "message": "Speech recognition failed"}
+
+
+def recognize_pcm(audio, lang='en'):
+    """Recognize decoded PCMAudio with Azure, falling back to Google"""
+    if audio.is_silent():
+        return {
+            "status": "success",
+            "text": "",
+            "method": "silence",
+            "confidence": 0.0,
+            "message": "No speech detected"
+        }
+    
+    # Try Azure Speech Services first (better multilingual support)
+    azure_result = try_azure_stt(audio, lang)
+    if azure_result["status"] == "success":
+        return azure_result
+    
+    # Fallback to Google Speech Recognition
+    current_app.logger.info("Azure STT failed, falling back to Google Speech Recognition")
+    return try_google_stt(audio, lang)
+
+
+class PCMAudio:
+    """16-bit mono PCM audio held in memory"""
+    
+    SAMPLE_RATE = 16000
+    SAMPLE_WIDTH = 2
+    # Peak amplitude below which a clip is treated as silence (about -54 dBFS)
+    SILENCE_PEAK = 64
+    
+    def __init__(self, pcm, sample_rate=SAMPLE_RATE):
+        self.pcm = pcm
+        self.sample_rate = sample_rate
+    
+    @classmethod
+    def decode(cls, audio_bytes):
+        """Decode any ffmpeg-readable audio to 16kHz mono PCM through pipes"""
+        command = [pydub.AudioSegment.converter, "-hide_banner", "-loglevel", "error",
+                   "-i", "pipe:0", "-f", "s16le", "-acodec", "pcm_s16le",
+                   "-ac", "1", "-ar", str(cls.SAMPLE_RATE), "pipe:1"]
+        process = subprocess.run(command, input=audio_bytes, capture_output=True)
+        if process.returncode == 0 and process.stdout:
+            return cls(process.stdout)
+        
+        # Containers that need seeking (e.g. MP4 with a trailing index) can't be piped
+        current_app.logger.warning(f"ffmpeg pipe decode failed, using pydub: {process.stderr[-200:]!r}")
+        sound = pydub.AudioSegment.from_file(BytesIO(audio_bytes))
+        sound = sound.set_channels(1).set_frame_rate(cls.SAMPLE_RATE).set_sample_width(cls.SAMPLE_WIDTH)
+        return cls(sound.raw_data)
+    
+    @property
+    def samples(self):
+        return np.frombuffer(self.pcm, dtype=np.int16)
+    
+    @property
+    def duration(self):
+        return len(self.pcm) / (self.sample_rate * self.SAMPLE_WIDTH)
+    
+    def is_silent(self):
+        samples = self.samples
+        return samples.size == 0 or int(np.abs(samples.astype(np.int32)).max()) < self.SILENCE_PEAK
+
+
+def azure_stt_configured():
+    return AZURE_STT_AVAILABLE and bool(os.getenv('AZURE_SPEECH_KEY'))
+
+
+def azure_speech_config(lang='en'):
+    """(SpeechConfig, locale) for a language; AZURE_STT_ENDPOINT overrides the region endpoint"""
+    azure_locale = AZURE_LOCALES.get(lang.lower(), 'en-US')
+    speech_key = os.getenv('AZURE_SPEECH_KEY')
+    endpoint = os.getenv('AZURE_STT_ENDPOINT')
+    if endpoint:
+        speech_config = speechsdk.SpeechConfig(subscription=speech_key, endpoint=endpoint)
+    else:
+        speech_config = speechsdk.SpeechConfig(subscription=speech_key,
+                                               region=os.getenv('AZURE_SPEECH_REGION', 'eastus'))
+    speech_config.speech_recognition_language = azure_locale
     
-    finally:
-        # Cleanup temporary files
-        for temp_file in [temp_mp3, temp_wav]:
-            if temp_file:
-                try:
-                    os.remove(temp_file)
-                except Exception:
-                    pass
+    # Enable detailed results for confidence scores
+    speech_config.output_format = speechsdk.OutputFormat.Detailed
+    return speech_config, azure_locale
+
+
+def pcm_push_stream(sample_rate=PCMAudio.SAMPLE_RATE):
+    """Azure push stream accepting 16-bit mono PCM"""
+    stream_format = speechsdk.audio.AudioStreamFormat(
+        samples_per_second=sample_rate, bits_per_sample=16, channels=1)
+    return speechsdk.audio.PushAudioInputStream(stream_format=stream_format)
+
 
+def azure_confidence(result, default=0.9):
+    """Top NBest confidence of a detailed Azure result"""
+    if hasattr(result, 'json') and result.json:
+        try:
+            result_json = json.loads(result.json)
+            if 'NBest' in result_json and len(result_json['NBest']) > 0:
+                return result_json['NBest'][0].get('Confidence', default)
+        except Exception:
+            pass
+    return default
 
-def try_azure_stt(wav_file_path, lang='en'):
+
+def try_azure_stt(audio, lang='en'):
     """
     Try Azure Speech-to-Text recognition with multilingual support
     """
@@ -95,43 +209,16 @@ def try_azure_stt(wav_file_path, lang='en'):
         if not AZURE_STT_AVAILABLE:
             return {"status": "error", "message": "Azure Speech SDK not available"}
         
-        # Get Azure credentials
-        speech_key = os.getenv('AZURE_SPEECH_KEY')
-        speech_region = os.getenv('AZURE_SPEECH_REGION', 'eastus')
-        
-        if not speech_key:
+        if not os.getenv('AZURE_SPEECH_KEY'):
             return {"status": "error", "message": "Azure Speech key not configured"}
         
-        # Map language codes to Azure Speech locale codes
-        azure_lang_map = {
-            'auto': 'en-US',  # Default for auto-detect
-            'en': 'en-US',
-            'hi': 'hi-IN',
-            'hinglish': 'hi-IN',  # Use Hindi for Hinglish
-            'bn': 'bn-IN',     # Bengali (India)
-            'ta': 'ta-IN',     # Tamil (India)
-            'te': 'te-IN',     # Telugu (India)
-            'gu': 'gu-IN',     # Gujarati (India)
-            'kn': 'kn-IN',     # Kannada (India)
-            'ml': 'ml-IN',     # Malayalam (India)
-            'mr': 'mr-IN',     # Marathi (India)
-            'pa': 'pa-IN',     # Punjabi (India)
-            'ur': 'ur-IN',     # Urdu (India)
-            'or': 'or-IN',     # Odia (India)
-            'as': 'as-IN',     # Assamese (India)
-        }
-        
-        azure_locale = azure_lang_map.get(lang.lower(), 'en-US')
-        
-        # Configure Azure Speech
-        speech_config = speechsdk.SpeechConfig(subscription=speech_key, region=speech_region)
-        speech_config.speech_recognition_language = azure_locale
-        
-        # Enable detailed results for confidence scores
-        speech_config.output_format = speechsdk.OutputFormat.Detailed
+        speech_config, azure_locale = azure_speech_config(lang)
         
-        # Create audio config from file
-        audio_config = speechsdk.audio.AudioConfig(filename=wav_file_path)
+        # Feed the decoded PCM through a push stream
+        push_stream = pcm_push_stream(audio.sample_rate)
+        push_stream.write(audio.pcm)
+        push_stream.close()
+        audio_config = speechsdk.audio.AudioConfig(stream=push_stream)
         
         # Create speech recognizer
         speech_recognizer = speechsdk.SpeechRecognizer(
@@ -143,22 +230,11 @@ def try_azure_stt(wav_file_path, lang='en'):
         result = speech_recognizer.recognize_once()
         
         if result.reason == speechsdk.ResultReason.RecognizedSpeech:
-            # Extract confidence score if available
-            confidence = 0.9  # Default confidence for Azure
-            if hasattr(result, 'json') and result.json:
-                try:
-                    import json
-                    result_json = json.loads(result.json)
-                    if 'NBest' in result_json and len(result_json['NBest']) > 0:
-                        confidence = result_json['NBest'][0].get('Confidence', 0.9)
-                except:
-                    pass
-            
             return {
                 "status": "success", 
                 "text": result.text,
                 "method": "azure",
-                "confidence": confidence,
+                "confidence": azure_confidence(result),
                 "language_detected": azure_locale
             }
         elif result.reason == speechsdk.ResultReason.NoMatch:
@@ -179,58 +255,39 @@ def try_azure_stt(wav_file_path, lang='en'):
         return {"status": "error", "message": f"Azure STT error: {str(e)}"}
 
 
-def try_google_stt(wav_file_path, lang='en'):
+def try_google_stt(audio, lang='en'):
     """
     Fallback Google Speech Recognition with enhanced language support
     """
     try:
-        # Map language codes to Google Speech locale codes
-        google_lang_map = {
-            'auto': 'en-US',
-            'en': 'en-US',
-            'hi': 'hi-IN',
-            'hinglish': 'hi-IN',
-            'bn': 'bn-IN',     # Bengali (India)
-            'ta': 'ta-IN',     # Tamil (India)
-            'te': 'te-IN',     # Telugu (India)
-            'gu': 'gu-IN',     # Gujarati (India)
-            'kn': 'kn-IN',     # Kannada (India)
-            'ml': 'ml-IN',     # Malayalam (India)
-            'mr': 'mr-IN',     # Marathi (India)
-            'pa': 'pa-Guru-IN', # Punjabi (India)
-            'ur': 'ur-PK',     # Urdu (Pakistan - better support)
-            'or': 'hi-IN',     # Fallback to Hindi for Odia
-            'as': 'hi-IN',     # Fallback to Hindi for Assamese
-        }
         
-        google_locale = google_lang_map.get(lang.lower(), 'en-US')
+        google_locale = GOOGLE_LOCALES.get(lang.lower(), 'en-US')
         
         recognizer = sr.Recognizer()
-        with sr.AudioFile(wav_file_path) as source:
-            # Adjust for ambient noise
-            recognizer.adjust_for_ambient_noise(source, duration=0.5)
-            audio = recognizer.record(source)
-            
-            try:
-                text = recognizer.recognize_google(audio, language=google_locale)
-                return {
-                    "status": "success", 
-                    "text": text,
-                    "method": "google",
-                    "confidence": 0.8,  # Google doesn't provide confidence scores
-                    "language_detected": google_locale
-                }
-            except sr.UnknownValueError:
-                return {
-                    "status": "success", 
-                    "text": "",
-                    "method": "google",
-                    "confidence": 0.0,
-                    "message": "No speech detected"
-                }
-            except sr.RequestError as e:
-                current_app.logger.error(f"Google STT request error: {e}")
-                return {"status": "error", "message": "Google Speech recognition service unavailable"}
+        # Whole clip as-is: ambient-noise calibration only tunes listen() and
+        # would have consumed the first half second of speech
+        audio_data = sr.AudioData(audio.pcm, audio.sample_rate, PCMAudio.SAMPLE_WIDTH)
+        
+        try:
+            text = recognizer.recognize_google(audio_data, language=google_locale)
+            return {
+                "status": "success", 
+                "text": text,
+                "method": "google",
+                "confidence": 0.8,  # Google doesn't provide confidence scores
+                "language_detected": google_locale
+            }
+        except sr.UnknownValueError:
+            return {
+                "status": "success", 
+                "text": "",
+                "method": "google",
+                "confidence": 0.0,
+                "message": "No speech detected"
+            }
+        except sr.RequestError as e:
+            current_app.logger.error(f"Google STT request error: {e}")
+            return {"status": "error", "message": "Google Speech recognition service unavailable"}
     
     except Exception as e:
         current_app.logger.error(f"Google STT error: {e}")
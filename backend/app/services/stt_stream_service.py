@@ -0,0 +1,360 @@
+"""
+Streaming speech-to-text sessions over Socket.IO
+The client sends small audio chunks; nothing waits for the end of the
+recording and memory per session stays bounded however long it runs
+- Input: raw 16-bit mono PCM ('pcm16') or a streamable container such as
+  MediaRecorder WebM/Opus or Ogg, transcoded to 16kHz PCM by a long-lived
+  ffmpeg process over pipes (writes block while ffmpeg catches up)
+- Azure: PCM goes into a push stream read by a continuous recognizer;
+  partial hypotheses are emitted as they arrive (stt_partial) and each
+  finished phrase as stt_final
+- Without Azure: PCM is cut into utterances at pauses (or every
+  MAX_SEGMENT_SECONDS) in a fixed-size buffer and each utterance goes to
+  the Google recognizer; only stt_final is emitted
+- Chunks carry a sequence number: Socket.IO handlers run on separate threads,
+  so chunks are put back in order and written by one writer thread per
+  session; stop waits for the chunks up to the client's last seq
+Events to the client: stt_partial {text}, stt_final {text, method,
+confidence} and stt_stream_error {message}
+"""
+import subprocess
+import threading
+import time
+from collections import deque
+
+from ..extensions import socketio
+from ..utils.lazy_imports import lazy_import
+from .stt_service import (PCMAudio, azure_stt_configured, azure_speech_config, pcm_push_stream,
+                          azure_confidence, try_google_stt)
+
+np = lazy_import("numpy")
+pydub = lazy_import("pydub")
+speechsdk = lazy_import("azure.cognitiveservices.speech")
+
+MAX_CHUNK_BYTES = 64 * 1024
+PCM_READ_BYTES = 3200  # 100 ms of 16kHz 16-bit mono
+MAX_QUEUED_CHUNKS = 32  # senders are held while this many chunks are queued
+MAX_OUT_OF_ORDER = 16  # gap assumed lost once this many later chunks are waiting
+STOP_WAIT_SECONDS = 2.0
+
+
+class _FFmpegDecoder:
+    """Long-lived ffmpeg transcoding a container stream to 16kHz mono PCM"""
+
+    def __init__(self, on_pcm, logger):
+        self.on_pcm = on_pcm
+        self.logger = logger
+        self.process = subprocess.Popen(
+            [pydub.AudioSegment.converter, "-hide_banner", "-loglevel", "error",
+             "-i", "pipe:0", "-f", "s16le", "-acodec", "pcm_s16le",
+             "-ac", "1", "-ar", str(PCMAudio.SAMPLE_RATE), "pipe:1"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        self.reader = threading.Thread(target=self._read, name="stt-ffmpeg-reader", daemon=True)
+        self.reader.start()
+
+    def _read(self):
+        try:
+            while True:
+                pcm = self.process.stdout.read(PCM_READ_BYTES)
+                if not pcm:
+                    return
+                self.on_pcm(pcm)
+        except Exception as e:
+            self.logger.error(f"STT stream decode error: {e}")
+
+    def write(self, chunk):
+        self.process.stdin.write(chunk)
+        self.process.stdin.flush()
+
+    def close(self, timeout=5.0):
+        """End of input: let ffmpeg flush, then wait for the last PCM to be forwarded"""
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        self.reader.join(timeout)
+        try:
+            self.process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+
+class _AzureContinuousRecognizer:
+    """Azure continuous recognition fed through a push stream"""
+
+    def __init__(self, session, lang, sample_rate):
+        self.session = session
+        speech_config, self.locale = azure_speech_config(lang)
+        self.stream = pcm_push_stream(sample_rate)
+        self.recognizer = speechsdk.SpeechRecognizer(
+            speech_config=speech_config,
+            audio_config=speechsdk.audio.AudioConfig(stream=self.stream)
+        )
+        self._stopped = threading.Event()
+        self.recognizer.recognizing.connect(self._on_recognizing)
+        self.recognizer.recognized.connect(self._on_recognized)
+        self.recognizer.canceled.connect(self._on_canceled)
+        self.recognizer.session_stopped.connect(lambda evt: self._stopped.set())
+        self.recognizer.start_continuous_recognition_async().get()
+
+    def _on_recognizing(self, evt):
+        if evt.result.text:
+            self.session.emit('stt_partial', {'text': evt.result.text})
+
+    def _on_recognized(self, evt):
+        if evt.result.reason == speechsdk.ResultReason.RecognizedSpeech and evt.result.text:
+            self.session.emit('stt_final', {
+                'text': evt.result.text,
+                'method': 'azure',
+                'confidence': azure_confidence(evt.result),
+                'language_detected': self.locale
+            })
+
+    def _on_canceled(self, evt):
+        if evt.cancellation_details.reason == speechsdk.CancellationReason.Error:
+            self.session.emit('stt_stream_error', {'message': f"Azure recognition failed: {evt.cancellation_details.error_details}"})
+        self._stopped.set()
+
+    def write(self, pcm):
+        self.stream.write(pcm)
+
+    def stop(self, timeout=5.0):
+        """Close the stream and wait for the final phrase before stopping"""
+        self.stream.close()
+        self._stopped.wait(timeout)
+        self.recognizer.stop_continuous_recognition_async().get()
+
+
+class _UtteranceRecognizer:
+    """Pause-segmented recognition with the Google backend"""
+
+    MAX_SEGMENT_SECONDS = 15.0
+    PAUSE_SECONDS = 0.6
+    SPEECH_PEAK = 500  # 16-bit peak that counts as speech
+    MAX_PENDING_SEGMENTS = 2
+
+    def __init__(self, session, lang, sample_rate):
+        self.session = session
+        self.lang = lang
+        self.sample_rate = sample_rate
+        bytes_per_second = sample_rate * PCMAudio.SAMPLE_WIDTH
+        self.max_bytes = int(bytes_per_second * self.MAX_SEGMENT_SECONDS)
+        self.pause_bytes = int(bytes_per_second * self.PAUSE_SECONDS)
+        self.buffer = bytearray()
+        self.has_speech = False
+        self.trailing_quiet = 0
+        self._pending = threading.BoundedSemaphore(self.MAX_PENDING_SEGMENTS)
+
+    def write(self, pcm):
+        samples = np.frombuffer(pcm, dtype=np.int16)
+        loud = samples.size and int(np.abs(samples.astype(np.int32)).max()) >= self.SPEECH_PEAK
+        if loud:
+            self.has_speech = True
+            self.trailing_quiet = 0
+        else:
+            self.trailing_quiet += len(pcm)
+        if not self.has_speech:
+            return  # Nothing buffered until speech starts
+        self.buffer.extend(pcm)
+        if self.trailing_quiet >= self.pause_bytes or len(self.buffer) >= self.max_bytes:
+            self._flush()
+
+    def _flush(self):
+        segment = PCMAudio(bytes(self.buffer), self.sample_rate)
+        self.buffer = bytearray()
+        self.has_speech = False
+        self.trailing_quiet = 0
+        # Backpressure: block the sender while MAX_PENDING_SEGMENTS are being recognized
+        self._pending.acquire()
+        socketio.start_background_task(self._recognize, segment)
+
+    def _recognize(self, segment):
+        try:
+            with self.session.app.app_context():
+                result = try_google_stt(segment, self.lang)
+            if result["status"] != "success":
+                self.session.emit('stt_stream_error', {'message': result.get("message")})
+            elif result["text"]:
+                self.session.emit('stt_final', {
+                    'text': result["text"],
+                    'method': result["method"],
+                    'confidence': result["confidence"],
+                    'language_detected': result.get("language_detected")
+                })
+        finally:
+            self._pending.release()
+
+    def stop(self, timeout=None):
+        if self.has_speech and self.buffer:
+            self._flush()
+
+
+class STTStreamSession:
+    """Chunked recognition for one Socket.IO client"""
+
+    def __init__(self, sid, app, lang='en', encoding='pcm16', sample_rate=PCMAudio.SAMPLE_RATE):
+        self.sid = sid
+        self.app = app
+        self.lang = lang
+        self.bytes_received = 0
+        self._carry = b""
+        self._lock = threading.Lock()
+        self._closed = False
+        self._queue = deque()  # chunks in sequence order, waiting for the writer
+        self._early = {}  # seq -> chunk that arrived before its predecessors
+        self._next_seq = 0
+        self._stopping = False  # no more chunks are accepted
+        self._stop_called = False
+        self._cond = threading.Condition()
+
+        if encoding == 'pcm16':
+            self.sample_rate = int(sample_rate)
+            self._decoder = None
+        else:
+            self.sample_rate = PCMAudio.SAMPLE_RATE
+            self._decoder = _FFmpegDecoder(self._on_pcm, app.logger)
+
+        try:
+            if azure_stt_configured():
+                self.backend = 'azure'
+                self._recognizer = _AzureContinuousRecognizer(self, lang, self.sample_rate)
+            else:
+                self.backend = 'google'
+                self._recognizer = _UtteranceRecognizer(self, lang, self.sample_rate)
+        except Exception:
+            # Don't leave the ffmpeg process running for a session that never started
+            if self._decoder:
+                self._decoder.close()
+            raise
+
+        self._writer = threading.Thread(target=self._write_chunks, name="stt-stream-writer", daemon=True)
+        self._writer.start()
+
+    def emit(self, event, data):
+        socketio.emit(event, data, to=self.sid)
+
+    def feed(self, chunk, seq=None):
+        """Add one chunk of client audio; `seq` counts chunks from 0 (arrival order if None)"""
+        if len(chunk) > MAX_CHUNK_BYTES:
+            raise ValueError(f"Audio chunk too large (max {MAX_CHUNK_BYTES // 1024} KB)")
+        with self._cond:
+            if self._stopping:
+                return
+            if seq is None:
+                seq = self._next_seq + len(self._early)
+            if seq < self._next_seq or seq in self._early:
+                return  # Duplicate, or a chunk already given up on
+            self.bytes_received += len(chunk)
+            self._early[seq] = chunk
+            if len(self._early) > MAX_OUT_OF_ORDER and self._next_seq not in self._early:
+                self._next_seq = min(self._early)
+            self._release_in_order()
+            # Backpressure: hold the sender while the writer is behind
+            while len(self._queue) >= MAX_QUEUED_CHUNKS and not self._stopping:
+                self._cond.wait()
+
+    def _release_in_order(self):
+        """Move chunks that are next in sequence to the writer queue (caller holds _cond)"""
+        while self._next_seq in self._early:
+            self._queue.append(self._early.pop(self._next_seq))
+            self._next_seq += 1
+        self._cond.notify_all()
+
+    def _write_chunks(self):
+        """Single writer: chunks reach ffmpeg or the recognizer in sequence order"""
+        while True:
+            with self._cond:
+                while not self._queue and not self._stopping:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                chunk = self._queue.popleft()
+                self._cond.notify_all()
+            try:
+                if self._decoder:
+                    self._decoder.write(chunk)
+                else:
+                    self._on_pcm(chunk)
+            except Exception as e:
+                self.app.logger.error(f"STT stream write error: {e}")
+                self.emit('stt_stream_error', {'message': 'Speech recognition failed'})
+                with self._cond:
+                    self._stopping = True
+                    self._queue.clear()
+                    self._early.clear()
+                    self._cond.notify_all()
+                _forget_stt_stream(self)
+                self.stop()
+                return
+
+    def _on_pcm(self, pcm):
+        with self._lock:
+            # Keep whole 16-bit samples; an odd trailing byte waits for the next chunk
+            pcm = self._carry + pcm
+            usable = len(pcm) - len(pcm) % PCMAudio.SAMPLE_WIDTH
+            self._carry = pcm[usable:]
+            if usable and not self._closed:
+                self._recognizer.write(pcm[:usable])
+
+    def stop(self, last_seq=None, timeout=STOP_WAIT_SECONDS):
+        """Finish the stream; results for the last words are still emitted
+        Chunks up to `last_seq` that are still on their way are waited for"""
+        with self._cond:
+            if self._stop_called:
+                return
+            self._stop_called = True
+            deadline = time.monotonic() + timeout
+            while last_seq is not None and self._next_seq <= last_seq and not self._stopping:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            # Whatever is still out of order goes in as it is; gaps are lost
+            for seq in sorted(self._early):
+                self._queue.append(self._early.pop(seq))
+            self._stopping = True
+            self._cond.notify_all()
+        if threading.current_thread() is not self._writer:
+            self._writer.join()
+        if self._decoder:
+            self._decoder.close()
+        with self._lock:
+            self._closed = True
+        self._recognizer.stop()
+
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def start_stt_stream(sid, app, **options):
+    """Create (or replace) the streaming STT session of a client"""
+    session = STTStreamSession(sid, app, **options)
+    with _sessions_lock:
+        old = _sessions.pop(sid, None)
+        _sessions[sid] = session
+    if old:
+        old.stop()
+    return session
+
+
+def get_stt_stream(sid):
+    return _sessions.get(sid)
+
+
+def _forget_stt_stream(session):
+    """Drop a session that stopped or failed, unless it was already replaced"""
+    with _sessions_lock:
+        if _sessions.get(session.sid) is session:
+            del _sessions[session.sid]
+
+
+def stop_stt_stream(sid, last_seq=None):
+    """Stop a client's session; it stays registered while stop() waits for
+    chunks up to `last_seq`, so late chunks still reach it"""
+    with _sessions_lock:
+        session = _sessions.get(sid)
+    if session:
+        session.stop(last_seq)
+        _forget_stt_stream(session)
+    return session is not None
@@ -8,27 +8,20 @@ import time
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 import logging
+from ..utils.lazy_imports import module_available
+from ..utils.metrics import TRANSLATION_CACHE
 
-# Translation libraries
-try:
-    from googletrans import Translator
-    GOOGLETRANS_AVAILABLE = True
-except ImportError:
-    GOOGLETRANS_AVAILABLE = False
+# Translation libraries (imported when the service is first created)
+GOOGLETRANS_AVAILABLE = module_available("googletrans")
+if not GOOGLETRANS_AVAILABLE:
     print("Warning: googletrans not available. Install with: pip install googletrans==4.0.0rc1")
 
-try:
-    from translate import Translator as OfflineTranslator
-    OFFLINE_TRANSLATOR_AVAILABLE = True
-except ImportError:
-    OFFLINE_TRANSLATOR_AVAILABLE = False
+OFFLINE_TRANSLATOR_AVAILABLE = module_available("translate")
+if not OFFLINE_TRANSLATOR_AVAILABLE:
     print("Warning: translate not available. Install with: pip install translate==3.6.1")
 
-try:
-    from indic_transliteration import sanscript
-    INDIC_TRANSLITERATION_AVAILABLE = True
-except ImportError:
-    INDIC_TRANSLITERATION_AVAILABLE = False
+INDIC_TRANSLITERATION_AVAILABLE = module_available("indic_transliteration")
+if not INDIC_TRANSLITERATION_AVAILABLE:
     print("Warning: indic-transliteration not available. Install with: pip install indic-transliteration==2.3.43")
 
 # Fallback Hindi dictionary for offline translation
@@ -173,6 +166,7 @@ class TranslationService:
         """Initialize available translators"""
         try:
             if GOOGLETRANS_AVAILABLE:
+                from googletrans import Translator
                 self.google_translator = Translator()
                 print("✅ Google Translator initialized")
         except Exception as e:
@@ -180,6 +174,7 @@ class TranslationService:
             
         try:
             if OFFLINE_TRANSLATOR_AVAILABLE:
+                from translate import Translator as OfflineTranslator
                 self.offline_translator = OfflineTranslator(to_lang="hi", from_lang="en")
                 print("✅ Offline Translator initialized")
         except Exception as e:
@@ -205,9 +200,11 @@ class TranslationService:
         # Check cache first
         cache_key = f"{text}_{source_lang}_{target_lang}"
         if cache_key in self.translation_cache:
+            TRANSLATION_CACHE.inc('hit')
             cached_result = self.translation_cache[cache_key].copy()
             cached_result['from_cache'] = True
             return cached_result
+        TRANSLATION_CACHE.inc('miss')
         
         translation_result = None
         method_used = "none"
@@ -533,4 +530,4 @@ def get_translation_service() -> TranslationService:
     global _translation_service
     if _translation_service is None:
         _translation_service = TranslationService()
-    return _translation_service
\ No newline at end of file
+    return _translation_service
\ No newline at end of file
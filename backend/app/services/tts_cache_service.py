@@ -0,0 +1,220 @@
+"""
+Content-addressed TTS audio cache
+Synthesized audio is stored on disk under the SHA-256 of everything that
+shapes it (provider, text, language, voice, rate, pitch, format)
+- Repeated phrases cost one file read; concurrent misses for the same key
+  synthesize once
+- Least recently used entries are evicted once TTS_CACHE_MAX_MB is exceeded
+- Files are served by /tts/audio/<key>.<format> with ETag and Range support
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+
+from ..utils.metrics import TTS_CACHE
+
+MIME_TYPES = {'mp3': 'audio/mpeg', 'wav': 'audio/wav', 'ogg': 'audio/ogg'}
+
+_KEY = re.compile(r"^[0-9a-f]{64}$")
+
+
+def cache_key(**params):
+    """Stable hash of the synthesis parameters"""
+    payload = json.dumps(params, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TTSAudioCache:
+    """Disk cache of synthesized audio with an in-memory LRU index"""
+
+    def __init__(self, directory="storage/tts_cache", max_bytes=256 * 1024 * 1024):
+        self.directory = os.path.abspath(directory)
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> bytes on disk, least recently used first
+        self._size = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.logger = logging.getLogger(__name__)
+
+    def configure(self, app):
+        directory = os.path.abspath(app.config.get("TTS_CACHE_DIR", self.directory))
+        with self._lock:
+            if directory != self.directory:
+                self.directory = directory
+                self._entries = OrderedDict()
+                self._size = 0
+                self._loaded = False
+            self.max_bytes = int(app.config.get("TTS_CACHE_MAX_MB", self.max_bytes / 1048576) * 1048576)
+        self.logger = app.logger
+
+    def _paths(self, key, audio_format):
+        folder = os.path.join(self.directory, key[:2])
+        return os.path.join(folder, f"{key}.{audio_format}"), os.path.join(folder, f"{key}.json")
+
+    def _load_index(self):
+        """Index existing files, oldest modification first (hits touch the metadata file)"""
+        found = {}
+        for root, _dirs, files in os.walk(self.directory):
+            for name in files:
+                key, ext = os.path.splitext(name)
+                if not _KEY.match(key):
+                    continue
+                try:
+                    stat = os.stat(os.path.join(root, name))
+                except OSError:
+                    continue
+                size, mtime = found.get(key, (0, 0))
+                found[key] = (size + stat.st_size, max(mtime, stat.st_mtime) if ext == ".json" else mtime)
+        self._entries = OrderedDict((key, size) for key, (size, _) in sorted(found.items(), key=lambda item: item[1][1]))
+        self._size = sum(self._entries.values())
+        self._loaded = True
+
+    def get(self, key):
+        """Metadata of a cached entry, or None"""
+        if not _KEY.match(key):
+            return None
+        with self._lock:
+            if not self._loaded:
+                self._load_index()
+        _, meta_path = self._paths(key, "json")
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            audio_path, _ = self._paths(key, meta["format"])
+            size = os.path.getsize(audio_path) + os.path.getsize(meta_path)
+            os.utime(meta_path)
+        except (OSError, ValueError, KeyError):
+            self._forget(key)
+            return None
+        with self._lock:
+            # Another worker may have written it; adopt it into this index
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            else:
+                self._entries[key] = size
+                self._size += size
+        return meta
+
+    def put(self, key, audio, meta):
+        """Store audio bytes and their metadata; the metadata file is written last"""
+        audio_path, meta_path = self._paths(key, meta["format"])
+        os.makedirs(os.path.dirname(audio_path), exist_ok=True)
+        self._write_atomic(audio_path, audio)
+        self._write_atomic(meta_path, json.dumps(meta, ensure_ascii=False, default=str).encode("utf-8"))
+        size = len(audio) + os.path.getsize(meta_path)
+        with self._lock:
+            self._size += size - self._entries.pop(key, 0)
+            self._entries[key] = size
+            evicted = self._evict()
+        for old_key in evicted:
+            self._remove_files(old_key)
+
+    @staticmethod
+    def _write_atomic(path, data):
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _evict(self):
+        evicted = []
+        while self._size > self.max_bytes and len(self._entries) > 1:
+            key, size = self._entries.popitem(last=False)
+            self._size -= size
+            self.evictions += 1
+            evicted.append(key)
+        if evicted:
+            TTS_CACHE.inc("evicted", amount=len(evicted))
+        return evicted
+
+    def _forget(self, key):
+        with self._lock:
+            self._size -= self._entries.pop(key, 0)
+
+    def _remove_files(self, key):
+        folder = os.path.join(self.directory, key[:2])
+        for ext in list(MIME_TYPES) + ["json"]:
+            try:
+                os.remove(os.path.join(folder, f"{key}.{ext}"))
+            except OSError:
+                pass
+
+    def audio_path(self, key, audio_format):
+        """Path of a cached audio file, or None"""
+        if not _KEY.match(key) or audio_format not in MIME_TYPES:
+            return None
+        path, _ = self._paths(key, audio_format)
+        return path if os.path.isfile(path) else None
+
+    def get_or_create(self, key, synthesize):
+        """(metadata, cached) for `key`, calling synthesize() on a miss
+
+        synthesize() returns the provider result with raw bytes under 'audio';
+        failures are returned as-is and not cached.
+        """
+        meta = self.get(key)
+        if meta is not None:
+            self.hits += 1
+            TTS_CACHE.inc("hit")
+            return meta, True
+
+        with self._lock:
+            flight = self._inflight.setdefault(key, threading.Lock())
+        try:
+            with flight:
+                meta = self.get(key)
+                if meta is not None:
+                    self.hits += 1
+                    TTS_CACHE.inc("hit")
+                    return meta, True
+
+                self.misses += 1
+                TTS_CACHE.inc("miss")
+                result = synthesize()
+                if result.get("status") != "success":
+                    return result, False
+                audio = result.pop("audio")
+                try:
+                    self.put(key, audio, result)
+                except OSError as e:
+                    self.logger.error(f"TTS cache write failed: {e}")
+                    return {"status": "error", "message": "Could not store synthesized audio"}, False
+                return result, False
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                'directory': self.directory,
+                'entries': len(self._entries),
+                'size_mb': round(self._size / 1048576, 2),
+                'max_mb': round(self.max_bytes / 1048576, 2),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+
+# Global audio cache
+tts_cache = TTSAudioCache()
+
+
+def get_tts_cache():
+    """Get the global TTS audio cache"""
+    return tts_cache
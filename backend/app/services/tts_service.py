@@ -1,24 +1,54 @@
 """
 Enhanced Text-to-Speech service with Azure TTS and gTTS fallback
+Audio is cached on disk by content (services/tts_cache_service.py) and
+returned as a URL; identical requests never re-synthesize
 """
 import os
-import time
 import base64
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
-from gtts import gTTS
-from pydub import AudioSegment
-from flask import current_app
+from flask import current_app, has_app_context, has_request_context, url_for
+from ..utils.lazy_imports import lazy_import
+from .tts_cache_service import get_tts_cache, cache_key
+
+# Audio stacks load on first synthesis, not at app boot
+gtts = lazy_import("gtts")
+pydub = lazy_import("pydub")
 
 # Import Azure TTS service
 try:
-    from .azure_tts_service import azure_text_to_speech_service
+    from .azure_tts_service import azure_tts_service
     AZURE_TTS_AVAILABLE = True
 except ImportError:
     AZURE_TTS_AVAILABLE = False
 
+GTTS_MAX_CHARS = 2000
+GTTS_CHUNK_CHARS = 120
+
+# Map language codes for gTTS
+GTTS_LANGS = {
+    'hi': 'hi',
+    'hinglish': 'hi',
+    'en': 'en',
+    'bn': 'bn',
+    'ta': 'ta',
+    'te': 'te',
+    'gu': 'gu',
+    'kn': 'kn',
+    'ml': 'ml',
+    'mr': 'mr',
+    'pa': 'pa',
+    'ur': 'ur'
+}
+
+# Bounded pool shared by all gTTS chunk requests (GTTS_MAX_WORKERS)
+_gtts_pool = None
+_gtts_pool_lock = threading.Lock()
+
 def text_to_speech_service(text, lang='hi', voice_gender='default', 
                           speech_rate='medium', pitch='medium', 
-                          audio_format='mp3', use_azure=None, auto_translate=True):
+                          audio_format='mp3', use_azure=None, auto_translate=True, inline=False):
     """
     Enhanced text-to-speech service with Azure TTS and gTTS fallback
     
@@ -30,14 +60,17 @@ def text_to_speech_service(text, lang='hi', voice_gender='default',
         pitch: 'x-low', 'low', 'medium', 'high', 'x-high' (Azure only)
         audio_format: 'mp3', 'wav', 'ogg'
         use_azure: Force Azure TTS (True) or gTTS (False), None for auto
+        inline: Also return the audio as a base64 data URL
     
     Returns:
-        dict: {"status": "success", "audio_data": "data:audio/mp3;base64,..."}
+        dict: {"status": "success", "audio_url": "/tts/audio/<key>.mp3", "cached": bool, ...}
     """
     try:
         # Validate input
         if not text or not text.strip():
             return {"status": "error", "message": "No text provided"}
+        if audio_format not in ('mp3', 'wav', 'ogg'):
+            audio_format = 'mp3'
         
         # Determine which TTS service to use
         should_use_azure = False
@@ -55,19 +88,26 @@ def text_to_speech_service(text, lang='hi', voice_gender='default',
         if should_use_azure:
             try:
                 current_app.logger.info(f"Using Azure TTS for language: {lang}")
-                result = azure_text_to_speech_service(
-                    text=text,
-                    lang=lang,
-                    voice_gender=voice_gender,
-                    speech_rate=speech_rate,
-                    pitch=pitch,
-                    audio_format=audio_format,
-                    auto_translate=auto_translate
-                )
+                key = cache_key(provider="azure", text=text, lang=lang, voice=voice_gender, rate=speech_rate,
+                                pitch=pitch, format=audio_format, auto_translate=bool(auto_translate))
                 
+                def synthesize():
+                    result = azure_tts_service.synthesize_audio(
+                        text=text,
+                        language=lang,
+                        voice_gender=voice_gender,
+                        speech_rate=speech_rate,
+                        pitch=pitch,
+                        audio_format=audio_format,
+                        auto_translate=auto_translate
+                    )
+                    if result["status"] == "success":
+                        result["provider"] = "Azure Cognitive Services"
+                        result["quality"] = "Neural Voice"
+                    return result
+                
+                result = _cached_audio(key, synthesize, inline)
                 if result["status"] == "success":
-                    result["provider"] = "Azure Cognitive Services"
-                    result["quality"] = "Neural Voice"
                     return result
                 else:
                     current_app.logger.warning(f"Azure TTS failed: {result.get('message')}")
@@ -79,73 +119,69 @@ def text_to_speech_service(text, lang='hi', voice_gender='default',
         
         # Use gTTS as fallback or primary
         current_app.logger.info(f"Using gTTS for language: {lang}")
-        return gtts_text_to_speech(text, lang, audio_format)
+        key = gtts_cache_key(text, lang, audio_format)
+        return _cached_audio(key, lambda: gtts_synthesize(text, lang, audio_format), inline)
         
     except Exception as e:
         current_app.logger.error(f"TTS service error: {e}")
         return {"status": "error", "message": "TTS conversion failed"}
 
+def _cached_audio(key, synthesize, inline=False):
+    """Serve a synthesis result from the audio cache, filling it on a miss"""
+    cache = get_tts_cache()
+    result, cached = cache.get_or_create(key, synthesize)
+    if result.get("status") != "success":
+        return result
+    
+    result = dict(result)
+    result["cache_key"] = key
+    result["cached"] = cached
+    result["audio_url"] = _audio_url(key, result["format"])
+    if inline:
+        with open(cache.audio_path(key, result["format"]), "rb") as f:
+            audio_base64 = base64.b64encode(f.read()).decode("utf-8")
+        result["audio_data"] = f"data:audio/{result['format']};base64,{audio_base64}"
+    return result
+
+def _audio_url(key, audio_format):
+    if has_request_context():
+        return url_for("media.tts_audio", key=key, audio_format=audio_format)
+    # Socket.IO background tasks have no request to build a URL from
+    root = current_app.config.get("APPLICATION_ROOT") or "/"
+    return f"{root.rstrip('/')}/tts/audio/{key}.{audio_format}"
+
 def gtts_text_to_speech(text, lang='hi', audio_format='mp3'):
     """
-    Google Text-to-Speech implementation (fallback)
+    Google Text-to-Speech implementation (fallback), audio inline as a data URL
+    """
+    result = gtts_synthesize(text, lang, audio_format)
+    if result["status"] == "success":
+        audio_base64 = base64.b64encode(result.pop("audio")).decode("utf-8")
+        result["audio_data"] = f"data:{result.pop('mime_type')};base64,{audio_base64}"
+    return result
+
+def gtts_synthesize(text, lang='hi', audio_format='mp3'):
+    """
+    Google Text-to-Speech synthesis returning raw audio bytes
+    MP3 chunks are joined frame by frame; WAV/OGG decode the joined MP3 once
     """
     try:
-        # Limit text length for gTTS
-        text = text[:2000]
-        
-        # Map language codes for gTTS
-        gtts_lang_map = {
-            'hi': 'hi',
-            'hinglish': 'hi',
-            'en': 'en',
-            'bn': 'bn',
-            'ta': 'ta',
-            'te': 'te',
-            'gu': 'gu',
-            'kn': 'kn',
-            'ml': 'ml',
-            'mr': 'mr',
-            'pa': 'pa',
-            'ur': 'ur'
-        }
-        
-        gtts_lang = gtts_lang_map.get(lang, 'en')
-        
-        # Split into chunks for better processing
-        chunk_size = 120
-        chunks = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
-        
-        # Combine audio chunks
-        audio_combined = AudioSegment.silent(duration=0)
-        
-        for chunk in chunks:
-            tts = gTTS(text=chunk, lang=gtts_lang, slow=False)
-            buf = BytesIO()
-            tts.write_to_fp(buf)
-            buf.seek(0)
-            seg = AudioSegment.from_file(buf, format="mp3")
-            audio_combined += seg
-            time.sleep(0.01)  # Small delay to avoid rate limiting
+        mp3 = b"".join(iter_gtts_mp3(text, lang))
         
         # Convert to requested format
-        final_buf = BytesIO()
-        if audio_format == 'wav':
-            audio_combined.export(final_buf, format="wav")
-            mime_type = "audio/wav"
-        elif audio_format == 'ogg':
-            audio_combined.export(final_buf, format="ogg")
-            mime_type = "audio/ogg"
+        if audio_format in ('wav', 'ogg'):
+            final_buf = BytesIO()
+            pydub.AudioSegment.from_file(BytesIO(mp3), format="mp3").export(final_buf, format=audio_format)
+            audio = final_buf.getvalue()
+            mime_type = f"audio/{audio_format}"
         else:  # Default to mp3
-            audio_combined.export(final_buf, format="mp3")
+            audio = mp3
             mime_type = "audio/mp3"
             
-        final_buf.seek(0)
-        audio_base64 = base64.b64encode(final_buf.read()).decode("utf-8")
-        audio_data_url = f"data:{mime_type};base64,{audio_base64}"
-        
         return {
             "status": "success", 
-            "audio_data": audio_data_url,
+            "audio": audio,
+            "mime_type": mime_type,
             "provider": "Google Text-to-Speech",
             "quality": "Standard",
             "language": lang,
@@ -156,6 +192,95 @@ def gtts_text_to_speech(text, lang='hi', audio_format='mp3'):
         current_app.logger.error(f"gTTS error: {e}")
         return {"status": "error", "message": "gTTS conversion failed"}
 
+def stream_gtts_mp3(text, lang='hi'):
+    """
+    Yield gTTS MP3 audio as chunks finish, then store the whole clip in the
+    audio cache so the next request for it is a file read
+    """
+    parts = []
+    try:
+        for part in iter_gtts_mp3(text, lang):
+            parts.append(part)
+            yield part
+    except Exception as e:
+        current_app.logger.error(f"gTTS stream error: {e}")
+        return
+    
+    meta = {
+        "status": "success",
+        "mime_type": "audio/mp3",
+        "provider": "Google Text-to-Speech",
+        "quality": "Standard",
+        "language": lang,
+        "format": "mp3"
+    }
+    try:
+        get_tts_cache().put(gtts_cache_key(text, lang, 'mp3'), b"".join(parts), meta)
+    except OSError as e:
+        current_app.logger.error(f"TTS cache write failed: {e}")
+
+def gtts_cache_key(text, lang='hi', audio_format='mp3'):
+    """Audio cache key of a gTTS result (gTTS ignores voice, rate and pitch)"""
+    return cache_key(provider="gtts", text=text[:GTTS_MAX_CHARS], lang=lang, format=audio_format)
+
+def iter_gtts_mp3(text, lang='hi'):
+    """
+    Yield MP3 audio for `text` chunk by chunk, in order
+    All chunks are synthesized concurrently on the bounded gTTS pool; the
+    first one is yielded as soon as it is ready. Chunks are bare MP3 frames
+    (ID3 tags stripped), so the parts concatenate into one valid stream.
+    """
+    gtts_lang = GTTS_LANGS.get(lang, 'en')
+    pool = _get_gtts_pool()
+    futures = [pool.submit(_synthesize_chunk, chunk, gtts_lang)
+               for chunk in split_text(text[:GTTS_MAX_CHARS], GTTS_CHUNK_CHARS)]
+    try:
+        for future in futures:
+            yield future.result()
+    finally:
+        # Client went away or a chunk failed: drop the chunks not started yet
+        for future in futures:
+            future.cancel()
+
+def split_text(text, size):
+    """Chunks of at most `size` characters, broken at whitespace where possible"""
+    chunks = []
+    text = text.strip()
+    while text:
+        if len(text) <= size:
+            chunks.append(text)
+            break
+        cut = text.rfind(" ", 0, size + 1)
+        if cut <= 0:
+            cut = size
+        chunks.append(text[:cut].strip())
+        text = text[cut:].strip()
+    return [chunk for chunk in chunks if chunk]
+
+def _synthesize_chunk(chunk, gtts_lang):
+    buf = BytesIO()
+    gtts.gTTS(text=chunk, lang=gtts_lang, slow=False).write_to_fp(buf)
+    return strip_id3(buf.getvalue())
+
+def strip_id3(mp3):
+    """MP3 frames without a leading ID3v2 or trailing ID3v1 tag"""
+    if mp3[:3] == b"ID3" and len(mp3) >= 10:
+        # Tag size is a 28-bit syncsafe integer; flag 0x10 adds a 10-byte footer
+        size = (mp3[6] << 21) | (mp3[7] << 14) | (mp3[8] << 7) | mp3[9]
+        mp3 = mp3[10 + size + (10 if mp3[5] & 0x10 else 0):]
+    if len(mp3) >= 128 and mp3[-128:-125] == b"TAG":
+        mp3 = mp3[:-128]
+    return mp3
+
+def _get_gtts_pool():
+    global _gtts_pool
+    if _gtts_pool is None:
+        with _gtts_pool_lock:
+            if _gtts_pool is None:
+                workers = current_app.config.get("GTTS_MAX_WORKERS", 4) if has_app_context() else 4
+                _gtts_pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="gtts")
+    return _gtts_pool
+
 def get_tts_capabilities():
     """
     Get available TTS capabilities and supported languages
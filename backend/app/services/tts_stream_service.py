@@ -0,0 +1,181 @@
+"""
+Streaming TTS sessions for live transcripts
+One session per Socket.IO client; only text that was not spoken yet is
+synthesized, one segment at a time, and each segment's audio is pushed to the
+client as soon as it is ready
+- ISL: words finalized by WordFormationEngine are queued as they appear. The
+  recognizer (and its word list) is shared by every client, so each session is
+  fed the words formed during its own client's events, not the whole list
+- Text: a growing transcript is diffed against what was already consumed and
+  complete sentences are queued (the remainder once the transcript is final);
+  transcripts carry a client sequence number and stale ones are dropped
+- Segments go through text_to_speech_service, so each one is cached by
+  content and repeated words/phrases are a file read
+Events to the client: tts_chunk {seq, text, audio, format, audio_url, cached}
+and tts_stream_error {seq, text, message}
+"""
+import re
+import threading
+from collections import deque
+
+from flask import current_app
+
+from ..extensions import socketio
+
+# Sentence ends, including the Devanagari danda
+_SENTENCE_END = re.compile(r"(?<=[.!?।])\s+")
+
+MAX_PENDING_SEGMENTS = 100
+MAX_WORDS_PER_SEGMENT = 8
+
+
+class TTSStreamSession:
+    """Queue of unspoken segments for one client, drained by one background task"""
+
+    def __init__(self, sid, app, lang='en', voice_gender='default', speech_rate='medium',
+                 pitch='medium', audio_format='mp3', use_azure=None, source='text'):
+        self.sid = sid
+        self.app = app
+        self.source = source  # 'isl' sessions are fed by the ISL recognition handlers
+        self.options = {
+            'lang': lang,
+            'voice_gender': voice_gender,
+            'speech_rate': speech_rate,
+            'pitch': pitch,
+            'audio_format': audio_format,
+            'use_azure': use_azure,
+            'auto_translate': False
+        }
+        self._pending = deque()  # (text, is_word)
+        self._lock = threading.Lock()
+        self._running = False
+        self._closed = False
+        self._consumed = ""
+        self._text_seq = None
+        self.seq = 0
+
+    def feed_words(self, words):
+        """Queue words finalized by one of this client's events (entries of WordFormationEngine.formed_words)"""
+        for info in words:
+            if info.get('word'):
+                self._enqueue(info['word'].lower(), is_word=True)
+
+    def feed_transcript(self, text, final=False, seq=None):
+        """Queue complete sentences of `text` that were not consumed yet
+        Events are handled on separate threads; one whose `seq` is not newer than
+        the last transcript seen arrived late and is dropped"""
+        with self._lock:
+            if seq is not None:
+                if self._text_seq is not None and seq <= self._text_seq:
+                    return
+                self._text_seq = seq
+            if not text.startswith(self._consumed):
+                # Edited transcript: keep the common prefix as spoken
+                common = 0
+                for old, new in zip(self._consumed, text):
+                    if old != new:
+                        break
+                    common += 1
+                self._consumed = text[:common]
+            new_text = text[len(self._consumed):]
+            parts = _SENTENCE_END.split(new_text)
+            complete = parts if final else parts[:-1]
+            self._consumed += new_text if final else new_text[:len(new_text) - len(parts[-1])]
+        for sentence in complete:
+            # Skip leftover punctuation such as the "." closing an already final sentence
+            if any(ch.isalnum() for ch in sentence):
+                self._enqueue(sentence.strip(), is_word=False)
+
+    def _enqueue(self, text, is_word):
+        with self._lock:
+            if self._closed:
+                return
+            if len(self._pending) >= MAX_PENDING_SEGMENTS:
+                self._pending.popleft()
+            self._pending.append((text, is_word))
+            if self._running:
+                return
+            self._running = True
+        socketio.start_background_task(self._drain)
+
+    def _next_segment(self):
+        """Next text to speak; a backlog of single words is spoken as one phrase"""
+        with self._lock:
+            if self._closed or not self._pending:
+                self._running = False
+                return None
+            text, is_word = self._pending.popleft()
+            if is_word:
+                words = [text]
+                while self._pending and self._pending[0][1] and len(words) < MAX_WORDS_PER_SEGMENT:
+                    words.append(self._pending.popleft()[0])
+                text = " ".join(words)
+            self.seq += 1
+            return self.seq, text
+
+    def _drain(self):
+        from .tts_service import text_to_speech_service
+        from .tts_cache_service import get_tts_cache
+
+        with self.app.app_context():
+            while True:
+                segment = self._next_segment()
+                if segment is None:
+                    return
+                seq, text = segment
+                try:
+                    result = text_to_speech_service(text=text, **self.options)
+                    if result["status"] != "success":
+                        socketio.emit('tts_stream_error', {'seq': seq, 'text': text, 'message': result.get("message")},
+                                      to=self.sid)
+                        continue
+                    with open(get_tts_cache().audio_path(result["cache_key"], result["format"]), "rb") as f:
+                        audio = f.read()
+                    socketio.emit('tts_chunk', {
+                        'seq': seq,
+                        'text': text,
+                        'audio': audio,
+                        'format': result["format"],
+                        'audio_url': result["audio_url"],
+                        'cached': result["cached"]
+                    }, to=self.sid)
+                except Exception as e:
+                    current_app.logger.error(f"TTS stream error: {e}")
+                    socketio.emit('tts_stream_error', {'seq': seq, 'text': text, 'message': "TTS conversion failed"},
+                                  to=self.sid)
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            self._pending.clear()
+
+    def get_stats(self):
+        with self._lock:
+            return {'pending': len(self._pending), 'spoken': self.seq, 'running': self._running}
+
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def start_tts_stream(sid, app, **options):
+    """Create (or replace) the streaming TTS session of a client"""
+    session = TTSStreamSession(sid, app, **options)
+    with _sessions_lock:
+        old = _sessions.pop(sid, None)
+        _sessions[sid] = session
+    if old:
+        old.close()
+    return session
+
+
+def get_tts_stream(sid):
+    return _sessions.get(sid)
+
+
+def stop_tts_stream(sid):
+    with _sessions_lock:
+        session = _sessions.pop(sid, None)
+    if session:
+        session.close()
+    return session is not None
@@ -34,3 +34,10 @@ def db_cursor():
         current_app.logger.error(msg)
         raise RuntimeError(msg)
     return mysql.connection.cursor()
+
+def row_dict(cur, row):
+    """Row as a dict, whether the cursor class returns dicts (DictCursor) or tuples"""
+    if isinstance(row, dict):
+        return row
+    cols = [desc[0] for desc in cur.description]
+    return dict(zip(cols, row))
@@ -2,7 +2,7 @@
 Custom decorators for authentication and authorization
 """
 from functools import wraps
-from flask import session, redirect, url_for, flash, jsonify, request
+from flask import session, redirect, url_for, flash, jsonify, request, current_app
 
 
 def login_required(f):
@@ -18,6 +18,18 @@ def login_required(f):
     return decorated_function
 
 
+def admin_required(f):
+    """Require a logged-in user listed in ADMIN_USER_IDS"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if "user_id" not in session:
+            return jsonify({"error": "Authentication required"}), 401
+        if session["user_id"] not in current_app.config.get("ADMIN_USER_IDS", ()):
+            return jsonify({"error": "Admin access required"}), 403
+        return f(*args, **kwargs)
+    return decorated_function
+
+
 def anonymous_required(f):
     """Require user to NOT be logged in (for login/register pages)"""
     @wraps(f)
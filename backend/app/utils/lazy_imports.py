@@ -0,0 +1,47 @@
+"""
+Lazy import helpers
+- lazy_import() returns a module proxy that imports on first attribute access
+- module_available() checks if a package is installed without importing it
+Used to keep ML, audio and translation stacks out of app boot
+"""
+import importlib
+import importlib.util
+import types
+
+
+class _LazyModule(types.ModuleType):
+    """Module proxy that imports the real module on first attribute access"""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__['_lazy_target'] = None
+
+    def _load(self):
+        module = self.__dict__['_lazy_target']
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            self.__dict__['_lazy_target'] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__['_lazy_target'] is not None else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_import(name):
+    """Return a proxy for module `name`; the import happens on first use"""
+    return _LazyModule(name)
+
+
+def module_available(name):
+    """True if module `name` can be imported (parent packages may be imported)"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
@@ -0,0 +1,321 @@
+"""
+Prometheus-style metrics for /metrics
+- Counters and histograms are sharded per thread: recording updates a
+  thread-local dict without taking a lock
+- Shards of finished threads are folded into a retired total whenever a new
+  thread registers and at scrape time, so the shard list stays bounded by the
+  number of live threads
+- init_metrics(app) times HTTP requests per endpoint and Socket.IO events per name
+- instrument_model() times database model methods
+- ISL pipeline stage histograms (backend.ml.stage_timing) are exported as-is
+"""
+import sys
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class _ShardedMetric:
+    """Per-thread value dicts merged on collect"""
+
+    type_name = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards = []  # (thread, values)
+        self._retired = {}
+        self._lock = threading.Lock()
+
+    def _values(self):
+        """This thread's shard; registered once per thread"""
+        try:
+            return self._local.values
+        except AttributeError:
+            values = {}
+            self._local.values = values
+            with self._lock:
+                self._retire_dead()
+                self._shards.append((threading.current_thread(), values))
+            return values
+
+    def _retire_dead(self):
+        """Fold shards of finished threads into the retired total (caller holds the lock)"""
+        live = []
+        for thread, values in self._shards:
+            if thread.is_alive():
+                live.append((thread, values))
+            else:
+                self._merge(self._retired, values)
+        self._shards = live
+
+    def _merge(self, into, values):
+        raise NotImplementedError
+
+    def collect(self):
+        """Merged values of all shards, keyed by label values"""
+        merged = {}
+        with self._lock:
+            self._retire_dead()
+            self._merge(merged, self._retired)
+            for _, values in self._shards:
+                self._merge(merged, dict(values))
+        return merged
+
+
+class Counter(_ShardedMetric):
+    """Monotonic counter"""
+
+    type_name = "counter"
+
+    def inc(self, *labelvalues, amount=1):
+        values = self._values()
+        values[labelvalues] = values.get(labelvalues, 0) + amount
+
+    def _merge(self, into, values):
+        for key, value in values.items():
+            into[key] = into.get(key, 0) + value
+
+    def render(self):
+        lines = []
+        for key, value in sorted(self.collect().items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value}")
+        return lines
+
+
+class Histogram(_ShardedMetric):
+    """Fixed-bucket histogram; each series is [bucket counts..., +Inf count, sum]"""
+
+    type_name = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, *labelvalues):
+        values = self._values()
+        series = values.get(labelvalues)
+        if series is None:
+            series = values[labelvalues] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def time(self, *labelvalues):
+        """Context manager observing the elapsed time of a block"""
+        return _Timer(self, labelvalues)
+
+    def _merge(self, into, values):
+        for key, series in values.items():
+            target = into.get(key)
+            if target is None:
+                into[key] = list(series)
+            else:
+                for i, value in enumerate(series):
+                    target[i] += value
+
+    def render(self):
+        lines = []
+        for key, series in sorted(self.collect().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), series[:-1]):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, [("le", bound)])
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {series[-1]:.6f}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class _Timer:
+    def __init__(self, histogram, labelvalues):
+        self.histogram = histogram
+        self.labelvalues = labelvalues
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, *self.labelvalues)
+        return False
+
+
+class MetricsRegistry:
+    """Named metrics plus collectors that return ready-made exposition text"""
+
+    def __init__(self):
+        self.metrics = {}
+        self.collectors = []
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, *args, **kwargs):
+        with self._lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = cls(name, *args, **kwargs)
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def add_collector(self, name, collector):
+        """collector() returns Prometheus text; registered once per name"""
+        with self._lock:
+            if name not in dict(self.collectors):
+                self.collectors.append((name, collector))
+
+    def render(self):
+        """Prometheus text exposition format"""
+        lines = []
+        for metric in list(self.metrics.values()):
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            lines.extend(metric.render())
+        text = "\n".join(lines) + "\n"
+        for name, collector in list(self.collectors):
+            try:
+                text += collector()
+            except Exception as e:
+                text += f"# collector {name} failed: {_escape(e)}\n"
+        return text
+
+
+def _shared_registry():
+    """The app package is importable as both "app" and "backend.app"; share one registry"""
+    for module_name in ("app.utils.metrics", "backend.app.utils.metrics"):
+        module = sys.modules.get(module_name)
+        if module is not None and getattr(module, "registry", None) is not None:
+            return module.registry
+    return MetricsRegistry()
+
+
+registry = _shared_registry()
+
+HTTP_REQUESTS = registry.counter(
+    "http_requests_total", "HTTP requests by endpoint and status", ("method", "endpoint", "status"))
+HTTP_LATENCY = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by endpoint", ("method", "endpoint"))
+SOCKETIO_EVENTS = registry.counter(
+    "socketio_events_total", "Socket.IO events handled by event name", ("event",))
+SOCKETIO_LATENCY = registry.histogram(
+    "socketio_event_duration_seconds", "Socket.IO handler latency by event name", ("event",))
+DB_LATENCY = registry.histogram(
+    "db_query_duration_seconds", "Database model method latency", ("method",))
+DB_ERRORS = registry.counter(
+    "db_query_errors_total", "Database model methods that raised", ("method",))
+TRANSLATION_CACHE = registry.counter(
+    "translation_cache_requests_total", "Translation cache lookups by result (hit/miss)", ("result",))
+DASHBOARD_CACHE = registry.counter(
+    "dashboard_stats_requests_total", "Dashboard stats served by source (cache/snapshot/rebuild)", ("source",))
+ACTIVITY_EVENTS = registry.counter(
+    "activity_buffer_events_total", "Buffered activity events by outcome (queued/written/dropped)", ("result",))
+ACTIVITY_FLUSH_LATENCY = registry.histogram(
+    "activity_buffer_flush_seconds", "Time to write one batch of buffered activity events")
+TTS_CACHE = registry.counter(
+    "tts_audio_cache_total", "TTS audio cache lookups and evictions (hit/miss/evicted)", ("result",))
+ACTIVITY_BATCH_SIZE = registry.histogram(
+    "activity_buffer_batch_size", "Activity events per write-behind batch",
+    buckets=(1, 2, 5, 10, 25, 50, 100, 200, 500, 1000))
+
+
+def _isl_stage_collector():
+    from backend.ml.stage_timing import get_stage_timings
+    return get_stage_timings().prometheus()
+
+
+registry.add_collector("isl_stages", _isl_stage_collector)
+
+
+def instrument_model(cls):
+    """Time every static/class method of a model class as db_query_duration_seconds"""
+    for attr, member in list(vars(cls).items()):
+        if not isinstance(member, (staticmethod, classmethod)):
+            continue
+        label = f"{cls.__name__}.{attr}"
+        wrapped = _timed(member.__func__, label)
+        setattr(cls, attr, type(member)(wrapped))
+    return cls
+
+
+def _timed(func, label):
+    if getattr(func, "_metrics_label", None):
+        return func
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            DB_ERRORS.inc(label)
+            raise
+        finally:
+            DB_LATENCY.observe(time.perf_counter() - start, label)
+
+    wrapper._metrics_label = label
+    return wrapper
+
+
+def instrument_socketio(socketio):
+    """Time Socket.IO handlers per event name (all handlers go through _handle_event)"""
+    if getattr(socketio, "_metrics_instrumented", False) or not hasattr(socketio, "_handle_event"):
+        return
+    original = socketio._handle_event
+
+    def _handle_event(handler, message, namespace, sid, *args):
+        start = time.perf_counter()
+        try:
+            return original(handler, message, namespace, sid, *args)
+        finally:
+            SOCKETIO_EVENTS.inc(message)
+            SOCKETIO_LATENCY.observe(time.perf_counter() - start, message)
+
+    socketio._handle_event = _handle_event
+    socketio._metrics_instrumented = True
+
+
+def init_metrics(app):
+    """Register request timing hooks, Socket.IO instrumentation and the /metrics endpoint"""
+    if not app.config.get("METRICS_ENABLED", True):
+        return
+    from flask import g, request
+    from ..extensions import socketio
+
+    @app.before_request
+    def _start_request_timer():
+        g._metrics_start = time.perf_counter()
+
+    @app.after_request
+    def _record_request(response):
+        start = g.pop("_metrics_start", None)
+        if start is not None:
+            endpoint = request.endpoint or "unmatched"
+            HTTP_LATENCY.observe(time.perf_counter() - start, request.method, endpoint)
+            HTTP_REQUESTS.inc(request.method, endpoint, str(response.status_code))
+        return response
+
+    def metrics():
+        return app.response_class(registry.render(), mimetype="text/plain; version=0.0.4")
+
+    app.add_url_rule("/metrics", "metrics", metrics, methods=["GET"])
+    instrument_socketio(socketio)
@@ -0,0 +1,20 @@
+-- Activity rollups for the chart APIs (app/models/rollups.py)
+-- Per-user day and month buckets so charts read a bounded number of rows
+-- instead of grouping raw activity logs. Fill from history afterwards with:
+--   flask --app backend/wsgi.py backfill-rollups
+
+CREATE TABLE IF NOT EXISTS activity_rollups (
+    user_id INT NOT NULL,
+    period ENUM('day', 'month') NOT NULL,
+    period_start DATE NOT NULL,
+    activity_type VARCHAR(32) NOT NULL,
+    minutes INT NOT NULL DEFAULT 0,
+    entries INT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, period, period_start, activity_type),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+-- Completed modules per day for the weekly chart
+ALTER TABLE daily_activity_summary
+    ADD COLUMN modules_completed INT DEFAULT 0 AFTER modules_worked_on;
@@ -0,0 +1,12 @@
+-- Materialized per-user dashboard snapshot
+-- Built by RealtimeActivityService.get_user_dashboard_stats and updated in place
+-- by each activity batch (version bump), so a dashboard refresh is one primary-key read
+
+CREATE TABLE IF NOT EXISTS user_dashboard_snapshot (
+    user_id INT PRIMARY KEY,
+    snapshot JSON NULL,
+    snapshot_date DATE NULL,
+    version INT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
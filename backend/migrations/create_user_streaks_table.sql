@@ -0,0 +1,50 @@
+-- Incremental activity streaks (app/models/streaks.py)
+-- Every activity write advances the user's row in O(1); readers do one
+-- primary-key lookup instead of scanning distinct activity dates
+
+CREATE TABLE IF NOT EXISTS user_streaks (
+    user_id INT PRIMARY KEY,
+    current_streak INT NOT NULL DEFAULT 0,
+    longest_streak INT NOT NULL DEFAULT 0,
+    last_active_date DATE NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+-- One-time backfill from existing history (MySQL 8+): consecutive days form
+-- islands sharing (day - row_number); the latest island is the current run
+INSERT INTO user_streaks (user_id, current_streak, longest_streak, last_active_date)
+WITH active_days AS (
+    SELECT user_id, DATE(created_at) AS active_date FROM activity_log_realtime
+    UNION
+    SELECT user_id, activity_date FROM user_activity
+    UNION
+    SELECT user_id, DATE(last_accessed) FROM user_module_progress WHERE last_accessed IS NOT NULL
+    UNION
+    SELECT user_id, DATE(start_time) FROM learning_sessions WHERE end_time IS NOT NULL
+),
+islands AS (
+    SELECT user_id, active_date,
+           DATE_SUB(active_date, INTERVAL ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY active_date) DAY) AS island
+    FROM active_days
+),
+runs AS (
+    SELECT user_id, MAX(active_date) AS run_end, COUNT(*) AS run_length
+    FROM islands
+    GROUP BY user_id, island
+),
+ranked AS (
+    SELECT user_id, run_end, run_length,
+           ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY run_end DESC) AS recency
+    FROM runs
+)
+SELECT user_id,
+       MAX(CASE WHEN recency = 1 THEN run_length END),
+       MAX(run_length),
+       MAX(run_end)
+FROM ranked
+GROUP BY user_id
+ON DUPLICATE KEY UPDATE
+current_streak = VALUES(current_streak),
+longest_streak = GREATEST(longest_streak, VALUES(longest_streak)),
+last_active_date = VALUES(last_active_date);
@@ -15,6 +15,7 @@ import numpy as np
 import base64
 import json
 import re
+import time
 from datetime import datetime
 from collections import deque, Counter
 from PIL import Image
@@ -558,13 +559,124 @@ class WordFormationEngine:
         self.real_time_suggestions = []
 
 
+def decode_base64_frame(base64_data):
+    """Decode a base64 (optionally data-URL) image into a BGR frame, or None"""
+    if ',' in base64_data:
+        base64_data = base64_data.split(',')[1]
+    
+    img_bytes = base64.b64decode(base64_data)
+    nparr = np.frombuffer(img_bytes, np.uint8)
+    return cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+
+
+def load_isl_model(model_path="checkpoints/best.pth", device=DEVICE):
+    """Load the trained model - uses EnhancedISLModel with proper architecture"""
+    try:
+        if not os.path.exists(model_path):
+            print(f"[Enhanced ISL] Model not found at {model_path}")
+            return None
+        
+        print(f"[Enhanced ISL] Loading model from {model_path}")
+        
+        # Create EnhancedISLModel (matches training architecture)
+        model = EnhancedISLModel(NUM_CLASSES)
+        print(f"[Enhanced ISL] Created EnhancedISLModel")
+        
+        # Load checkpoint
+        checkpoint = torch.load(model_path, map_location='cpu', weights_only=False)
+        
+        # Handle different checkpoint formats
+        if isinstance(checkpoint, dict):
+            if "model_state_dict" in checkpoint:
+                state_dict = checkpoint["model_state_dict"]
+            elif "model_state" in checkpoint:
+                state_dict = checkpoint["model_state"]
+            elif "state_dict" in checkpoint:
+                state_dict = checkpoint["state_dict"]
+            else:
+                state_dict = checkpoint
+        else:
+            state_dict = checkpoint
+        
+        # Load state dict
+        model.load_state_dict(state_dict, strict=True)
+        print(f"[Enhanced ISL] Model weights loaded successfully")
+        
+        # Move to target device
+        model.to(device)
+        model.eval()
+        
+        print(f"[Enhanced ISL] Model ready on {device}")
+        return model
+        
+    except Exception as e:
+        print(f"[Enhanced ISL] Failed to load model: {e}")
+        import traceback
+        traceback.print_exc()
+        return None
+
+
+def freeze_model_for_sharing(model):
+    """Make a CPU model read-only so forked workers can share its weight pages"""
+    model.eval()
+    model.requires_grad_(False)
+    # Move parameter/buffer storage into shared memory segments
+    model.share_memory()
+    return model
+
+
+# Model loaded in the prefork master and inherited by worker processes
+_shared_model = None
+
+
+def preload_shared_model(model_path="checkpoints/best.pth"):
+    """Load and freeze the model before forking (gunicorn preload_app)
+
+    Only weights are loaded here: no MediaPipe, no warm-up inference, and a
+    single torch thread, so no thread pools exist in the master at fork time.
+    """
+    global _shared_model
+    if _shared_model is not None:
+        return True
+    if DEVICE.type != 'cpu':
+        print(f"[Enhanced ISL] Shared model preload skipped: only supported on CPU (device is {DEVICE})")
+        return False
+
+    torch.set_num_threads(1)
+    model = load_isl_model(model_path, torch.device('cpu'))
+    if model is None:
+        return False
+    _shared_model = freeze_model_for_sharing(model)
+
+    # Keep the GC from writing to (and so copying) objects created so far
+    import gc
+    gc.collect()
+    gc.freeze()
+    print(f"[Enhanced ISL] Shared model preloaded from {model_path}")
+    return True
+
+
+def get_shared_model():
+    """Return the preloaded shared model, if any"""
+    return _shared_model
+
+
 class EnhancedISLRecognizer:
     """Enhanced ISL Recognition class with improved accuracy and continuity"""
     
-    def __init__(self, model_path="checkpoints/best.pth"):
+    def __init__(self, model_path="checkpoints/best.pth", inference_pool=None,
+                 watch_interval=0, watch_pattern=None):
         self.model = None
         self.model_path = model_path
         self.device = DEVICE
+
+        # Versioned model loading with optional hot reload
+        self.model_registry = None
+        self.watch_interval = watch_interval
+        self.watch_pattern = watch_pattern
+
+        # Optional process pool - when set, detection and inference run in worker processes
+        self.inference_pool = inference_pool
         
         # Enhanced components
         self.temporal_smoother = TemporalSmoother()
@@ -578,7 +690,8 @@ class EnhancedISLRecognizer:
         
         # Hand detection and state management
         self.mp_hands = None
-        self._init_mediapipe()
+        if self.inference_pool is None:
+            self._init_mediapipe()
         
         # Simple activation state
         self.recognition_active = True  # Start active by default
@@ -595,10 +708,15 @@ class EnhancedISLRecognizer:
         # Performance metrics
         self.frame_count = 0
         self.total_processing_time = 0
+
+        # Per-stage latency histograms (shared, enabled by ISL_STAGE_TIMING)
+        from backend.ml.stage_timing import get_stage_timings
+        self.stage_timings = get_stage_timings()
         
-        # Load model
-        self._load_model()
-    
+        # Load model (workers hold their own copies in pool mode)
+        if self.inference_pool is None:
+            self._load_model()
+
     def _init_mediapipe(self):
         """Initialize MediaPipe hands detection with very low thresholds for maximum sensitivity"""
         try:
@@ -619,53 +737,32 @@ class EnhancedISLRecognizer:
             self.mp_hands = None
     
     def _load_model(self):
-        """Load the trained model - uses EnhancedISLModel with proper architecture"""
-        try:
-            model_path = "checkpoints/best.pth"
-            if not os.path.exists(model_path):
-                print(f"[Enhanced ISL] Model not found at {model_path}")
-                return False
-            
-            print(f"[Enhanced ISL] Loading model from {model_path}")
-            
-            # Create EnhancedISLModel (matches training architecture)
-            self.model = EnhancedISLModel(NUM_CLASSES)
-            print(f"[Enhanced ISL] Created EnhancedISLModel")
-            
-            # Load checkpoint
-            checkpoint = torch.load(model_path, map_location='cpu', weights_only=False)
-            
-            # Handle different checkpoint formats
-            if isinstance(checkpoint, dict):
-                if "model_state_dict" in checkpoint:
-                    state_dict = checkpoint["model_state_dict"]
-                elif "model_state" in checkpoint:
-                    state_dict = checkpoint["model_state"]
-                elif "state_dict" in checkpoint:
-                    state_dict = checkpoint["state_dict"]
-                else:
-                    state_dict = checkpoint
-            else:
-                state_dict = checkpoint
-            
-            # Load state dict
-            self.model.load_state_dict(state_dict, strict=True)
-            print(f"[Enhanced ISL] Model weights loaded successfully")
-            
-            # Move to target device
-            self.model.to(self.device)
-            self.model.eval()
-            
-            print(f"[Enhanced ISL] Model ready on {self.device}")
-            return True
-            
-        except Exception as e:
-            print(f"[Enhanced ISL] Failed to load model: {e}")
-            import traceback
-            traceback.print_exc()
-            self.model = None
-            return False
-    
+        """Load the trained model through the registry - reuses the preloaded shared model when available"""
+        from backend.ml.model_registry import ModelRegistry
+
+        self.model_registry = ModelRegistry(
+            self.model_path,
+            loader=lambda path: load_isl_model(path, self.device),
+            warmup=lambda model: self._run_dummy_batches(model, (1,), 2),
+            pattern=self.watch_pattern,
+            poll_interval=self.watch_interval
+        )
+
+        if _shared_model is not None and self.device.type == 'cpu':
+            self.model = self.model_registry.adopt(_shared_model, self.model_path, shared=True)
+            print("[Enhanced ISL] Using preloaded shared model")
+        else:
+            self.model = self.model_registry.load_initial()
+
+        # New versions replace self.model in one assignment after their warm-up
+        self.model_registry.add_listener(self._on_model_swap)
+        self.model_registry.start()
+        return self.model is not None
+
+    def _on_model_swap(self, model, info):
+        """Registry callback - publish the new model"""
+        self.model = model
+
     def _both_hands_detection(self, frame):
         """Enhanced hand detection supporting both hands for ISL with improved accuracy"""
         hand_crop, bbox = None, None
@@ -676,97 +773,20 @@ class EnhancedISLRecognizer:
         # MediaPipe hand detection
         if self.mp_hands is not None:
             try:
-                img_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                results = self.mp_hands.process(img_rgb)
-                h, w = frame.shape[:2]
+                timings = self.stage_timings
+                t0 = timings.start()
+                results = self._detect_hands(frame)
+                timings.stop('detection', t0)
+
+                t0 = timings.start()
+                hand_crop, bbox, hands_detected, hand_count, hand_landmarks_list = \
+                    self._extract_hand_regions(frame, results)
+                timings.stop('crop', t0)
                 
-                if results and results.multi_hand_landmarks:
-                    hand_count = len(results.multi_hand_landmarks)
-                    hands_detected = True
+                if hands_detected:
                     self.last_hand_detected_time = datetime.now()
                     self.no_hand_warning_count = 0
-                    
-                    # Convert MediaPipe landmarks to serializable format
-                    for hand_landmarks in results.multi_hand_landmarks:
-                        landmarks_data = []
-                        for landmark in hand_landmarks.landmark:
-                            landmarks_data.append({
-                                'x': float(landmark.x),
-                                'y': float(landmark.y),
-                                'z': float(landmark.z)
-                            })
-                        hand_landmarks_list.append(landmarks_data)
-                    
-                    # Collect all hand bounding boxes with improved accuracy
-                    all_boxes = []
-                    hand_areas = []
-                    
-                    for i, hand_landmarks in enumerate(results.multi_hand_landmarks):
-                        lm = hand_landmarks.landmark
-                        xs = [int(l.x * w) for l in lm]
-                        ys = [int(l.y * h) for l in lm]
-                        
-                        # Calculate hand size and area for better region selection
-                        hand_width = max(xs) - min(xs)
-                        hand_height = max(ys) - min(ys)
-                        hand_area = hand_width * hand_height
-                        
-                        # Enhanced adaptive padding based on hand size and position
-                        # Larger padding for smaller hands, smaller padding for larger hands
-                        base_pad_ratio = 0.4 if hand_area < 5000 else 0.3
-                        pad_x = max(int(hand_width * base_pad_ratio), 40)
-                        pad_y = max(int(hand_height * base_pad_ratio), 40)
-                        
-                        # Ensure minimum size for very small detections
-                        min_size = 80
-                        if hand_width < min_size:
-                            pad_x = max(pad_x, (min_size - hand_width) // 2)
-                        if hand_height < min_size:
-                            pad_y = max(pad_y, (min_size - hand_height) // 2)
-                        
-                        x1 = max(min(xs) - pad_x, 0)
-                        y1 = max(min(ys) - pad_y, 0)
-                        x2 = min(max(xs) + pad_x, w)
-                        y2 = min(max(ys) + pad_y, h)
-                        
-                        # Validate bounding box
-                        if x2 > x1 + 20 and y2 > y1 + 20:  # Minimum 20px size
-                            all_boxes.append((x1, y1, x2, y2))
-                            hand_areas.append(hand_area)
-                    
-                    if all_boxes:
-                        if len(all_boxes) == 1:
-                            # Single hand detected
-                            bbox = all_boxes[0]
-                            hand_crop = frame[bbox[1]:bbox[3], bbox[0]:bbox[2]]
-                        else:
-                            # Multiple hands - create optimized combined region
-                            # Sort hands by area (largest first) for better processing
-                            sorted_hands = sorted(zip(all_boxes, hand_areas), key=lambda x: x[1], reverse=True)
-                            
-                            # Take the two largest hands if more than 2 detected
-                            if len(sorted_hands) > 2:
-                                sorted_hands = sorted_hands[:2]
-                                all_boxes = [box for box, _ in sorted_hands]
-                            
-                            # Find optimal bounding box that includes both hands
-                            min_x = min(box[0] for box in all_boxes)
-                            min_y = min(box[1] for box in all_boxes)
-                            max_x = max(box[2] for box in all_boxes)
-                            max_y = max(box[3] for box in all_boxes)
-                            
-                            # Calculate distance between hands for adaptive padding
-                            hand_distance = max_x - min_x
-                            adaptive_pad = min(30, hand_distance // 10)  # Smaller padding for closer hands
-                            
-                            x1 = max(min_x - adaptive_pad, 0)
-                            y1 = max(min_y - adaptive_pad, 0)
-                            x2 = min(max_x + adaptive_pad, w)
-                            y2 = min(max_y + adaptive_pad, h)
-                            
-                            bbox = (x1, y1, x2, y2)
-                            hand_crop = frame[y1:y2, x1:x2]
-                        
+                    if bbox is not None:
                         return hand_crop, bbox, hands_detected, hand_count, hand_landmarks_list
                             
             except Exception as e:
@@ -778,12 +798,182 @@ class EnhancedISLRecognizer:
         
         return hand_crop, bbox, hands_detected, hand_count, hand_landmarks_list
     
+    def _detect_hands(self, frame):
+        """Pipeline stage: MediaPipe hand landmarks for a BGR frame"""
+        img_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        return self.mp_hands.process(img_rgb)
+    
+    def _extract_hand_regions(self, frame, results):
+        """Pipeline stage: landmarks and the hand crop/bbox from MediaPipe results"""
+        hand_crop, bbox = None, None
+        hands_detected = False
+        hand_count = 0
+        hand_landmarks_list = []
+        h, w = frame.shape[:2]
+        
+        if results and results.multi_hand_landmarks:
+            hand_count = len(results.multi_hand_landmarks)
+            hands_detected = True
+            
+            # Convert MediaPipe landmarks to serializable format
+            for hand_landmarks in results.multi_hand_landmarks:
+                landmarks_data = []
+                for landmark in hand_landmarks.landmark:
+                    landmarks_data.append({
+                        'x': float(landmark.x),
+                        'y': float(landmark.y),
+                        'z': float(landmark.z)
+                    })
+                hand_landmarks_list.append(landmarks_data)
+            
+            # Collect all hand bounding boxes with improved accuracy
+            all_boxes = []
+            hand_areas = []
+            
+            for i, hand_landmarks in enumerate(results.multi_hand_landmarks):
+                lm = hand_landmarks.landmark
+                xs = [int(l.x * w) for l in lm]
+                ys = [int(l.y * h) for l in lm]
+                
+                # Calculate hand size and area for better region selection
+                hand_width = max(xs) - min(xs)
+                hand_height = max(ys) - min(ys)
+                hand_area = hand_width * hand_height
+                
+                # Enhanced adaptive padding based on hand size and position
+                # Larger padding for smaller hands, smaller padding for larger hands
+                base_pad_ratio = 0.4 if hand_area < 5000 else 0.3
+                pad_x = max(int(hand_width * base_pad_ratio), 40)
+                pad_y = max(int(hand_height * base_pad_ratio), 40)
+                
+                # Ensure minimum size for very small detections
+                min_size = 80
+                if hand_width < min_size:
+                    pad_x = max(pad_x, (min_size - hand_width) // 2)
+                if hand_height < min_size:
+                    pad_y = max(pad_y, (min_size - hand_height) // 2)
+                
+                x1 = max(min(xs) - pad_x, 0)
+                y1 = max(min(ys) - pad_y, 0)
+                x2 = min(max(xs) + pad_x, w)
+                y2 = min(max(ys) + pad_y, h)
+                
+                # Validate bounding box
+                if x2 > x1 + 20 and y2 > y1 + 20:  # Minimum 20px size
+                    all_boxes.append((x1, y1, x2, y2))
+                    hand_areas.append(hand_area)
+            
+            if all_boxes:
+                if len(all_boxes) == 1:
+                    # Single hand detected
+                    bbox = all_boxes[0]
+                    hand_crop = frame[bbox[1]:bbox[3], bbox[0]:bbox[2]]
+                else:
+                    # Multiple hands - create optimized combined region
+                    # Sort hands by area (largest first) for better processing
+                    sorted_hands = sorted(zip(all_boxes, hand_areas), key=lambda x: x[1], reverse=True)
+                    
+                    # Take the two largest hands if more than 2 detected
+                    if len(sorted_hands) > 2:
+                        sorted_hands = sorted_hands[:2]
+                        all_boxes = [box for box, _ in sorted_hands]
+                    
+                    # Find optimal bounding box that includes both hands
+                    min_x = min(box[0] for box in all_boxes)
+                    min_y = min(box[1] for box in all_boxes)
+                    max_x = max(box[2] for box in all_boxes)
+                    max_y = max(box[3] for box in all_boxes)
+                    
+                    # Calculate distance between hands for adaptive padding
+                    hand_distance = max_x - min_x
+                    adaptive_pad = min(30, hand_distance // 10)  # Smaller padding for closer hands
+                    
+                    x1 = max(min_x - adaptive_pad, 0)
+                    y1 = max(min_y - adaptive_pad, 0)
+                    x2 = min(max_x + adaptive_pad, w)
+                    y2 = min(max_y + adaptive_pad, h)
+                    
+                    bbox = (x1, y1, x2, y2)
+                    hand_crop = frame[y1:y2, x1:x2]
+        
+        return hand_crop, bbox, hands_detected, hand_count, hand_landmarks_list
+    
+    def warm_up(self, batch_sizes=(1,), iterations=3, pool_timeout=120.0):
+        """Run dummy frames/batches so first-inference costs are paid before real requests"""
+        if self.inference_pool is not None:
+            # Workers warm themselves up before reporting ready
+            deadline = time.perf_counter() + pool_timeout
+            while not self.inference_pool.is_ready() and time.perf_counter() < deadline:
+                time.sleep(0.25)
+            return {'inference_pool': self.inference_pool.get_stats()}
+
+        timings = {'mediapipe_ms': None, 'batches': {}}
+
+        if self.mp_hands is not None:
+            blank = np.zeros((480, 640, 3), dtype=np.uint8)
+            start = time.perf_counter()
+            self.mp_hands.process(cv2.cvtColor(blank, cv2.COLOR_BGR2RGB))
+            timings['mediapipe_ms'] = round((time.perf_counter() - start) * 1000, 2)
+
+        if self.model is not None:
+            timings['batches'] = self._run_dummy_batches(self.model, batch_sizes, iterations)
+
+        return timings
+
+    def _run_dummy_batches(self, model, batch_sizes, iterations):
+        """Time dummy forward passes at each batch size"""
+        batches = {}
+        with torch.no_grad():
+            for batch_size in batch_sizes:
+                dummy = torch.zeros(batch_size, 3, IMG_SIZE, IMG_SIZE, device=self.device)
+                runs = []
+                for _ in range(max(int(iterations), 1)):
+                    start = time.perf_counter()
+                    F.softmax(model(dummy), dim=1).cpu()
+                    runs.append((time.perf_counter() - start) * 1000)
+                batches[str(batch_size)] = {
+                    'first_ms': round(runs[0], 2),
+                    'steady_ms': round(min(runs[1:] or runs), 2)
+                }
+        return batches
+
+    def _predict_via_pool(self, frame):
+        """Run detection and inference in a worker process, keep hand state locally"""
+        start_time = time.perf_counter()
+
+        t0 = self.stage_timings.start()
+        prediction = self.inference_pool.predict(frame)
+        self.stage_timings.stop('inference_pool', t0)
+        if prediction is None:
+            return None, 0.0, None, False, 0, []
+
+        letter, confidence, bbox, hands_detected, hand_count, hand_landmarks_list = prediction
+
+        # Mirror the hand tracking state normally kept by _both_hands_detection
+        if hands_detected:
+            self.last_hand_detected_time = datetime.now()
+            self.no_hand_warning_count = 0
+        else:
+            self.no_hand_warning_count += 1
+
+        if letter is not None:
+            self.frame_count += 1
+            self.total_processing_time += time.perf_counter() - start_time
+
+        return letter, confidence, bbox, hands_detected, hand_count, hand_landmarks_list
+
     def _predict_single_frame(self, frame):
         """Optimized prediction on single frame for maximum performance"""
-        if self.model is None:
+        if self.inference_pool is not None:
+            return self._predict_via_pool(frame)
+
+        # One reference per frame, so a hot swap never changes models mid-prediction
+        model = self.model
+        if model is None:
             return None, 0.0, None, False, 0, []
         
-        start_time = datetime.now()
+        start_time = time.perf_counter()
+        timings = self.stage_timings
         
         try:
             # Quick frame validation
@@ -794,65 +984,25 @@ class EnhancedISLRecognizer:
             hand_crop, bbox, hands_detected, hand_count, hand_landmarks_list = self._both_hands_detection(frame)
             
             # SINGLE PROCESSING PATH - choose best input source
-            input_image = None
-            
-            if hand_crop is not None and hand_crop.size > 0 and len(hand_crop.shape) == 3:
-                # Use hand crop (faster, more accurate)
-                try:
-                    crop_rgb = cv2.cvtColor(hand_crop, cv2.COLOR_BGR2RGB)
-                    input_image = Image.fromarray(crop_rgb, mode='RGB')
-                except Exception:
-                    input_image = None
-            
-            # Fallback to full frame if no valid hand crop
-            if input_image is None:
-                try:
-                    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                    input_image = Image.fromarray(frame_rgb, mode='RGB')
-                except Exception:
-                    return None, 0.0, None, False, 0, []
+            t0 = timings.start()
+            img_tensor = self._prepare_input(frame, hand_crop)
+            timings.stop('preprocess', t0)
+            if img_tensor is None:
+                return None, 0.0, None, False, 0, []
             
             # SINGLE model inference (optimized for speed)
             try:
-                img_tensor = inference_transform(input_image).unsqueeze(0).to(self.device)
-                
-                with torch.no_grad():
-                    output = self.model(img_tensor)
-                    probs = F.softmax(output, dim=1).cpu().numpy()[0]
-                
+                t0 = timings.start()
+                probs = self._run_model(model, img_tensor)
+                timings.stop('inference', t0)
             except Exception as e:
                 print(f"[Enhanced ISL] Model inference error: {e}")
                 return None, 0.0, None, False, 0, []
             
-            # Enhanced prediction with confidence boosting
-            idx = int(np.argmax(probs))
-            raw_confidence = float(probs[idx])
-            letter = CLASSES[idx]
-            
-            # Apply confidence boosting for better accuracy
-            sorted_probs = np.sort(probs)[::-1]
-            if len(sorted_probs) > 1:
-                margin = sorted_probs[0] - sorted_probs[1]
-                if margin > 0.2:  # Clear winner
-                    confidence = min(raw_confidence * 1.1, 1.0)  # Boost by 10%
-                elif margin > 0.1:  # Moderate winner
-                    confidence = min(raw_confidence * 1.05, 1.0)  # Boost by 5%
-                else:
-                    confidence = raw_confidence  # No boost for unclear predictions
-            else:
-                confidence = raw_confidence
-            
-            # Apply class-specific confidence adjustments
-            if letter.isdigit():
-                confidence = min(confidence * 1.05, 1.0)  # Slight boost for numbers
-            
-            # Common letters that are often confused - be more conservative
-            confused_letters = ['M', 'N', 'S', 'T']
-            if letter in confused_letters:
-                confidence = confidence * 0.95  # Slight penalty for commonly confused letters
+            letter, confidence = self._score_prediction(probs)
             
             # Update performance metrics
-            processing_time = (datetime.now() - start_time).total_seconds()
+            processing_time = time.perf_counter() - start_time
             self.frame_count += 1
             self.total_processing_time += processing_time
             
@@ -862,6 +1012,65 @@ class EnhancedISLRecognizer:
             print(f"[Enhanced ISL] Prediction error: {e}")
             return None, 0.0, None, False, 0, []
     
+    def _prepare_input(self, frame, hand_crop=None):
+        """Pipeline stage: model input tensor from the hand crop, or the full frame as fallback"""
+        input_image = None
+        
+        if hand_crop is not None and hand_crop.size > 0 and len(hand_crop.shape) == 3:
+            # Use hand crop (faster, more accurate)
+            try:
+                crop_rgb = cv2.cvtColor(hand_crop, cv2.COLOR_BGR2RGB)
+                input_image = Image.fromarray(crop_rgb, mode='RGB')
+            except Exception:
+                input_image = None
+        
+        # Fallback to full frame if no valid hand crop
+        if input_image is None:
+            try:
+                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                input_image = Image.fromarray(frame_rgb, mode='RGB')
+            except Exception:
+                return None
+        
+        return inference_transform(input_image).unsqueeze(0).to(self.device)
+    
+    def _run_model(self, model, img_tensor):
+        """Pipeline stage: class probabilities for one input tensor"""
+        with torch.no_grad():
+            output = model(img_tensor)
+            return F.softmax(output, dim=1).cpu().numpy()[0]
+    
+    def _score_prediction(self, probs):
+        """Pipeline stage: top letter with confidence boosting and class adjustments"""
+        # Enhanced prediction with confidence boosting
+        idx = int(np.argmax(probs))
+        raw_confidence = float(probs[idx])
+        letter = CLASSES[idx]
+        
+        # Apply confidence boosting for better accuracy
+        sorted_probs = np.sort(probs)[::-1]
+        if len(sorted_probs) > 1:
+            margin = sorted_probs[0] - sorted_probs[1]
+            if margin > 0.2:  # Clear winner
+                confidence = min(raw_confidence * 1.1, 1.0)  # Boost by 10%
+            elif margin > 0.1:  # Moderate winner
+                confidence = min(raw_confidence * 1.05, 1.0)  # Boost by 5%
+            else:
+                confidence = raw_confidence  # No boost for unclear predictions
+        else:
+            confidence = raw_confidence
+        
+        # Apply class-specific confidence adjustments
+        if letter.isdigit():
+            confidence = min(confidence * 1.05, 1.0)  # Slight boost for numbers
+        
+        # Common letters that are often confused - be more conservative
+        confused_letters = ['M', 'N', 'S', 'T']
+        if letter in confused_letters:
+            confidence = confidence * 0.95  # Slight penalty for commonly confused letters
+        
+        return letter, confidence
+    
     def get_enhanced_prediction(self, frame):
         """Get enhanced prediction with temporal smoothing and word formation"""
         current_time = datetime.now()
@@ -937,11 +1146,15 @@ class EnhancedISLRecognizer:
                     'avg_processing_time': round(self.total_processing_time / max(self.frame_count, 1), 4)
                 }
         
+        timings = self.stage_timings
+
         # Add to temporal smoother
+        t0 = timings.start()
         self.temporal_smoother.add_prediction(letter, confidence)
         
         # Get smoothed prediction
         smoothed_letter, smoothed_confidence = self.temporal_smoother.get_smoothed_prediction()
+        timings.stop('smoothing', t0)
         
         # Check for stability
         is_stable = False
@@ -969,14 +1182,17 @@ class EnhancedISLRecognizer:
                 })
         
         # Get enhanced spell checking information
+        t0 = timings.start()
         current_word = self.word_engine.get_current_word()
         spell_check_info = self.word_engine.get_spell_check_info()
         word_suggestions = spell_check_info['suggestions']
+        timings.stop('spell_check', t0)
         
         # Get translations if text is available
         current_text = self.word_engine.get_sentence()
         translations = {}
         if current_text and len(current_text.strip()) > 0:
+            t0 = timings.start()
             try:
                 from backend.app.services.translation_service import get_translation_service
                 translation_service = get_translation_service()
@@ -997,6 +1213,7 @@ class EnhancedISLRecognizer:
                     'roman_hindi': current_text,
                     'english': current_text
                 }
+            timings.stop('translation', t0)
 
         return {
             'letter': smoothed_letter,
@@ -1025,13 +1242,12 @@ class EnhancedISLRecognizer:
             if not base64_data:
                 return {'error': 'No image data provided'}
             
+            timings = self.stage_timings
+            started = timings.start()
+
             # Decode image
-            if ',' in base64_data:
-                base64_data = base64_data.split(',')[1]
-            
-            img_bytes = base64.b64decode(base64_data)
-            nparr = np.frombuffer(img_bytes, np.uint8)
-            frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+            frame = decode_base64_frame(base64_data)
+            timings.stop('decode', started)
             
             if frame is None:
                 return {'error': 'Failed to decode image - invalid format'}
@@ -1045,6 +1261,7 @@ class EnhancedISLRecognizer:
             
             # Get enhanced prediction
             result = self.get_enhanced_prediction(frame)
+            timings.stop('total', started)
             return result
             
         except Exception as e:
@@ -1129,13 +1346,23 @@ class EnhancedISLRecognizer:
     
     def get_model_info(self):
         """Get enhanced model information"""
+        pool_stats = self.inference_pool.get_stats() if self.inference_pool is not None else None
+        if pool_stats is not None:
+            model_loaded = self.inference_pool.is_ready()
+            mediapipe_available = pool_stats['mediapipe_available']
+        else:
+            model_loaded = self.model is not None
+            mediapipe_available = self.mp_hands is not None
+
         return {
-            'model_loaded': self.model is not None,
+            'model_loaded': model_loaded,
             'model_path': self.model_path,
+            'model_version': self.model_registry.get_info() if self.model_registry is not None else None,
             'device': str(self.device),
             'num_classes': NUM_CLASSES,
             'classes': CLASSES,
-            'mediapipe_available': self.mp_hands is not None,
+            'mediapipe_available': mediapipe_available,
+            'inference_pool': pool_stats,
             'enhanced_features': True,
             'temporal_smoothing': True,
             'word_formation': True,
@@ -1156,12 +1383,18 @@ _enhanced_recognizer = None
 _enhanced_recognizer_lock = Lock()
 
 
-def get_enhanced_recognizer():
+def get_enhanced_recognizer(model_path="checkpoints/best.pth", inference_pool=None,
+                            watch_interval=0, watch_pattern=None):
     """Get or create the global enhanced ISL recognizer instance"""
     global _enhanced_recognizer
     with _enhanced_recognizer_lock:
         if _enhanced_recognizer is None:
-            _enhanced_recognizer = EnhancedISLRecognizer()
+            _enhanced_recognizer = EnhancedISLRecognizer(
+                model_path=model_path,
+                inference_pool=inference_pool,
+                watch_interval=watch_interval,
+                watch_pattern=watch_pattern
+            )
         return _enhanced_recognizer
 
 
@@ -1180,4 +1413,4 @@ def get_recognizer():
 
 def reset_recognizer():
     """Reset recognizer (enhanced by default)"""
-    return reset_enhanced_recognizer()
\ No newline at end of file
+    return reset_enhanced_recognizer()
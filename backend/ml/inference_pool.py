@@ -0,0 +1,292 @@
+"""
+Process-pool inference workers for ISL recognition
+- Each worker process holds its own model copy and MediaPipe instance
+- Per-worker torch thread count is tuned with torch.set_num_threads
+- Frames reach the workers through shared-memory slots, never pickled arrays
+- The web process only decodes frames and keeps the stateful text pipeline
+"""
+
+import atexit
+import itertools
+import multiprocessing as mp
+import queue
+from concurrent.futures import Future
+from threading import Lock, Thread
+
+from backend.ml.shared_frames import FrameSlotPool, pack_result, unpack_result
+
+# Largest frame a slot can hold; bigger frames are downscaled into the slot
+DEFAULT_MAX_FRAME_SHAPE = (720, 1280, 3)
+DEFAULT_TIMEOUT = 2.0
+
+# Marks a worker with no frame in progress in the shared busy table
+_IDLE = -1
+
+
+def _worker_main(worker_id, slots_name, num_slots, frame_shape, task_queue, result_queue,
+                 busy_table, num_threads, model_path):
+    """Inference worker loop - runs in a spawned process"""
+    import torch
+    torch.set_num_threads(max(int(num_threads), 1))
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass  # Already set by an earlier parallel call
+
+    from backend.ml.enhanced_isl_recognition import EnhancedISLRecognizer
+
+    slots = FrameSlotPool.attach(slots_name, num_slots, frame_shape)
+
+    recognizer = EnhancedISLRecognizer(model_path=model_path)
+    try:
+        warmup = recognizer.warm_up()
+    except Exception as e:
+        print(f"[ISL Pool] Worker {worker_id} warm-up failed: {e}")
+        warmup = None
+    result_queue.put(('ready', worker_id, {
+        'model_loaded': recognizer.model is not None,
+        'mediapipe_available': recognizer.mp_hands is not None,
+        'num_threads': torch.get_num_threads(),
+        'warmup': warmup
+    }))
+
+    try:
+        while True:
+            task = task_queue.get()
+            if task is None:
+                break
+
+            request_id, slot, height, width = task
+            busy_table[worker_id] = request_id
+            # Zero-copy view over the shared slot
+            frame = slots.frame_view(slot, height, width)
+            try:
+                packed = pack_result(recognizer._predict_single_frame(frame))
+            except Exception as e:
+                print(f"[ISL Pool] Worker {worker_id} prediction error: {e}")
+                packed = None
+            frame = None
+            busy_table[worker_id] = _IDLE
+            result_queue.put(('result', worker_id, (request_id, packed)))
+    finally:
+        slots.close()
+
+
+class InferencePool:
+    """Pool of ISL inference worker processes fed through shared-memory frame slots"""
+
+    def __init__(self, num_workers=2, threads_per_worker=1, model_path="checkpoints/best.pth",
+                 max_frame_shape=DEFAULT_MAX_FRAME_SHAPE, timeout=DEFAULT_TIMEOUT, num_slots=None):
+        self.num_workers = max(int(num_workers), 1)
+        self.threads_per_worker = max(int(threads_per_worker), 1)
+        self.model_path = model_path
+        self.max_frame_shape = tuple(max_frame_shape)
+        self.timeout = timeout
+        # Two slots per worker: one being inferred, one being written
+        self.num_slots = int(num_slots) if num_slots else self.num_workers * 2
+
+        # Spawn keeps CUDA/OpenMP/MediaPipe state out of the children
+        self._ctx = mp.get_context("spawn")
+        self._task_queue = self._ctx.Queue()
+        self._result_queue = self._ctx.Queue()
+        self._busy_table = self._ctx.Array('q', [_IDLE] * self.num_workers, lock=False)
+        self._slots = None
+        self._workers = {}
+        self._pending = {}
+        self._pending_lock = Lock()
+        self._request_ids = itertools.count(1)
+        self._running = False
+
+        # Stats
+        self.frames_submitted = 0
+        self.frames_completed = 0
+        self.frames_dropped = 0
+
+    def start(self):
+        """Create frame slots, start worker processes and the result listener"""
+        if self._running:
+            return self
+        self._running = True
+        self._slots = FrameSlotPool(num_slots=self.num_slots, frame_shape=self.max_frame_shape)
+        for worker_id in range(self.num_workers):
+            self._spawn_worker(worker_id)
+
+        self._listener = Thread(target=self._listen_results, name="isl-pool-results", daemon=True)
+        self._listener.start()
+        atexit.register(self.shutdown)
+        print(f"[ISL Pool] Started {self.num_workers} inference workers "
+              f"({self.threads_per_worker} torch threads each, {self.num_slots} frame slots)")
+        return self
+
+    def _spawn_worker(self, worker_id):
+        """Start one worker process attached to the shared frame slots"""
+        self._busy_table[worker_id] = _IDLE
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(worker_id, self._slots.name, self.num_slots, self.max_frame_shape,
+                  self._task_queue, self._result_queue, self._busy_table,
+                  self.threads_per_worker, self.model_path),
+            name=f"isl-inference-{worker_id}",
+            daemon=True
+        )
+        process.start()
+        self._workers[worker_id] = {
+            'process': process,
+            'ready': False,
+            'info': {}
+        }
+
+    def _listen_results(self):
+        """Resolve futures as worker results arrive; respawn dead workers"""
+        while self._running:
+            try:
+                kind, worker_id, payload = self._result_queue.get(timeout=1.0)
+            except queue.Empty:
+                self._check_workers()
+                continue
+            except (EOFError, OSError):
+                break
+
+            worker = self._workers.get(worker_id)
+            if worker is None:
+                continue
+
+            if kind == 'ready':
+                worker['ready'] = True
+                worker['info'] = payload
+                print(f"[ISL Pool] Worker {worker_id} ready: {payload}")
+            elif kind == 'result':
+                request_id, packed = payload
+                self._complete(request_id, unpack_result(packed) if packed else None)
+
+    def _complete(self, request_id, prediction):
+        """Free the request's slot and resolve its future"""
+        with self._pending_lock:
+            entry = self._pending.pop(request_id, None)
+        if entry is None:
+            return
+        future, slot = entry
+        self._slots.release(slot)
+        if not future.done():
+            self.frames_completed += 1
+            future.set_result(prediction)
+
+    def _check_workers(self):
+        """Restart any worker whose process died, failing the frame it held"""
+        for worker_id, worker in list(self._workers.items()):
+            if worker['process'].is_alive() or not self._running:
+                continue
+            print(f"[ISL Pool] Worker {worker_id} exited (code {worker['process'].exitcode}), restarting")
+            request_id = self._busy_table[worker_id]
+            if request_id != _IDLE:
+                self._complete(request_id, None)
+            self._spawn_worker(worker_id)
+
+    def submit(self, frame):
+        """Write a decoded BGR frame into a free slot; returns a Future or None when no slot is free"""
+        if not self._running:
+            return None
+
+        # Backpressure: every slot is queued or in flight, drop this frame now
+        # rather than waiting for one (the caller still waits for the result)
+        slot = self._slots.acquire()
+        if slot is None:
+            self.frames_dropped += 1
+            return None
+
+        try:
+            height, width = self._slots.write(slot, frame)
+        except Exception:
+            self._slots.release(slot)
+            raise
+
+        request_id = next(self._request_ids)
+        future = Future()
+        with self._pending_lock:
+            self._pending[request_id] = (future, slot)
+        self._task_queue.put((request_id, slot, height, width))
+        self.frames_submitted += 1
+        return future
+
+    def predict(self, frame, timeout=None):
+        """Blocking prediction; returns the _predict_single_frame tuple or None"""
+        timeout = self.timeout if timeout is None else timeout
+        future = self.submit(frame)
+        if future is None:
+            return None
+        try:
+            return future.result(timeout=timeout)
+        except Exception:
+            return None
+
+    def is_ready(self):
+        """True when at least one worker has loaded its model"""
+        return any(w['ready'] and w['info'].get('model_loaded') for w in self._workers.values())
+
+    def get_stats(self):
+        """Pool statistics for diagnostics"""
+        stats = {
+            'workers': self.num_workers,
+            'threads_per_worker': self.threads_per_worker,
+            'ready_workers': sum(1 for w in self._workers.values() if w['ready']),
+            'busy_workers': sum(1 for i in range(self.num_workers) if self._busy_table[i] != _IDLE),
+            'frames_submitted': self.frames_submitted,
+            'frames_completed': self.frames_completed,
+            'frames_dropped': self.frames_dropped,
+            'mediapipe_available': any(w['info'].get('mediapipe_available') for w in self._workers.values()),
+            'worker_warmup': {worker_id: w['info'].get('warmup') for worker_id, w in self._workers.items()}
+        }
+        if self._slots is not None:
+            stats['frame_slots'] = self._slots.get_stats()
+        return stats
+
+    def shutdown(self):
+        """Stop workers and free shared memory"""
+        if not self._running:
+            return
+        self._running = False
+        for _ in self._workers:
+            try:
+                self._task_queue.put(None)
+            except Exception:
+                pass
+        for worker in self._workers.values():
+            worker['process'].join(timeout=5)
+            if worker['process'].is_alive():
+                worker['process'].terminate()
+        with self._pending_lock:
+            for future, _ in self._pending.values():
+                if not future.done():
+                    future.set_result(None)
+            self._pending.clear()
+        self._slots.close()
+
+
+# Global pool instance
+_inference_pool = None
+_inference_pool_lock = Lock()
+
+
+def get_inference_pool(num_workers=2, threads_per_worker=1, model_path="checkpoints/best.pth",
+                       timeout=DEFAULT_TIMEOUT, num_slots=None):
+    """Get or start the global inference pool"""
+    global _inference_pool
+    with _inference_pool_lock:
+        if _inference_pool is None:
+            _inference_pool = InferencePool(
+                num_workers=num_workers,
+                threads_per_worker=threads_per_worker,
+                model_path=model_path,
+                timeout=timeout,
+                num_slots=num_slots
+            ).start()
+        return _inference_pool
+
+
+def shutdown_inference_pool():
+    """Shut down the global inference pool"""
+    global _inference_pool
+    with _inference_pool_lock:
+        if _inference_pool is not None:
+            _inference_pool.shutdown()
+            _inference_pool = None
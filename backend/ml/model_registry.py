@@ -0,0 +1,193 @@
+"""
+Hot-reloadable ISL model registry
+- Model versions are checkpoint files, identified by a content hash
+- A watcher thread loads and warms up new checkpoints in the background
+- The active model is swapped atomically only after warm-up; in-flight
+  predictions keep the model reference they started with
+"""
+
+import glob
+import hashlib
+import os
+import threading
+import time
+from datetime import datetime
+
+
+def checkpoint_version(path, chunk_size=1024 * 1024):
+    """Short content hash used as the version id of a checkpoint file"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+
+def _file_signature(path):
+    """(path, mtime, size) - cheap change detection without hashing"""
+    stat = os.stat(path)
+    return (path, stat.st_mtime_ns, stat.st_size)
+
+
+class ModelRegistry:
+    """Tracks the active model version and hot-swaps in new checkpoints"""
+
+    def __init__(self, model_path, loader, warmup=None, pattern=None, poll_interval=0):
+        """
+        Args:
+            model_path: Checkpoint loaded at startup
+            loader: callable(path) -> model or None
+            warmup: optional callable(model) -> dict of timings, run before a swap
+            pattern: optional glob (e.g. "best*.pth") in the checkpoint directory;
+                     the newest match becomes the next version. Default: model_path only
+            poll_interval: seconds between directory scans (0 disables watching)
+        """
+        self.model_path = model_path
+        self.watch_dir = os.path.dirname(os.path.abspath(model_path))
+        self.pattern = pattern
+        self.poll_interval = poll_interval
+        self._loader = loader
+        self._warmup = warmup
+
+        self.model = None
+        self._info = {}
+        self._signature = None
+        self._pending_signature = None
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.reload_count = 0
+        self.last_error = None
+
+    def load_initial(self):
+        """Synchronously load model_path as the first version"""
+        if not os.path.exists(self.model_path):
+            print(f"[Model Registry] Model not found at {self.model_path}")
+            return None
+        model, info = self._load_version(self.model_path, warm_up=False)
+        if model is not None:
+            self._activate(model, info, _file_signature(self.model_path))
+        return model
+
+    def adopt(self, model, path, shared=False):
+        """Register a model that was loaded elsewhere (e.g. the prefork shared model)"""
+        info = {
+            'version': checkpoint_version(path) if os.path.exists(path) else None,
+            'path': path,
+            'loaded_at': datetime.now().isoformat(),
+            'load_ms': 0.0,
+            'warmup_ms': None,
+            'shared': shared
+        }
+        signature = _file_signature(path) if os.path.exists(path) else None
+        self._activate(model, info, signature)
+        return model
+
+    def add_listener(self, callback):
+        """callback(model, info) is called after each swap"""
+        self._listeners.append(callback)
+
+    def start(self):
+        """Start watching for new checkpoints"""
+        if self.poll_interval <= 0 or self._thread is not None:
+            return self
+        self._thread = threading.Thread(target=self._watch, name="isl-model-registry", daemon=True)
+        self._thread.start()
+        print(f"[Model Registry] Watching {self.watch_dir} every {self.poll_interval}s")
+        return self
+
+    def stop(self):
+        """Stop the watcher thread"""
+        self._stop.set()
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.check_for_update()
+            except Exception as e:
+                self.last_error = str(e)
+                print(f"[Model Registry] Update check failed: {e}")
+
+    def _latest_checkpoint(self):
+        """Newest candidate checkpoint path, or None"""
+        if self.pattern:
+            candidates = glob.glob(os.path.join(self.watch_dir, self.pattern))
+            return max(candidates, key=os.path.getmtime) if candidates else None
+        return self.model_path if os.path.exists(self.model_path) else None
+
+    def check_for_update(self, force=False):
+        """Load, warm up and swap in a changed checkpoint; returns True on swap"""
+        path = self._latest_checkpoint()
+        if path is None:
+            return False
+
+        signature = _file_signature(path)
+        if signature == self._signature and not force:
+            return False
+
+        # A file still being written keeps changing; wait until it is stable for one poll
+        if signature != self._pending_signature and not force:
+            self._pending_signature = signature
+            return False
+
+        model, info = self._load_version(path, warm_up=True)
+        if model is None:
+            self._signature = signature  # Do not retry a broken file until it changes again
+            return False
+
+        previous = self._info.get('version')
+        info['previous_version'] = previous
+        self._activate(model, info, signature)
+        self.reload_count += 1
+        print(f"[Model Registry] Swapped model {previous} -> {info['version']} "
+              f"(load {info['load_ms']} ms, warm-up {info['warmup_ms']} ms)")
+        return True
+
+    def _load_version(self, path, warm_up):
+        """Load (and optionally warm up) a checkpoint without touching the active model"""
+        start = time.perf_counter()
+        model = self._loader(path)
+        load_ms = round((time.perf_counter() - start) * 1000, 2)
+        if model is None:
+            self.last_error = f"Failed to load {path}"
+            return None, None
+
+        warmup_ms = None
+        if warm_up and self._warmup is not None:
+            start = time.perf_counter()
+            self._warmup(model)
+            warmup_ms = round((time.perf_counter() - start) * 1000, 2)
+
+        return model, {
+            'version': checkpoint_version(path),
+            'path': path,
+            'loaded_at': datetime.now().isoformat(),
+            'load_ms': load_ms,
+            'warmup_ms': warmup_ms,
+            'shared': False
+        }
+
+    def _activate(self, model, info, signature):
+        """Atomically publish a new active model"""
+        with self._lock:
+            self.model = model
+            self._info = info
+            self._signature = signature
+            self._pending_signature = None
+        for callback in self._listeners:
+            try:
+                callback(model, info)
+            except Exception as e:
+                print(f"[Model Registry] Swap listener error: {e}")
+
+    def get_info(self):
+        """Active version details for get_model_info()"""
+        return {
+            **self._info,
+            'watching': self._thread is not None and not self._stop.is_set(),
+            'poll_interval': self.poll_interval,
+            'reload_count': self.reload_count,
+            'last_error': self.last_error
+        }
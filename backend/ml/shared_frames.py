@@ -0,0 +1,169 @@
+"""
+Shared-memory frame slots for the ISL inference workers
+- One SharedMemory block split into fixed-size frame slots
+- A small free-index queue hands out slots; the web process writes in place
+- Workers read the slot zero-copy and reply with a packed result struct
+- Slot exhaustion is reported to the caller so frames can be dropped early
+"""
+
+import queue
+import struct
+from multiprocessing import shared_memory
+from threading import Lock
+
+import numpy as np
+
+# Hands and landmarks carried in a packed result (matches MediaPipe max_num_hands)
+MAX_HANDS = 2
+LANDMARKS_PER_HAND = 21
+
+# letter, confidence, has_bbox, hands_detected, hand_count, landmark_hands, bbox
+_RESULT_HEADER = struct.Struct("<1sf??BB4i")
+_RESULT_LANDMARKS = struct.Struct(f"<{MAX_HANDS * LANDMARKS_PER_HAND * 3}f")
+RESULT_SIZE = _RESULT_HEADER.size + _RESULT_LANDMARKS.size
+
+
+def pack_result(prediction):
+    """Pack a _predict_single_frame tuple into a fixed-size bytes record"""
+    letter, confidence, bbox, hands_detected, hand_count, hand_landmarks_list = prediction
+
+    hands = (hand_landmarks_list or [])[:MAX_HANDS]
+    coords = [0.0] * (MAX_HANDS * LANDMARKS_PER_HAND * 3)
+    for h, landmarks in enumerate(hands):
+        for i, point in enumerate(landmarks[:LANDMARKS_PER_HAND]):
+            base = (h * LANDMARKS_PER_HAND + i) * 3
+            coords[base:base + 3] = (point['x'], point['y'], point['z'])
+
+    header = _RESULT_HEADER.pack(
+        letter.encode('ascii') if letter else b'\x00',
+        float(confidence or 0.0),
+        bbox is not None,
+        bool(hands_detected),
+        int(hand_count or 0),
+        len(hands),
+        *(tuple(int(v) for v in bbox) if bbox is not None else (0, 0, 0, 0))
+    )
+    return header + _RESULT_LANDMARKS.pack(*coords)
+
+
+def unpack_result(data):
+    """Unpack a record produced by pack_result back into the prediction tuple"""
+    letter, confidence, has_bbox, hands_detected, hand_count, landmark_hands, *bbox = \
+        _RESULT_HEADER.unpack_from(data)
+    coords = _RESULT_LANDMARKS.unpack_from(data, _RESULT_HEADER.size)
+
+    hand_landmarks_list = []
+    for h in range(landmark_hands):
+        base = h * LANDMARKS_PER_HAND * 3
+        hand_landmarks_list.append([
+            {'x': coords[base + i], 'y': coords[base + i + 1], 'z': coords[base + i + 2]}
+            for i in range(0, LANDMARKS_PER_HAND * 3, 3)
+        ])
+
+    return (
+        letter.decode('ascii') if letter != b'\x00' else None,
+        confidence,
+        tuple(bbox) if has_bbox else None,
+        hands_detected,
+        hand_count,
+        hand_landmarks_list
+    )
+
+
+class FrameSlotPool:
+    """Fixed-size BGR frame slots in a single shared-memory block"""
+
+    def __init__(self, num_slots=4, frame_shape=(480, 640, 3), name=None):
+        self.num_slots = max(int(num_slots), 1)
+        self.frame_shape = tuple(frame_shape)
+        self.slot_size = int(np.prod(self.frame_shape))
+        self._owner = name is None
+
+        if self._owner:
+            self._shm = shared_memory.SharedMemory(create=True, size=self.slot_size * self.num_slots)
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+        self._slots = np.ndarray((self.num_slots, self.slot_size), dtype=np.uint8, buffer=self._shm.buf)
+
+        # Free-index queue is only used by the owning (web) process
+        self._free = queue.Queue()
+        for slot in range(self.num_slots):
+            self._free.put(slot)
+
+        self._stats_lock = Lock()
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.acquired = 0
+        self.rejected = 0
+
+    @classmethod
+    def attach(cls, name, num_slots, frame_shape):
+        """Attach to a pool created by another process"""
+        return cls(num_slots=num_slots, frame_shape=frame_shape, name=name)
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    def acquire(self, timeout=0.0):
+        """Reserve a free slot; returns its index or None when all slots are busy"""
+        try:
+            slot = self._free.get(timeout=timeout) if timeout else self._free.get_nowait()
+        except queue.Empty:
+            with self._stats_lock:
+                self.rejected += 1
+            return None
+
+        with self._stats_lock:
+            self.acquired += 1
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+        return slot
+
+    def release(self, slot):
+        """Return a slot to the free queue"""
+        with self._stats_lock:
+            self.in_use -= 1
+        self._free.put(slot)
+
+    def frame_view(self, slot, height, width):
+        """Zero-copy ndarray view of a slot holding a height x width BGR frame"""
+        return self._slots[slot, :height * width * 3].reshape(height, width, 3)
+
+    def write(self, slot, frame):
+        """Write a BGR frame into a slot, downscaling in place if it does not fit"""
+        max_h, max_w = self.frame_shape[:2]
+        h, w = frame.shape[:2]
+        if h <= max_h and w <= max_w:
+            np.copyto(self.frame_view(slot, h, w), frame, casting='unsafe')
+            return h, w
+
+        import cv2
+        scale = min(max_h / h, max_w / w)
+        new_w, new_h = max(int(w * scale), 1), max(int(h * scale), 1)
+        cv2.resize(frame, (new_w, new_h), dst=self.frame_view(slot, new_h, new_w),
+                   interpolation=cv2.INTER_AREA)
+        return new_h, new_w
+
+    def get_stats(self):
+        """Slot utilization metrics"""
+        with self._stats_lock:
+            return {
+                'slots': self.num_slots,
+                'slot_bytes': self.slot_size,
+                'slots_in_use': self.in_use,
+                'peak_slots_in_use': self.peak_in_use,
+                'utilization': round(self.in_use / self.num_slots, 3),
+                'slots_acquired': self.acquired,
+                'slot_rejections': self.rejected
+            }
+
+    def close(self):
+        """Drop views and close (and unlink, when owner) the shared block"""
+        self._slots = None
+        try:
+            self._shm.close()
+            if self._owner:
+                self._shm.unlink()
+        except FileNotFoundError:
+            pass
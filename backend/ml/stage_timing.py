@@ -0,0 +1,161 @@
+"""
+Per-stage latency instrumentation for the ISL recognition pipeline
+- perf_counter_ns timers around each pipeline stage
+- Bounded log-linear (HDR-style) histograms: fixed memory, ~3% relative error
+  (32 buckets per power of two)
+- Summaries as dicts for /api/isl/performance or Prometheus text format
+- When disabled, start() returns 0 and stop() returns immediately
+"""
+
+import time
+from threading import Lock
+
+# Stages recorded by the recognizer, in pipeline order
+PIPELINE_STAGES = (
+    "decode", "detection", "crop", "preprocess", "inference",
+    "inference_pool", "smoothing", "spell_check", "translation", "total"
+)
+
+
+class LatencyHistogram:
+    """Log-linear histogram of microsecond latencies with bounded memory"""
+
+    def __init__(self, sub_bucket_bits=6, max_value_us=60_000_000):
+        self.sub_bucket_count = 1 << sub_bucket_bits
+        self.half_count = self.sub_bucket_count // 2
+        self.sub_bucket_bits = sub_bucket_bits
+        self.max_value_us = max_value_us
+        self.counts = [0] * (self._index(max_value_us) + 1)
+        self.total_count = 0
+        self.total_us = 0
+        self.min_us = None
+        self.max_us = 0
+        self._lock = Lock()
+
+    def _index(self, value):
+        """Exact buckets below sub_bucket_count, then half_count buckets per power of two"""
+        if value < self.sub_bucket_count:
+            return value
+        shift = value.bit_length() - self.sub_bucket_bits
+        mantissa = value >> shift
+        return self.sub_bucket_count + (shift - 1) * self.half_count + (mantissa - self.half_count)
+
+    def _bucket_upper(self, index):
+        """Highest value that maps to bucket `index`"""
+        if index < self.sub_bucket_count:
+            return index
+        shift = (index - self.sub_bucket_count) // self.half_count + 1
+        mantissa = (index - self.sub_bucket_count) % self.half_count + self.half_count
+        return ((mantissa + 1) << shift) - 1
+
+    def record(self, value_us):
+        value_us = min(max(int(value_us), 0), self.max_value_us)
+        index = self._index(value_us)
+        with self._lock:
+            self.counts[index] += 1
+            self.total_count += 1
+            self.total_us += value_us
+            if self.min_us is None or value_us < self.min_us:
+                self.min_us = value_us
+            if value_us > self.max_us:
+                self.max_us = value_us
+
+    def percentile(self, pct):
+        """Value (us) at or below which pct% of recordings fall"""
+        if self.total_count == 0:
+            return 0
+        target = max(int(round(pct / 100.0 * self.total_count)), 1)
+        running = 0
+        for index, count in enumerate(self.counts):
+            running += count
+            if running >= target:
+                return min(self._bucket_upper(index), self.max_us)
+        return self.max_us
+
+    def reset(self):
+        with self._lock:
+            self.counts = [0] * len(self.counts)
+            self.total_count = 0
+            self.total_us = 0
+            self.min_us = None
+            self.max_us = 0
+
+    def summary(self):
+        """Count, mean, min/max and tail percentiles in milliseconds"""
+        if self.total_count == 0:
+            return {'count': 0}
+        to_ms = lambda us: round(us / 1000.0, 3)  # noqa: E731
+        return {
+            'count': self.total_count,
+            'mean_ms': to_ms(self.total_us / self.total_count),
+            'min_ms': to_ms(self.min_us),
+            'p50_ms': to_ms(self.percentile(50)),
+            'p90_ms': to_ms(self.percentile(90)),
+            'p95_ms': to_ms(self.percentile(95)),
+            'p99_ms': to_ms(self.percentile(99)),
+            'max_ms': to_ms(self.max_us)
+        }
+
+
+class StageTimings:
+    """Histograms per pipeline stage, recorded with perf_counter_ns"""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.histograms = {}
+        self._lock = Lock()
+
+    def start(self):
+        """Timestamp for stop(); 0 when timing is disabled"""
+        return time.perf_counter_ns() if self.enabled else 0
+
+    def stop(self, stage, started_ns):
+        """Record the time since start() for a stage"""
+        if not started_ns:
+            return
+        self.record(stage, (time.perf_counter_ns() - started_ns) // 1000)
+
+    def record(self, stage, value_us):
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(stage, LatencyHistogram())
+        histogram.record(value_us)
+
+    def reset(self):
+        for histogram in list(self.histograms.values()):
+            histogram.reset()
+
+    def summary(self):
+        """Per-stage summaries in pipeline order"""
+        order = {stage: i for i, stage in enumerate(PIPELINE_STAGES)}
+        stages = sorted(self.histograms, key=lambda s: (order.get(s, len(order)), s))
+        return {
+            'enabled': self.enabled,
+            'stages': {stage: self.histograms[stage].summary() for stage in stages}
+        }
+
+    def prometheus(self, prefix="isl_stage_latency_seconds"):
+        """Prometheus text exposition (summary type) for all stages"""
+        lines = [
+            f"# HELP {prefix} ISL recognition pipeline stage latency",
+            f"# TYPE {prefix} summary"
+        ]
+        for stage, histogram in sorted(self.histograms.items()):
+            if histogram.total_count == 0:
+                continue
+            for quantile in (0.5, 0.9, 0.95, 0.99):
+                value = histogram.percentile(quantile * 100) / 1e6
+                lines.append(f'{prefix}{{stage="{stage}",quantile="{quantile}"}} {value:.6f}')
+            lines.append(f'{prefix}_sum{{stage="{stage}"}} {histogram.total_us / 1e6:.6f}')
+            lines.append(f'{prefix}_count{{stage="{stage}"}} {histogram.total_count}')
+        return "\n".join(lines) + "\n"
+
+
+# Global stage timings instance
+_stage_timings = StageTimings()
+
+
+def get_stage_timings():
+    """Get the global stage timings"""
+    return _stage_timings
@@ -0,0 +1,143 @@
+"""
+Shared pytest fixtures
+Tests import the backend the same way run.py does (`from app import ...`)
+- app: bare Flask app (no DB, ML or Socket.IO)
+- db: FakeConnection served to every app context, as the pool would
+"""
+import os
+import sys
+
+import pytest
+from flask import Flask
+
+BACKEND_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_PATH not in sys.path:
+    sys.path.insert(0, BACKEND_PATH)
+
+from app.db_pool import _profiled_cursor  # noqa: E402
+from app.utils import db_helpers  # noqa: E402
+
+
+class FakeDBError(Exception):
+    """Raised for statements matching FakeConnection.fail_on"""
+
+
+class FakeCursor:
+    """MySQLdb DictCursor stand-in backed by a FakeConnection"""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.rows = []
+        self.rowcount = 0
+        self.lastrowid = None
+        self.description = None
+
+    def execute(self, query, args=None):
+        self.rows, self.rowcount, self.lastrowid = self.connection.run(query, args)
+        return self.rowcount
+
+    def executemany(self, query, args):
+        # MySQLdb sends an INSERT ... VALUES executemany as one multi-row statement
+        self.rows, self.rowcount, self.lastrowid = self.connection.run(query, list(args), many=True)
+        return self.rowcount
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def fetchall(self):
+        return tuple(self.rows)
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    """Records statements with InnoDB-like commit, rollback and savepoints
+
+    rows maps an SQL fragment to the rows a matching SELECT returns (a list, or
+    a callable taking the statement's args); fail_on is a fragment whose
+    statement raises FakeDBError
+    """
+
+    def __init__(self, rows=None, fail_on=None):
+        self.rows = dict(rows or {})
+        self.fail_on = fail_on
+        self.queries = []  # every statement, in order
+        self.pending = []  # (sql, args) of the open transaction
+        self.committed = []
+        self.commits = 0
+        self.rollbacks = 0
+        self._savepoints = {}
+        self._next_id = 1
+        # The same counting subclass the pool puts on real MySQLdb cursors
+        self.cursor_class = _profiled_cursor(FakeCursor)
+
+    def cursor(self):
+        return self.cursor_class(self)
+
+    def run(self, query, args, many=False):
+        sql = " ".join(query.split())
+        self.queries.append(sql)
+        if self.fail_on and self.fail_on in sql:
+            raise FakeDBError(f"Statement failed: {self.fail_on}")
+        if sql.startswith("SAVEPOINT "):
+            self._savepoints[sql.split()[1]] = len(self.pending)
+            return [], 0, None
+        if sql.startswith("ROLLBACK TO SAVEPOINT "):
+            del self.pending[self._savepoints[sql.split()[-1]]:]
+            return [], 0, None
+        if sql.startswith("SELECT"):
+            rows = next((rows for fragment, rows in self.rows.items() if fragment in sql), [])
+            rows = list(rows(args) if callable(rows) else rows)
+            return rows, len(rows), None
+        self.pending.append((sql, args))
+        lastrowid = self._next_id if sql.startswith("INSERT") else None
+        count = len(args) if many else 1
+        if lastrowid:
+            self._next_id += count
+        return [], count, lastrowid
+
+    def commit(self):
+        self.commits += 1
+        self.committed.extend(self.pending)
+        self.pending = []
+        self._savepoints.clear()
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.pending = []
+        self._savepoints.clear()
+
+    def written(self, fragment):
+        """Args of the committed statements containing `fragment`"""
+        return [args for sql, args in self.committed if fragment in sql]
+
+
+class FakePool:
+    """Hands the same connection to every app context"""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def acquire(self):
+        return self.connection
+
+    def release(self, conn):
+        pass
+
+
+@pytest.fixture
+def app():
+    """Bare Flask app for code that needs an app context (no DB, ML or Socket.IO)"""
+    app = Flask(__name__)
+    app.config.update(TESTING=True)
+    return app
+
+
+@pytest.fixture
+def db(app, monkeypatch):
+    """FakeConnection behind `mysql.connection` in every app context of `app`"""
+    connection = FakeConnection()
+    monkeypatch.setattr(db_helpers, "DB_AVAILABLE", True)
+    app.extensions["mysql_pool"] = FakePool(connection)
+    return connection
@@ -0,0 +1,165 @@
+"""
+Activity writes: the aggregated batch UPSERTs, rollback on failure and the
+write-behind buffer's retry, requeue and drop accounting
+"""
+from collections import deque
+from datetime import date, datetime
+
+import pytest
+
+from app.extensions import mysql
+from app.services.activity_buffer_service import ActivityWriteBuffer
+from app.services.realtime_activity_service import RealtimeActivityService
+from app.utils.db_helpers import db_cursor
+
+from conftest import FakeDBError
+
+
+def event_at(user_id, activity_type, created_at, **kwargs):
+    event = RealtimeActivityService._build_activity_event(user_id, activity_type, **kwargs)
+    event['created_at'] = created_at
+    return event
+
+
+def test_batch_aggregates_per_user_day_week_and_skill(app, db):
+    # 2026-03-01 is a Sunday: its week starts 2026-02-23, the other days' on 2026-03-02
+    sunday, monday, tuesday = date(2026, 3, 1), date(2026, 3, 2), date(2026, 3, 3)
+    events = [
+        event_at(1, 'practice_session', datetime(2026, 3, 1, 10), module_id=1, duration_minutes=30),
+        event_at(1, 'module_complete', datetime(2026, 3, 2, 9), module_id=2),
+        event_at(1, 'quiz_pass', datetime(2026, 3, 2, 11), module_id=1),
+        event_at(2, 'practice_session', datetime(2026, 3, 3, 8), module_id=6, duration_minutes=10),
+        event_at(2, 'module_start', datetime(2026, 3, 3, 9), module_id=9),
+    ]
+
+    with app.app_context():
+        activity_id = RealtimeActivityService.write_activity_batch(events)
+
+    assert activity_id == 1
+    assert db.commits == 1 and not db.pending
+    (log,) = db.written("INSERT INTO activity_log_realtime")
+    assert [row[:2] for row in log] == [(e['user_id'], e['activity_type']) for e in events]
+    assert db.written("INSERT INTO user_stats_realtime") == [[(1, 30, 96, 1, monday), (2, 10, 22, 0, tuesday)]]
+    assert db.written("INSERT INTO daily_activity_summary") == [[
+        (1, sunday, 30, 0, 0, 1, 21),
+        (1, monday, 0, 1, 1, 0, 75),
+        (2, tuesday, 10, 0, 0, 1, 22),
+    ]]
+    assert db.written("INSERT INTO weekly_goals") == [[
+        (1, date(2026, 2, 23), 30, 0, 1),
+        (1, monday, 0, 1, 0),
+        (2, monday, 10, 0, 1),
+    ]]
+    assert db.written("INSERT INTO skill_development") == [[
+        (1, 'alphabet', 46), (1, 'numbers', 50), (2, 'grammar', 17), (2, 'conversation', 5)
+    ]]
+    assert db.written("INSERT INTO user_streaks") == [[(1, sunday), (1, monday), (2, tuesday)]]
+    assert db.written("INSERT INTO user_dashboard_snapshot") == [[(1, None, None), (2, None, None)]]
+
+
+def test_failed_log_activity_keeps_the_callers_uncommitted_work(app, db):
+    db.fail_on = "INSERT INTO daily_activity_summary"
+
+    with app.app_context():
+        cur = db_cursor()
+        cur.execute("UPDATE user_progress SET progress = %s WHERE user_id = %s", (50, 1))
+        assert RealtimeActivityService.log_activity(1, 'practice_session', module_id=1, duration_minutes=5) == 0
+        mysql.connection.commit()
+
+    assert db.rollbacks == 0
+    assert [sql for sql, _ in db.committed] == ["UPDATE user_progress SET progress = %s WHERE user_id = %s"]
+
+
+def test_logged_activity_commits_with_the_callers_work(app, db):
+    with app.app_context():
+        cur = db_cursor()
+        cur.execute("UPDATE user_progress SET progress = %s WHERE user_id = %s", (50, 1))
+        assert RealtimeActivityService.log_activity(1, 'quiz_attempt', module_id=1) == 1
+
+    assert db.commits == 1
+    assert db.committed[0][0].startswith("UPDATE user_progress")
+    assert db.written("INSERT INTO activity_log_realtime")
+
+
+def test_failed_buffer_batch_rolls_back_the_whole_transaction(app, db):
+    db.fail_on = "INSERT INTO weekly_goals"
+    event = RealtimeActivityService._build_activity_event(1, 'quiz_attempt')
+
+    with app.app_context():
+        with pytest.raises(FakeDBError):
+            RealtimeActivityService.write_activity_batch([event])
+
+    assert db.rollbacks == 1
+    assert not db.pending and not db.committed
+
+
+class FlakyWriter:
+    """Stands in for write_activity_batch: fails while `down`, and for events marked bad"""
+
+    def __init__(self):
+        self.down = False
+        self.batches = []
+
+    def __call__(self, events):
+        if self.down or any(e['description'] == 'bad' for e in events):
+            raise FakeDBError("write failed")
+        self.batches.append([e['description'] for e in events])
+        return 1
+
+
+@pytest.fixture
+def writer(monkeypatch):
+    writer = FlakyWriter()
+    monkeypatch.setattr(RealtimeActivityService, "write_activity_batch", writer)
+    return writer
+
+
+def make_buffer(app, descriptions, **kwargs):
+    """Stopped buffer holding one pending event per description"""
+    buffer = ActivityWriteBuffer(**kwargs)
+    buffer._app = app
+    buffer._pending = deque([0, RealtimeActivityService._build_activity_event(1, 'quiz_attempt', description=text)]
+                            for text in descriptions)
+    return buffer
+
+
+def test_bad_event_is_dropped_and_the_rest_written(app, writer):
+    buffer = make_buffer(app, ['a', 'bad', 'c', 'd'], max_events=3)
+
+    assert buffer.flush() == 3
+    assert writer.batches == [['a'], ['c'], ['d']]  # first batch retried one by one, then the rest
+    assert (buffer.written, buffer.dropped, buffer.failures, buffer.flushes) == (3, 1, 1, 2)
+    assert not buffer._pending
+
+
+def test_events_are_requeued_while_the_database_is_down_then_dropped(app, writer):
+    buffer = make_buffer(app, ['a', 'b'], max_attempts=2)
+    writer.down = True
+
+    assert buffer.flush() == 0
+    assert [(attempts, e['description']) for attempts, e in buffer._pending] == [(1, 'a'), (1, 'b')]
+    assert (buffer.written, buffer.dropped, buffer.failures) == (0, 0, 1)
+
+    assert buffer.flush() == 0
+    assert not buffer._pending
+    assert (buffer.written, buffer.dropped, buffer.failures) == (0, 2, 2)
+
+
+def test_requeued_events_are_written_before_newer_ones(app, writer):
+    buffer = make_buffer(app, ['a', 'b'])
+    writer.down = True
+    buffer.flush()
+
+    buffer._pending.append([0, RealtimeActivityService._build_activity_event(1, 'quiz_attempt', description='c')])
+    writer.down = False
+
+    assert buffer.flush() == 3
+    assert writer.batches == [['a', 'b', 'c']]
+    assert (buffer.written, buffer.dropped, buffer.failures) == (3, 0, 1)
+
+
+def test_stopped_buffer_sends_callers_to_the_synchronous_write(app):
+    buffer = make_buffer(app, [])
+
+    assert buffer.submit(RealtimeActivityService._build_activity_event(1, 'quiz_attempt')) is False
+    assert not buffer._pending
@@ -0,0 +1,110 @@
+"""
+AzureTokenManager against a local stub STS server
+"""
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.services.azure_auth_service import AzureTokenManager
+
+
+class StubSTS:
+    """issueToken endpoint returning token-1, token-2, ... after an optional delay"""
+
+    def __init__(self):
+        self.requests = 0
+        self.delay = 0.0
+        self.status = 200
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                stub.requests += 1
+                token = f"token-{stub.requests}".encode()
+                if self.headers.get("Ocp-Apim-Subscription-Key") != "test-key":
+                    self.send_response(401)
+                    self.end_headers()
+                    return
+                time.sleep(stub.delay)
+                self.send_response(stub.status)
+                self.send_header("Content-Length", str(len(token)))
+                self.end_headers()
+                self.wfile.write(token)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/sts/v1.0/issueToken"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def sts():
+    server = StubSTS()
+    yield server
+    server.close()
+
+
+def make_manager(sts, **kwargs):
+    return AzureTokenManager("test-key", "local", token_url=sts.url, **kwargs)
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_token_is_fetched_once_and_reused(sts):
+    manager = make_manager(sts)
+
+    assert manager.get_token() == "token-1"
+    assert manager.get_token() == "token-1"
+    assert sts.requests == 1
+    assert manager.get_stats()['fetches'] == 1
+
+
+def test_refresh_runs_in_background_without_blocking_callers(sts):
+    manager = make_manager(sts, refresh_after=0.05)
+    assert manager.get_token() == "token-1"
+
+    time.sleep(0.1)
+    sts.delay = 0.5
+    start = time.monotonic()
+    # Every caller during the slow refresh gets the old token at once
+    tokens = [manager.get_token() for _ in range(20)]
+    assert time.monotonic() - start < 0.25
+    assert set(tokens) == {"token-1"}
+
+    wait_for(lambda: manager.get_stats()['fetches'] == 2)
+    assert sts.requests == 2  # one refresh, however many callers saw a token due for one
+    assert manager.get_token() == "token-2"
+
+
+def test_failed_refresh_keeps_the_current_token(sts):
+    manager = make_manager(sts, refresh_after=0.05)
+    assert manager.get_token() == "token-1"
+
+    time.sleep(0.1)
+    sts.status = 500
+    assert manager.get_token() == "token-1"
+    wait_for(lambda: sts.requests == 2 and not manager._refresh_lock.locked())
+    assert manager.get_token() == "token-1"
+
+
+def test_expired_token_is_fetched_synchronously(sts):
+    manager = make_manager(sts, valid_for=0.05, refresh_after=0.05)
+    assert manager.get_token() == "token-1"
+
+    time.sleep(0.1)
+    assert manager.get_token() == "token-2"
+    assert sts.requests == 2
@@ -0,0 +1,42 @@
+"""
+DashboardData.load stays within DASHBOARD_MAX_QUERIES however many courses are shown
+"""
+import pytest
+
+from app.db_pool import query_count
+from app.models import catalog as catalog_module
+from app.models.dashboard import DASHBOARD_MAX_QUERIES, DashboardData
+
+USER_ID = 7
+
+
+@pytest.fixture
+def warm_catalog(monkeypatch):
+    """Catalog cache holding `n` courses, as after its first load"""
+    def load(n):
+        courses = [{'id': course_id, 'title': f"Course {course_id}"} for course_id in range(1, n + 1)]
+        monkeypatch.setattr(catalog_module.catalog, "_snapshot",
+                            catalog_module.CatalogSnapshot(courses, [], [], ("n", "n", "n")))
+    return load
+
+
+@pytest.mark.parametrize("course_count,course_limit", [(0, 3), (3, 3), (20, 3), (20, None)])
+def test_dashboard_query_count_is_bounded(app, db, warm_catalog, course_count, course_limit):
+    db.rows.update({
+        "FROM users": [{'id': USER_ID, 'username': 'asha'}],
+        "FROM user_stats": [{'user_id': USER_ID, 'points': 40, 'modules_completed': 2}],
+        "FROM achievements": [{'id': 1, 'user_id': USER_ID, 'badge_title': 'First Sign'}],
+    })
+    warm_catalog(course_count)
+
+    with app.app_context():
+        data = DashboardData.load(USER_ID, course_limit=course_limit)
+        count = query_count()
+
+    assert count == len(db.queries)
+    assert count <= DASHBOARD_MAX_QUERIES
+    assert len(data['courses']) == min(course_count, course_limit or course_count)
+    assert data['user']['username'] == 'asha'
+    assert data['stats']['points'] == 40
+    assert data['achievements'][0]['badge_title'] == 'First Sign'
+    assert data['weekly_activity'] == []
@@ -0,0 +1,207 @@
+"""
+Dashboard stats: the per-process cache and the materialized snapshot that
+write_activity_batch updates in place
+"""
+import json
+from datetime import date, datetime
+
+import pytest
+
+from app.services import realtime_activity_service as service
+from app.services.realtime_activity_service import DashboardStatsCache, RealtimeActivityService
+
+TODAY = date.today()
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    cache = DashboardStatsCache()
+    monkeypatch.setattr(service, "_dashboard_cache", cache)
+    return cache
+
+
+def make_snapshot(**overrides):
+    """Stored snapshot as _build_dashboard_stats + JSON would leave it"""
+    snapshot = {
+        'basic_stats': {'total_study_hours': 0.2, 'modules_completed': 0, 'total_xp_points': 5,
+                        'skill_level': 'Beginner', 'current_streak': 1, 'longest_streak': 1},
+        'today_stats': {'study_minutes': 10, 'study_hours': 0.2, 'xp_earned': 5, 'activities_count': 1},
+        'weekly_progress': {'study_minutes': 10, 'study_goal': 300, 'modules_completed': 0, 'modules_goal': 2,
+                            'practice_sessions': 0, 'practice_goal': 10},
+        'skills': [{'skill_category': skill, 'skill_level': 1, 'xp_points': 90}
+                   for skill in ('alphabet', 'comprehension', 'conversation', 'grammar', 'numbers', 'vocabulary')],
+        'recent_activities': [{'activity_type': 'module_start', 'description': '', 'xp_earned': 5,
+                               'created_at': '2000-01-01T08:00:00', 'module_id': 1}],
+        'active_modules': [],
+        'streak_info': {'current_streak': 1, 'longest_streak': 1, 'streak_percentage': 3.3}
+    }
+    snapshot.update(overrides)
+    return snapshot
+
+
+def snapshot_rows(snapshots):
+    """user_dashboard_snapshot rows for {user_id: (snapshot, snapshot_date)}"""
+    return [{'user_id': user_id, 'snapshot': json.dumps(snapshot) if snapshot else None,
+             'snapshot_date': snapshot_date, 'version': 3}
+            for user_id, (snapshot, snapshot_date) in snapshots.items()]
+
+
+def stored_snapshots(db):
+    """{user_id: (snapshot or None, snapshot_date)} written by the committed batch"""
+    (rows,) = db.written("INSERT INTO user_dashboard_snapshot")
+    return {user_id: (json.loads(snapshot) if snapshot else None, snapshot_date)
+            for user_id, snapshot, snapshot_date in rows}
+
+
+@pytest.fixture
+def user_rows(db):
+    db.rows.update({
+        "FROM user_stats_realtime WHERE user_id IN": [
+            {'user_id': 1, 'total_study_minutes': 100, 'total_xp_points': 320, 'modules_completed': 3}],
+        "FROM user_streaks": [{'current_streak': 4, 'longest_streak': 6, 'last_active_date': TODAY}],
+    })
+
+
+def test_batch_applies_deltas_to_todays_snapshot(app, db, user_rows):
+    db.rows["FROM user_dashboard_snapshot"] = snapshot_rows({1: (make_snapshot(), TODAY)})
+    events = [
+        RealtimeActivityService._build_activity_event(1, 'practice_session', module_id=1, duration_minutes=30),
+        RealtimeActivityService._build_activity_event(1, 'module_complete', module_id=2),
+    ]
+
+    with app.app_context():
+        RealtimeActivityService.write_activity_batch(events)
+
+    stats, snapshot_date = stored_snapshots(db)[1]
+    assert snapshot_date == TODAY
+    assert stats['basic_stats'] == {
+        'total_study_hours': 1.7, 'modules_completed': 3, 'total_xp_points': 320,
+        'skill_level': 'Intermediate', 'current_streak': 4, 'longest_streak': 6
+    }
+    assert stats['streak_info']['current_streak'] == 4
+    assert stats['today_stats'] == {'study_minutes': 40, 'study_hours': 0.7, 'xp_earned': 76, 'activities_count': 3}
+    assert stats['weekly_progress']['study_minutes'] == 40
+    assert stats['weekly_progress']['modules_completed'] == 1
+    assert stats['weekly_progress']['practice_sessions'] == 1
+    skills = {skill['skill_category']: skill for skill in stats['skills']}
+    assert skills['alphabet'] == {'skill_category': 'alphabet', 'skill_level': 2, 'xp_points': 111}
+    assert skills['numbers'] == {'skill_category': 'numbers', 'skill_level': 2, 'xp_points': 140}
+    assert skills['grammar']['xp_points'] == 90
+    assert [activity['activity_type'] for activity in stats['recent_activities']][2:] == ['module_start']
+    assert {activity['activity_type'] for activity in stats['recent_activities'][:2]} == \
+        {'practice_session', 'module_complete'}
+
+
+def test_recent_activities_keep_the_newest_ten(app, db, user_rows):
+    old = [{'activity_type': 'module_start', 'description': '', 'xp_earned': 5,
+            'created_at': f'2000-01-01T08:00:{second:02d}', 'module_id': 1} for second in range(10)]
+    db.rows["FROM user_dashboard_snapshot"] = snapshot_rows({1: (make_snapshot(recent_activities=old), TODAY)})
+    event = RealtimeActivityService._build_activity_event(1, 'quiz_pass')
+
+    with app.app_context():
+        RealtimeActivityService.write_activity_batch([event])
+
+    recent = stored_snapshots(db)[1][0]['recent_activities']
+    assert len(recent) == 10
+    assert recent[0]['activity_type'] == 'quiz_pass'
+    assert recent[-1]['created_at'] == '2000-01-01T08:00:01'
+
+
+@pytest.mark.parametrize("snapshot,snapshot_date", [
+    (None, None),  # never built, or cleared by another writer
+    (make_snapshot(), date(2020, 1, 1)),  # from an earlier day
+    (make_snapshot(skills=[]), TODAY),  # no row for the skill the batch touches
+])
+def test_snapshot_that_cannot_absorb_the_batch_is_cleared(app, db, user_rows, snapshot, snapshot_date):
+    db.rows["FROM user_dashboard_snapshot"] = snapshot_rows({1: (snapshot, snapshot_date)})
+    event = RealtimeActivityService._build_activity_event(1, 'practice_session', module_id=1, duration_minutes=5)
+
+    with app.app_context():
+        RealtimeActivityService.write_activity_batch([event])
+
+    assert stored_snapshots(db) == {1: (None, None)}
+
+
+def test_batch_bumps_every_users_version_and_clears_their_cache(app, db, user_rows, fresh_cache):
+    db.rows["FROM user_dashboard_snapshot"] = snapshot_rows({1: (make_snapshot(), TODAY)})
+    for user_id in (1, 2):
+        fresh_cache.set(user_id, {'cached': True}, TODAY, fresh_cache.generation(user_id))
+    events = [RealtimeActivityService._build_activity_event(user_id, 'quiz_attempt') for user_id in (1, 2)]
+
+    with app.app_context():
+        RealtimeActivityService.write_activity_batch(events)
+
+    snapshots = stored_snapshots(db)
+    assert snapshots[1][0] is not None and snapshots[2] == (None, None)
+    assert any("version = version + 1" in sql for sql, _ in db.committed)
+    assert fresh_cache.get(1) is None and fresh_cache.get(2) is None
+
+
+def test_dashboard_stats_come_from_the_snapshot_then_the_cache(app, db):
+    stored = make_snapshot()
+    db.rows["FROM user_dashboard_snapshot"] = snapshot_rows({1: (stored, TODAY)})
+
+    with app.app_context():
+        first = RealtimeActivityService.get_user_dashboard_stats(1)
+        queries = len(db.queries)
+        second = RealtimeActivityService.get_user_dashboard_stats(1)
+
+    assert first == stored and second == stored
+    assert queries == 1  # one primary-key read
+    assert len(db.queries) == queries  # second call served from the cache
+    second['today_stats']['xp_earned'] = 999
+    with app.app_context():
+        assert RealtimeActivityService.get_user_dashboard_stats(1)['today_stats']['xp_earned'] == 5
+
+
+def test_missing_snapshot_is_rebuilt_and_stored_if_the_version_is_unchanged(app, db):
+    db.rows["FROM user_dashboard_snapshot"] = snapshot_rows({1: (None, None)})
+
+    with app.app_context():
+        stats = RealtimeActivityService.get_user_dashboard_stats(1)
+
+    assert stats['basic_stats']['skill_level'] == 'Beginner'
+    (args,) = db.written("INSERT INTO user_dashboard_snapshot")
+    user_id, snapshot, snapshot_date, *versions = args
+    assert (user_id, snapshot_date, versions) == (1, TODAY, [3, 3])
+    assert json.loads(snapshot) == stats
+
+
+def test_cache_drops_stats_loaded_before_an_invalidation():
+    cache = DashboardStatsCache()
+    generation = cache.generation(1)
+    cache.invalidate(1)  # a write landed while the stats were being loaded
+
+    cache.set(1, {'stale': True}, TODAY, generation)
+    assert cache.get(1) is None
+
+    cache.set(1, {'fresh': True}, TODAY, cache.generation(1))
+    assert cache.get(1) == {'fresh': True}
+    cache.invalidate(1)
+    assert cache.get(1) is None
+
+
+def test_cache_expires_and_stays_bounded():
+    cache = DashboardStatsCache(max_users=2, ttl=60.0)
+    for user_id in (1, 2, 3):
+        cache.set(user_id, {'user': user_id}, TODAY, cache.generation(user_id))
+    assert cache.get(1) is None  # least recently used, evicted
+    assert cache.get(3) == {'user': 3}
+
+    cache.set(4, {'user': 4}, date(2020, 1, 1), cache.generation(4))
+    assert cache.get(4) is None  # from an earlier day
+
+    expired = DashboardStatsCache(ttl=-1.0)
+    expired.set(1, {'user': 1}, TODAY, 0)
+    assert expired.get(1) is None
+
+
+def test_recent_activity_timestamps_match_the_rebuilt_format(app, db, user_rows):
+    db.rows["FROM user_dashboard_snapshot"] = snapshot_rows({1: (make_snapshot(), TODAY)})
+    event = RealtimeActivityService._build_activity_event(1, 'quiz_attempt')
+    event['created_at'] = datetime.combine(TODAY, datetime.min.time()).replace(hour=9, microsecond=123456)
+
+    with app.app_context():
+        RealtimeActivityService.write_activity_batch([event])
+
+    assert stored_snapshots(db)[1][0]['recent_activities'][0]['created_at'] == f"{TODAY.isoformat()}T09:00:00"
@@ -0,0 +1,108 @@
+"""
+Streaming STT sessions: chunk ordering and stop
+"""
+import threading
+import time
+
+import pytest
+
+from app.services import stt_stream_service
+from app.services.stt_stream_service import get_stt_stream, start_stt_stream, stop_stt_stream
+
+
+class CollectingRecognizer:
+    """Records the PCM written to it"""
+
+    def __init__(self):
+        self.pcm = bytearray()
+        self.stopped = False
+
+    def write(self, pcm):
+        self.pcm.extend(pcm)
+
+    def stop(self):
+        self.stopped = True
+
+
+@pytest.fixture(autouse=True)
+def google_backend(monkeypatch):
+    monkeypatch.setattr(stt_stream_service, "azure_stt_configured", lambda: False)
+
+
+@pytest.fixture
+def pcm_session(app):
+    session = start_stt_stream('client', app)
+    session._recognizer = CollectingRecognizer()
+    yield session
+    stop_stt_stream('client')
+
+
+def chunk(seq):
+    return bytes([seq, seq])  # one 16-bit sample per chunk
+
+
+def test_chunks_are_written_in_sequence_order(pcm_session):
+    for seq in (1, 0, 3, 2):
+        pcm_session.feed(chunk(seq), seq)
+
+    stop_stt_stream('client', last_seq=3)
+
+    assert bytes(pcm_session._recognizer.pcm) == b"".join(chunk(seq) for seq in range(4))
+    assert pcm_session._recognizer.stopped
+
+
+def test_chunk_arriving_after_stop_is_still_recognized(pcm_session):
+    for seq in range(3):
+        pcm_session.feed(chunk(seq), seq)
+
+    stopper = threading.Thread(target=stop_stt_stream, args=('client',), kwargs={'last_seq': 3})
+    stopper.start()
+    deadline = time.monotonic() + 2.0
+    while not pcm_session._stop_called:
+        assert time.monotonic() < deadline, "stop was not called"
+        time.sleep(0.01)
+
+    # The chunk handler still finds the session while stop waits for chunk 3
+    assert get_stt_stream('client') is pcm_session
+    get_stt_stream('client').feed(chunk(3), 3)
+    stopper.join(5.0)
+
+    assert not stopper.is_alive()
+    assert bytes(pcm_session._recognizer.pcm) == b"".join(chunk(seq) for seq in range(4))
+    assert get_stt_stream('client') is None
+
+
+def test_stop_keeps_a_session_started_while_it_waited(app, pcm_session):
+    stopper = threading.Thread(target=stop_stt_stream, args=('client',), kwargs={'last_seq': 0})
+    stopper.start()
+    while not pcm_session._stop_called:
+        time.sleep(0.01)
+
+    replacement = start_stt_stream('client', app)
+    stopper.join(5.0)
+
+    assert get_stt_stream('client') is replacement
+
+
+def test_decoder_is_closed_when_the_recognizer_cannot_start(app, monkeypatch):
+    decoders = []
+
+    class FakeDecoder:
+        def __init__(self, on_pcm, logger):
+            self.closed = False
+            decoders.append(self)
+
+        def close(self):
+            self.closed = True
+
+    def failing_recognizer(session, lang, sample_rate):
+        raise RuntimeError("recognizer unavailable")
+
+    monkeypatch.setattr(stt_stream_service, "_FFmpegDecoder", FakeDecoder)
+    monkeypatch.setattr(stt_stream_service, "_UtteranceRecognizer", failing_recognizer)
+
+    with pytest.raises(RuntimeError):
+        start_stt_stream('client', app, encoding='webm')
+
+    assert [decoder.closed for decoder in decoders] == [True]
+    assert get_stt_stream('client') is None
@@ -0,0 +1,84 @@
+"""
+ISL words reach the streaming TTS session of the client whose event formed them
+"""
+import pytest
+from flask import request
+
+from app.routes import ml
+from app.services import tts_stream_service
+from app.services.tts_stream_service import start_tts_stream, stop_tts_stream
+
+
+class FakeWordEngine:
+    def __init__(self):
+        self.formed_words = []
+
+    def get_formed_words(self):
+        return self.formed_words
+
+
+class FakeRecognizer:
+    """Shared recognizer: one word list for every client"""
+
+    def __init__(self):
+        self.word_engine = FakeWordEngine()
+
+
+@pytest.fixture
+def sessions(app, monkeypatch):
+    # Keep segments queued instead of synthesizing them
+    monkeypatch.setattr(tts_stream_service.socketio, "start_background_task", lambda *args: None)
+    sessions = {
+        'alice': start_tts_stream('alice', app, source='isl'),
+        'bob': start_tts_stream('bob', app, source='isl'),
+        'carol': start_tts_stream('carol', app, source='text'),
+    }
+    yield sessions
+    for sid in sessions:
+        stop_tts_stream(sid)
+
+
+def spoken(session):
+    return [text for text, _ in session._pending]
+
+
+def event(app, sid, recognizer, action):
+    """Run one ISL handler's recognizer call for client `sid`"""
+    with app.test_request_context():
+        request.sid = sid
+        words = ml._formed_words(recognizer)
+        action(recognizer.word_engine.formed_words)
+        ml._speak_new_words(recognizer, words)
+
+
+def test_each_client_hears_only_the_words_its_events_formed(app, sessions):
+    recognizer = FakeRecognizer()
+
+    event(app, 'alice', recognizer, lambda words: words.append({'word': 'HELLO'}))
+    event(app, 'bob', recognizer, lambda words: words.append({'word': 'WORLD'}))
+    event(app, 'alice', recognizer, lambda words: None)  # a frame that forms no word
+    event(app, 'carol', recognizer, lambda words: words.append({'word': 'IGNORED'}))
+
+    assert spoken(sessions['alice']) == ['hello']
+    assert spoken(sessions['bob']) == ['world']
+    assert spoken(sessions['carol']) == []
+
+
+def test_words_after_a_clear_or_backspace_are_spoken(app, sessions):
+    recognizer = FakeRecognizer()
+    event(app, 'alice', recognizer, lambda words: words.extend([{'word': 'ONE'}, {'word': 'TWO'}]))
+
+    event(app, 'bob', recognizer, lambda words: words.clear())
+    event(app, 'alice', recognizer, lambda words: words.append({'word': 'THREE'}))
+    event(app, 'alice', recognizer, lambda words: words.pop())
+    event(app, 'alice', recognizer, lambda words: words.append({'word': 'FOUR'}))
+
+    assert spoken(sessions['alice']) == ['one', 'two', 'three', 'four']
+    assert spoken(sessions['bob']) == []
+
+
+def test_several_clients_can_speak_isl(app, sessions):
+    assert sessions['alice'].source == sessions['bob'].source == 'isl'
+    with app.test_request_context():
+        request.sid = 'carol'
+        assert ml._formed_words(FakeRecognizer()) is None
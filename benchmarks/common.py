@@ -0,0 +1,99 @@
+"""
+Shared helpers for benchmark scripts
+- Repository paths and sys.path setup matching run.py
+- Process memory readings (psutil, /proc or resource fallback)
+- Summary statistics and JSON result files
+"""
+import json
+import os
+import platform
+import statistics
+import sys
+from datetime import datetime
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKEND_PATH = os.path.join(REPO_ROOT, "backend")
+
+
+def setup_paths():
+    """Make `app` and `backend.*` importable the same way run.py does"""
+    for path in (REPO_ROOT, BACKEND_PATH):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    os.chdir(REPO_ROOT)
+
+
+def current_rss_mb():
+    """Resident set size of this process in MB"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return peak_rss_mb()
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KB, macOS reports bytes
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        return None
+
+
+def summarize(values):
+    """min/mean/median/max and tail percentiles for a list of numbers"""
+    if not values:
+        return {}
+    ordered = sorted(values)
+
+    def pct(p):
+        index = min(int(round(p / 100 * (len(ordered) - 1))), len(ordered) - 1)
+        return round(ordered[index], 3)
+
+    return {
+        'count': len(ordered),
+        'min': round(ordered[0], 3),
+        'mean': round(statistics.mean(ordered), 3),
+        'p50': pct(50),
+        'p95': pct(95),
+        'p99': pct(99),
+        'max': round(ordered[-1], 3)
+    }
+
+
+def environment_info():
+    """Host details stored alongside results"""
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'timestamp': datetime.now().isoformat()
+    }
+
+
+def write_results(results, output_path):
+    """Write results as JSON (stdout when no path given)"""
+    text = json.dumps(results, indent=2, default=str)
+    if output_path:
+        with open(output_path, "w") as f:
+            f.write(text)
+        print(f"Results written to {output_path}")
+    else:
+        print(text)
+
+
+def load_results(path):
+    """Load a previous JSON results file"""
+    with open(path) as f:
+        return json.load(f)
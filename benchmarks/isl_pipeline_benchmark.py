@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+ISL recognition pipeline benchmark
+Replays a directory of recorded JPEG frames through each pipeline stage in
+isolation (decode, MediaPipe, crop, preprocess, model, postprocess, smoother,
+word engine, translation) and through the full process_base64_frame path.
+Reports p50/p95/p99 latency, throughput and peak RSS as JSON.
+
+Usage:
+    # Record fixture frames from the default camera
+    python benchmarks/isl_pipeline_benchmark.py --frames benchmarks/fixtures/frames --record 200
+
+    # Run on a CPU-only box and keep the results
+    CUDA_VISIBLE_DEVICES="" python benchmarks/isl_pipeline_benchmark.py \\
+        --frames benchmarks/fixtures/frames --threads 4 --output after.json --compare before.json
+"""
+import argparse
+import base64
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import (environment_info, load_results, peak_rss_mb,  # noqa: E402
+                               setup_paths, summarize, write_results)
+
+STAGES = ["decode", "mediapipe", "crop", "preprocess", "model", "postprocess",
+          "smoother", "word_engine", "translation", "full_pipeline"]
+
+
+def record_frames(directory, count, camera=0):
+    """Capture frames from a camera into numbered JPEG files"""
+    import cv2
+    os.makedirs(directory, exist_ok=True)
+    capture = cv2.VideoCapture(camera)
+    if not capture.isOpened():
+        raise RuntimeError(f"Camera {camera} not available")
+    saved = 0
+    try:
+        while saved < count:
+            ok, frame = capture.read()
+            if not ok:
+                break
+            cv2.imwrite(os.path.join(directory, f"frame_{saved:05d}.jpg"), frame)
+            saved += 1
+    finally:
+        capture.release()
+    print(f"Recorded {saved} frames to {directory}")
+
+
+def load_fixture_frames(directory, limit=None):
+    """Recorded JPEGs as base64 data URLs (encoding is not timed)"""
+    paths = sorted(glob.glob(os.path.join(directory, "*.jpg")) + glob.glob(os.path.join(directory, "*.jpeg")))
+    if limit:
+        paths = paths[:limit]
+    if not paths:
+        raise SystemExit(f"No JPEG frames found in {directory} (record some with --record N)")
+    frames = []
+    for path in paths:
+        with open(path, "rb") as f:
+            frames.append("data:image/jpeg;base64," + base64.b64encode(f.read()).decode("ascii"))
+    return frames
+
+
+def time_stage(fn, inputs, repeat, warmup):
+    """Run fn over inputs `repeat` times; returns (outputs of last pass, latencies ms, wall s)"""
+    for item in inputs[:warmup]:
+        fn(item)
+
+    latencies = []
+    outputs = []
+    wall_start = time.perf_counter()
+    for _ in range(repeat):
+        outputs = []
+        for item in inputs:
+            start = time.perf_counter_ns()
+            outputs.append(fn(item))
+            latencies.append((time.perf_counter_ns() - start) / 1e6)
+    return outputs, latencies, time.perf_counter() - wall_start
+
+
+def stage_result(latencies, wall_seconds):
+    """Latency percentiles, throughput and peak RSS for one stage"""
+    return {
+        'latency_ms': summarize(latencies),
+        'throughput_fps': round(len(latencies) / wall_seconds, 2) if wall_seconds else None,
+        'peak_rss_mb': round(peak_rss_mb() or 0, 1)
+    }
+
+
+def build_recognizer(args):
+    """Recognizer with a loaded (or randomly initialised) model"""
+    from backend.ml import enhanced_isl_recognition as isl
+
+    recognizer = isl.EnhancedISLRecognizer(model_path=args.model_path)
+    if recognizer.model is None:
+        if not args.random_weights:
+            raise SystemExit(f"Model not found at {args.model_path} (use --random-weights to benchmark without it)")
+        recognizer.model = isl.EnhancedISLModel(isl.NUM_CLASSES).to(recognizer.device).eval()
+    return recognizer
+
+
+def build_translator(args):
+    """Translation service; offline mode keeps the run deterministic and network-free"""
+    from app.services.translation_service import TranslationService
+    service = TranslationService()
+    if args.translation_mode == "offline":
+        service.google_translator = None
+        service.offline_translator = None
+    return service
+
+
+def run_benchmark(args):
+    """Time every stage in isolation, then the full pipeline"""
+    setup_paths()
+    import torch
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    frames_b64 = load_fixture_frames(args.frames, args.limit)
+    recognizer = build_recognizer(args)
+    selected = set(args.stages.split(",")) if args.stages else set(STAGES)
+    results = {}
+
+    def run(name, fn, inputs):
+        if name not in selected:
+            return None
+        outputs, latencies, wall = time_stage(fn, inputs, args.repeat, args.warmup)
+        results[name] = stage_result(latencies, wall)
+        print(f"{name:<14} p50={results[name]['latency_ms']['p50']:>8.3f} ms  "
+              f"p95={results[name]['latency_ms']['p95']:>8.3f} ms  "
+              f"{results[name]['throughput_fps']:>9.1f} fps")
+        return outputs
+
+    from backend.ml.enhanced_isl_recognition import decode_base64_frame
+
+    # Later stages consume the previous stage's outputs, computed untimed when a stage is skipped
+    frames = run("decode", decode_base64_frame, frames_b64) or [decode_base64_frame(b) for b in frames_b64]
+
+    if recognizer.mp_hands is not None:
+        detections = run("mediapipe", recognizer._detect_hands, frames) or \
+            [recognizer._detect_hands(f) for f in frames]
+        pairs = list(zip(frames, detections))
+        regions = run("crop", lambda p: recognizer._extract_hand_regions(*p), pairs) or \
+            [recognizer._extract_hand_regions(*p) for p in pairs]
+        crops = [region[0] for region in regions]
+    else:
+        results["mediapipe"] = results["crop"] = {'skipped': 'MediaPipe not available'}
+        crops = [None] * len(frames)
+
+    crop_pairs = list(zip(frames, crops))
+    tensors = run("preprocess", lambda p: recognizer._prepare_input(*p), crop_pairs) or \
+        [recognizer._prepare_input(*p) for p in crop_pairs]
+
+    model = recognizer.model
+    probs = run("model", lambda t: recognizer._run_model(model, t), tensors) or \
+        [recognizer._run_model(model, t) for t in tensors]
+    scored = run("postprocess", recognizer._score_prediction, probs) or \
+        [recognizer._score_prediction(p) for p in probs]
+
+    def smooth(prediction):
+        recognizer.temporal_smoother.add_prediction(*prediction)
+        return recognizer.temporal_smoother.get_smoothed_prediction()
+
+    recognizer.temporal_smoother.clear()
+    run("smoother", smooth, scored)
+
+    def add_letter(prediction):
+        recognizer.word_engine.add_letter(*prediction)
+        return recognizer.word_engine.get_current_word() or prediction[0]
+
+    recognizer.word_engine.clear()
+    words = run("word_engine", add_letter, scored) or [p[0] for p in scored]
+
+    if "translation" in selected:
+        translator = build_translator(args)
+
+        def translate(word):
+            translator.translation_cache.clear()  # Measure the uncached path
+            return translator.translate_text(word, target_lang=args.target_lang)
+
+        run("translation", translate, words)
+
+    def full(frame_b64):
+        return recognizer.process_base64_frame(frame_b64)
+
+    recognizer.reset_recognition()
+    run("full_pipeline", full, frames_b64)
+
+    return {
+        'benchmark': 'isl_pipeline',
+        'environment': environment_info(),
+        'config': {
+            'frames': len(frames_b64),
+            'frames_dir': args.frames,
+            'repeat': args.repeat,
+            'warmup': args.warmup,
+            'torch_threads': torch.get_num_threads(),
+            'device': str(recognizer.device),
+            'weights': 'checkpoint' if os.path.exists(args.model_path) else 'random',
+            'translation_mode': args.translation_mode
+        },
+        'stages': results,
+        'peak_rss_mb': round(peak_rss_mb() or 0, 1)
+    }
+
+
+def compare(baseline, current, threshold):
+    """Print per-stage changes; returns the names of stages that regressed"""
+    regressions = []
+    print(f"\n{'stage':<14}{'p50 before':>12}{'p50 after':>12}{'p95 before':>12}{'p95 after':>12}{'change':>9}")
+    for name in STAGES:
+        before = baseline.get('stages', {}).get(name, {}).get('latency_ms')
+        after = current['stages'].get(name, {}).get('latency_ms')
+        if not before or not after:
+            continue
+        change = (after['p50'] - before['p50']) / before['p50'] * 100 if before['p50'] else 0.0
+        flag = "  <-- regression" if change > threshold else ""
+        if flag:
+            regressions.append(name)
+        print(f"{name:<14}{before['p50']:>12.3f}{after['p50']:>12.3f}"
+              f"{before['p95']:>12.3f}{after['p95']:>12.3f}{change:>+8.1f}%{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the ISL recognition pipeline on recorded frames")
+    parser.add_argument("--frames", default="benchmarks/fixtures/frames", help="Directory of recorded JPEG frames")
+    parser.add_argument("--record", type=int, metavar="N", help="Record N camera frames into --frames and exit")
+    parser.add_argument("--limit", type=int, help="Use only the first N frames")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the frames per stage (default: 3)")
+    parser.add_argument("--warmup", type=int, default=5, help="Untimed warm-up frames per stage (default: 5)")
+    parser.add_argument("--threads", type=int, help="torch.set_num_threads for reproducible CPU runs")
+    parser.add_argument("--stages", help=f"Comma-separated subset of: {','.join(STAGES)}")
+    parser.add_argument("--model-path", default="checkpoints/best.pth")
+    parser.add_argument("--random-weights", action="store_true",
+                        help="Use an untrained model when no checkpoint is available")
+    parser.add_argument("--translation-mode", choices=["offline", "online"], default="offline",
+                        help="offline = dictionary only, no network (default)")
+    parser.add_argument("--target-lang", default="hi")
+    parser.add_argument("--output", help="Write JSON results to this file")
+    parser.add_argument("--compare", help="Baseline JSON from a previous run")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="p50 increase (%%) treated as a regression (default: 10)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit 1 when a stage regresses")
+    args = parser.parse_args()
+
+    # setup_paths() changes to the repo root; keep user paths relative to the caller
+    # (the defaults are relative to the repo root)
+    for name in ("frames", "model_path", "output", "compare"):
+        value = getattr(args, name)
+        if value and value != parser.get_default(name):
+            setattr(args, name, os.path.abspath(value))
+
+    if args.record:
+        record_frames(args.frames, args.record)
+        return
+
+    results = run_benchmark(args)
+    write_results(results, args.output)
+
+    if args.compare:
+        regressions = compare(load_results(args.compare), results, args.threshold)
+        if regressions and args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Prefork memory benchmark for the ISL model
+Forks N workers the way gunicorn does and reports per-worker RSS, PSS and
+USS, with the model either preloaded and shared by the master ("shared")
+or loaded separately in every worker ("private").
+
+PSS/USS come from /proc/<pid>/smaps_rollup (Linux). Elsewhere only RSS is
+reported, and RSS counts shared pages in every worker.
+
+Usage:
+    python benchmarks/memory_benchmark.py --workers 4 --output memory.json
+    python benchmarks/memory_benchmark.py --mode shared --random-weights
+"""
+import argparse
+import gc
+import json
+import multiprocessing as mp
+import os
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import (REPO_ROOT, current_rss_mb, environment_info,  # noqa: E402
+                               setup_paths, write_results)
+
+
+def read_memory(pid="self"):
+    """RSS/PSS/USS/shared in MB for a process"""
+    try:
+        fields = {}
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 3 and parts[2] == "kB":
+                    fields[parts[0].rstrip(":")] = int(parts[1]) / 1024
+        return {
+            'rss_mb': round(fields.get('Rss', 0), 1),
+            'pss_mb': round(fields.get('Pss', 0), 1),
+            'uss_mb': round(fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0), 1),
+            'shared_mb': round(fields.get('Shared_Clean', 0) + fields.get('Shared_Dirty', 0), 1)
+        }
+    except OSError:
+        return {'rss_mb': round(current_rss_mb() or 0, 1), 'pss_mb': None, 'uss_mb': None, 'shared_mb': None}
+
+
+def build_model(args):
+    """Load the checkpoint, or build a randomly initialised model of the same shape when missing"""
+    import torch
+    from backend.ml import enhanced_isl_recognition as isl
+
+    if not args.random_weights and os.path.exists(args.model_path):
+        return isl.load_isl_model(args.model_path, torch.device('cpu'))
+    model = isl.EnhancedISLModel(isl.NUM_CLASSES)
+    model.eval()
+    return model
+
+
+def worker(index, shared_model, args, ready, measured, results):
+    """Forked worker: get a model, run inference, report memory while all workers are alive"""
+    import torch
+    torch.set_num_threads(1)
+
+    model = shared_model if shared_model is not None else build_model(args)
+    if args.infer:
+        from backend.ml.enhanced_isl_recognition import IMG_SIZE
+        with torch.no_grad():
+            model(torch.zeros(1, 3, IMG_SIZE, IMG_SIZE))
+
+    gc.collect()
+    ready.wait()
+    results.put((index, read_memory()))
+    measured.wait()
+
+
+def run_mode(mode, args):
+    """Run one mode; executes in its own interpreter"""
+    setup_paths()
+    import torch
+    torch.set_num_threads(1)
+
+    shared_model = None
+    if mode == "shared":
+        from backend.ml.enhanced_isl_recognition import freeze_model_for_sharing
+        shared_model = freeze_model_for_sharing(build_model(args))
+        gc.collect()
+        gc.freeze()
+    master = read_memory()
+
+    ctx = mp.get_context("fork")
+    ready = ctx.Barrier(args.workers + 1)
+    measured = ctx.Barrier(args.workers + 1)
+    results = ctx.Queue()
+    procs = [ctx.Process(target=worker, args=(i, shared_model, args, ready, measured, results))
+             for i in range(args.workers)]
+    for p in procs:
+        p.start()
+
+    ready.wait()
+    workers = dict(results.get(timeout=300) for _ in procs)
+    measured.wait()
+    for p in procs:
+        p.join()
+
+    per_worker = [workers[i] for i in sorted(workers)]
+    return {
+        'mode': mode,
+        'workers': args.workers,
+        'master': master,
+        'per_worker': per_worker,
+        'total_worker_rss_mb': round(sum(w['rss_mb'] for w in per_worker), 1),
+        'total_worker_pss_mb': round(sum(w['pss_mb'] or 0 for w in per_worker), 1),
+        'total_pss_mb': round(sum(w['pss_mb'] or 0 for w in per_worker) + (master['pss_mb'] or 0), 1)
+    }
+
+
+def run_mode_in_child(mode, args):
+    """Isolate each mode in a fresh interpreter"""
+    cmd = [sys.executable, os.path.abspath(__file__), "--run-mode", mode,
+           "--workers", str(args.workers), "--model-path", args.model_path]
+    if args.random_weights:
+        cmd.append("--random-weights")
+    if not args.infer:
+        cmd.append("--no-infer")
+    proc = subprocess.run(cmd, cwd=REPO_ROOT, capture_output=True, text=True)
+    for line in reversed(proc.stdout.splitlines()):
+        if line.startswith("{"):
+            return json.loads(line)
+    raise RuntimeError(f"Memory benchmark ({mode}) failed:\n{proc.stderr[-2000:]}")
+
+
+def print_table(runs):
+    """Per-mode summary"""
+    print(f"{'mode':<10}{'workers':>8}{'rss/worker':>12}{'pss/worker':>12}{'uss/worker':>12}{'total pss':>12}")
+    for run in runs:
+        n = max(len(run['per_worker']), 1)
+        avg = lambda key: sum(w[key] or 0 for w in run['per_worker']) / n  # noqa: E731
+        print(f"{run['mode']:<10}{run['workers']:>8}{avg('rss_mb'):>12.1f}"
+              f"{avg('pss_mb'):>12.1f}{avg('uss_mb'):>12.1f}{run['total_pss_mb']:>12.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-worker memory with and without a shared preloaded model")
+    parser.add_argument("--workers", type=int, default=4, help="Forked workers (default: 4)")
+    parser.add_argument("--mode", choices=["shared", "private", "both"], default="both")
+    parser.add_argument("--model-path", default="checkpoints/best.pth")
+    parser.add_argument("--random-weights", action="store_true",
+                        help="Use an untrained model of the same architecture (no checkpoint needed)")
+    parser.add_argument("--no-infer", dest="infer", action="store_false",
+                        help="Skip the dummy forward pass in each worker")
+    parser.add_argument("--output", help="Write JSON results to this file")
+    parser.add_argument("--run-mode", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_mode:
+        print(json.dumps(run_mode(args.run_mode, args)))
+        return
+
+    modes = ["private", "shared"] if args.mode == "both" else [args.mode]
+    runs = [run_mode_in_child(mode, args) for mode in modes]
+    write_results({
+        'benchmark': 'prefork_memory',
+        'environment': environment_info(),
+        'weights': 'checkpoint' if not args.random_weights and os.path.exists(
+            os.path.join(REPO_ROOT, args.model_path)) else 'random',
+        'inference': args.infer,
+        'runs': runs
+    }, args.output)
+    print_table(runs)
+
+
+if __name__ == "__main__":
+    main()
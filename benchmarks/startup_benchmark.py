@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+App startup benchmark
+Measures create_app() wall time, RSS and which heavy stacks get imported.
+Each run uses a fresh interpreter so import caches do not hide costs.
+
+Usage:
+    python benchmarks/startup_benchmark.py --runs 5 --output after.json
+    python benchmarks/startup_benchmark.py --compare before.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import (REPO_ROOT, environment_info, load_results,  # noqa: E402
+                               summarize, write_results)
+
+# Modules that should only load on first ML/audio/translation use
+HEAVY_MODULES = [
+    "torch", "torchvision", "timm", "cv2", "mediapipe", "numpy", "PIL",
+    "gtts", "pydub", "speech_recognition", "azure.cognitiveservices.speech",
+    "googletrans", "translate", "indic_transliteration"
+]
+
+
+def measure_once():
+    """Single measurement; runs inside the child interpreter"""
+    import time
+    start = time.perf_counter()
+
+    from benchmarks.common import current_rss_mb, setup_paths
+    setup_paths()
+    baseline_rss = current_rss_mb()
+
+    from app import create_app
+    import_done = time.perf_counter()
+    create_app(os.environ.get("FLASK_ENV", "development"))
+    end = time.perf_counter()
+
+    return {
+        'import_ms': (import_done - start) * 1000,
+        'create_app_ms': (end - import_done) * 1000,
+        'total_ms': (end - start) * 1000,
+        'rss_mb': current_rss_mb(),
+        'interpreter_rss_mb': baseline_rss,
+        'heavy_modules_loaded': [m for m in HEAVY_MODULES if m in sys.modules]
+    }
+
+
+def run_child():
+    """Run one measurement in a fresh interpreter and parse its JSON line"""
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child"],
+        cwd=REPO_ROOT, capture_output=True, text=True
+    )
+    for line in reversed(proc.stdout.splitlines()):
+        if line.startswith("{"):
+            return json.loads(line)
+    raise RuntimeError(f"Startup measurement failed:\n{proc.stderr[-2000:]}")
+
+
+def print_comparison(before, after):
+    """Print before/after medians"""
+    print(f"{'metric':<20}{'before':>12}{'after':>12}{'change':>10}")
+    for key in ('total_ms', 'create_app_ms', 'rss_mb'):
+        b = before['summary'][key]['p50']
+        a = after['summary'][key]['p50']
+        change = f"{(a - b) / b * 100:+.1f}%" if b else "n/a"
+        print(f"{key:<20}{b:>12.1f}{a:>12.1f}{change:>10}")
+    print(f"heavy modules before: {', '.join(before['heavy_modules_loaded']) or 'none'}")
+    print(f"heavy modules after:  {', '.join(after['heavy_modules_loaded']) or 'none'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure create_app() startup time and memory")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh-interpreter runs (default: 5)")
+    parser.add_argument("--output", help="Write JSON results to this file")
+    parser.add_argument("--compare", help="Previous results JSON to compare against")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure_once()))
+        return
+
+    runs = [run_child() for _ in range(args.runs)]
+    results = {
+        'benchmark': 'startup',
+        'environment': environment_info(),
+        'runs': runs,
+        'summary': {
+            key: summarize([r[key] for r in runs])
+            for key in ('import_ms', 'create_app_ms', 'total_ms', 'rss_mb')
+        },
+        'heavy_modules_loaded': runs[-1]['heavy_modules_loaded'] if runs else []
+    }
+    write_results(results, args.output)
+
+    if args.compare:
+        print_comparison(load_results(args.compare), results)
+
+
+if __name__ == "__main__":
+    main()
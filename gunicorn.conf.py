@@ -0,0 +1,52 @@
+"""
+Gunicorn configuration for VediSpeak
+Run with: gunicorn -c gunicorn.conf.py run:application
+
+With ISL_SHARED_MODEL=1 the master loads and freezes the ISL model before
+forking, so every worker shares the same weight pages (copy-on-write)
+instead of loading its own copy.
+"""
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:5000")
+workers = int(os.environ.get("GUNICORN_WORKERS", 4))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 120))
+
+SHARED_MODEL = os.environ.get("ISL_SHARED_MODEL", "0") == "1"
+
+# The app (and the shared model) must be loaded in the master to be inherited
+preload_app = SHARED_MODEL
+
+
+def on_starting(server):
+    """Load and freeze the shared model in the master, before any fork"""
+    if not SHARED_MODEL:
+        return
+    # create_app() runs in the master too; defer warm-up to the workers
+    os.environ["VEDISPEAK_PREFORK"] = "1"
+
+    from backend.ml.enhanced_isl_recognition import preload_shared_model
+    if not preload_shared_model(os.environ.get("MODEL_PATH", "checkpoints/best.pth")):
+        server.log.warning("Shared ISL model preload failed; workers will load their own copies")
+
+
+def post_fork(server, worker):
+    """Restore per-worker torch threads, start the optional warm-up and activity buffer"""
+    if not SHARED_MODEL:
+        return
+    os.environ.pop("VEDISPEAK_PREFORK", None)
+
+    import torch
+    torch.set_num_threads(max(int(os.environ.get("ISL_INFERENCE_THREADS", 1)), 1))
+
+    flask_app = worker.app.wsgi()
+    if flask_app.config.get("ISL_PRELOAD_MODEL"):
+        from app.services.model_warmup_service import get_model_warmup_service
+        get_model_warmup_service().start(flask_app)
+    if flask_app.config.get("ACTIVITY_WRITE_BEHIND"):
+        from app.services.activity_buffer_service import get_activity_buffer
+        get_activity_buffer().start(flask_app)
@@ -73,5 +73,7 @@ application = None
 
 if __name__ == "__main__":
     main()
-else:
-    application = create_application()
\ No newline at end of file
+elif __name__ != "__mp_main__":
+    # Spawned inference workers re-import this module as __mp_main__;
+    # they must not build a second Flask app
+    application = create_application()
\ No newline at end of file